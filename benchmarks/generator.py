@@ -0,0 +1,196 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BENCHMARK_DIR, "data")
+
+SIZES = {"10k": 10_000, "1M": 1_000_000, "10M": 10_000_000}
+DEFAULT_SEED = 8769
+# Excel ограничен 1 048 576 строками, поэтому большие наборы данных пишутся в CSV
+EXCEL_MAX_ROWS = 100_000
+
+COLUMNS = [
+    "Дата операции",
+    "Дата платежа",
+    "Номер карты",
+    "Статус",
+    "Сумма операции",
+    "Валюта операции",
+    "Сумма платежа",
+    "Валюта платежа",
+    "Кэшбэк",
+    "Категория",
+    "MCC",
+    "Описание",
+    "Бонусы (включая кэшбэк)",
+    "Округление на инвесткопилку",
+    "Сумма операции с округлением",
+]
+
+# Категория, MCC, базовые описания и типичная сумма траты
+CATEGORIES = [
+    ("Супермаркеты", 5411, ["Магнит", "Колхоз", "SPAR", "Дикси", "Перекрёсток", "Пятёрочка"], 600.0),
+    ("Фастфуд", 5814, ["McDonald's", "Бургер Кинг", "Kofe s sobojj", "Rumyanyj Khleb"], 300.0),
+    ("Транспорт", 4121, ["Яндекс Такси", "Ситимобил"], 400.0),
+    ("Местный транспорт", 4111, ["Метро Санкт-Петербург"], 60.0),
+    ("Ж/д билеты", 4112, ["РЖД"], 2500.0),
+    ("Связь", 4814, ["МТС", "Билайн"], 450.0),
+    ("Мобильная связь", 4814, ["МТС Mobile +7 921 {phone}", "Тинькофф Мобайл +7 995 {phone}"], 350.0),
+    ("Аптеки", 5912, ["Apteka 7", "Аптека Вита"], 700.0),
+    ("Каршеринг", 7512, ["Ситидрайв", "Делимобиль"], 900.0),
+    ("Рестораны", 5812, ["Mouse Tail", "Pingvin Kofe I Chaj"], 1800.0),
+    ("Различные товары", 5331, ["Улыбка радуги", "Fix Price"], 500.0),
+    ("Дом и ремонт", 5200, ["Леруа Мерлен", "OBI"], 3000.0),
+    ("Топливо", 5541, ["Circle K", "Лукойл"], 2000.0),
+    ("Одежда и обувь", 5651, ["Uniqlo", "Спортмастер"], 3500.0),
+    ("Услуги банка", 6012, ["Плата за оповещения об операциях"], 59.0),
+    ("Наличные", 6011, ["Снятие в банкомате Сбербанк"], 5000.0),
+    ("Переводы", 6536, ["{name} {initial}.", "Перевод Кредитная карта. ТП 10.2 RUR"], 4000.0),
+]
+INCOME_CATEGORIES = [
+    ("Пополнения", 6012, ["Пополнение через Альфа-Банк", "Перевод с карты"], 20000.0),
+    ("Бонусы", 0, ["Кэшбэк за обычные покупки"], 300.0),
+]
+CARDS = ["*7197", "*4556", "*5091", "*5441", "*1112", "*5507", "*6002"]
+CARD_WEIGHTS = [0.70, 0.17, 0.05, 0.03, 0.02, 0.02, 0.01]
+FIRST_NAMES = ["Константин", "Дмитрий", "Светлана", "Андрей", "Валерий", "Ольга", "Михаил", "Анна", "Иван", "Елена"]
+INITIALS = list("АБВГДЕЖЗИКЛМНОПРСТУФХШЭЮЯ")
+FOREIGN_CURRENCIES = {"USD": 75.3, "EUR": 88.1, "TRY": 8.9, "CNY": 11.6}
+MERCHANT_POOL_SIZE = 3000
+
+
+def build_merchant_pool(rng: np.random.Generator) -> pd.DataFrame:
+    """
+    Формирует справочник торговых точек: несколько тысяч уникальных описаний с категорией, MCC и типичной суммой.
+
+    :param rng: Генератор случайных чисел.
+    :return: DataFrame со столбцами Категория, MCC, Описание, Сумма, Доход.
+    """
+    rows = []
+    all_categories = [(*category, False) for category in CATEGORIES] + [(*c, True) for c in INCOME_CATEGORIES]
+    per_category = MERCHANT_POOL_SIZE // len(all_categories)
+    for category, mcc, templates, amount, is_income in all_categories:
+        for i in range(per_category):
+            template = templates[i % len(templates)]
+            description = template.format(
+                phone=f"{rng.integers(100, 999)}-{rng.integers(10, 99)}-{rng.integers(10, 99)}",
+                name=FIRST_NAMES[rng.integers(len(FIRST_NAMES))],
+                initial=INITIALS[rng.integers(len(INITIALS))],
+            )
+            if "{" not in template and i >= len(templates):
+                description = f"{description} {i // len(templates)}"
+            rows.append((category, mcc, description, amount, is_income))
+    return pd.DataFrame(rows, columns=["Категория", "MCC", "Описание", "Сумма", "Доход"])
+
+
+def generate_operations(rows: int, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """
+    Генерирует синтетические операции в схеме файла data/operations.xls.
+
+    Генерация детерминирована для одинаковых rows и seed.
+
+    :param rows: Количество операций.
+    :param seed: Зерно генератора случайных чисел.
+    :return: DataFrame с операциями, отсортированными по убыванию даты, как в выгрузке банка.
+    """
+    rng = np.random.default_rng(seed)
+    merchants = build_merchant_pool(rng)
+
+    # Частоты торговых точек распределены по закону Ципфа: немногие точки встречаются очень часто
+    weights = 1.0 / np.arange(1, len(merchants) + 1)
+    weights = rng.permutation(weights / weights.sum())
+    income_share = 0.07
+    is_income = merchants["Доход"].to_numpy()
+    weights = np.where(is_income, weights / weights[is_income].sum() * income_share, weights)
+    weights = np.where(~is_income, weights / weights[~is_income].sum() * (1 - income_share), weights)
+    merchant_idx = rng.choice(len(merchants), size=rows, p=weights)
+    chosen = merchants.iloc[merchant_idx].reset_index(drop=True)
+
+    start = np.datetime64("2018-01-01T00:00:00")
+    seconds = rng.integers(0, 4 * 365 * 24 * 3600, size=rows)
+    dates = pd.Series(start + seconds.astype("timedelta64[s]")).sort_values(ascending=False, ignore_index=True)
+
+    base_amount = chosen["Сумма"].to_numpy()
+    amount = np.round(base_amount * rng.lognormal(0.0, 0.6, size=rows), 2)
+    sign = np.where(chosen["Доход"].to_numpy(), 1.0, -1.0)
+    payment_amount = amount * sign
+
+    currency = np.full(rows, "RUB", dtype=object)
+    foreign = rng.random(rows) < 0.02
+    foreign_codes = np.array(list(FOREIGN_CURRENCIES))
+    foreign_rates = np.array(list(FOREIGN_CURRENCIES.values()))
+    foreign_choice = rng.integers(len(foreign_codes), size=rows)
+    currency[foreign] = foreign_codes[foreign_choice[foreign]]
+    operation_amount = np.where(foreign, np.round(payment_amount / foreign_rates[foreign_choice], 2), payment_amount)
+
+    cashback = np.where(rng.random(rows) < 0.09, np.round(amount / 100), np.nan)
+    status = np.where(rng.random(rows) < 0.006, "FAILED", "OK")
+    card = rng.choice(CARDS, size=rows, p=CARD_WEIGHTS).astype(object)
+    card[rng.random(rows) < 0.1] = np.nan
+    mcc = chosen["MCC"].astype(float).replace(0.0, np.nan)
+
+    return pd.DataFrame(
+        {
+            "Дата операции": dates.dt.strftime("%d.%m.%Y %H:%M:%S"),
+            "Дата платежа": dates.dt.strftime("%d.%m.%Y"),
+            "Номер карты": card,
+            "Статус": status,
+            "Сумма операции": operation_amount,
+            "Валюта операции": currency,
+            "Сумма платежа": payment_amount,
+            "Валюта платежа": "RUB",
+            "Кэшбэк": cashback,
+            "Категория": chosen["Категория"],
+            "MCC": mcc,
+            "Описание": chosen["Описание"],
+            "Бонусы (включая кэшбэк)": np.floor(amount / 100).astype(int),
+            "Округление на инвесткопилку": 0,
+            "Сумма операции с округлением": np.abs(payment_amount),
+        },
+        columns=COLUMNS,
+    )
+
+
+def get_operations_file(size: str, file_format: str | None = None) -> str:
+    """
+    Возвращает путь к файлу синтетических операций заданного размера.
+
+    :param size: Размер набора данных: "10k", "1M" или "10M".
+    :param file_format: Формат файла "xlsx" или "csv", по умолчанию выбирается по размеру.
+    :return: Путь к файлу.
+    """
+    if file_format is None:
+        file_format = "xlsx" if SIZES[size] <= EXCEL_MAX_ROWS else "csv"
+    return os.path.join(DATA_DIR, f"operations_{size}.{file_format}")
+
+
+def write_operations(size: str, file_format: str | None = None, seed: int = DEFAULT_SEED) -> str:
+    """
+    Генерирует и записывает файл синтетических операций, если он ещё не создан.
+
+    :param size: Размер набора данных: "10k", "1M" или "10M".
+    :param file_format: Формат файла "xlsx" или "csv", по умолчанию выбирается по размеру.
+    :param seed: Зерно генератора случайных чисел.
+    :return: Путь к файлу.
+    """
+    file_path = get_operations_file(size, file_format)
+    if not os.path.isfile(file_path):
+        df = generate_operations(SIZES[size], seed=seed)
+        if file_path.endswith(".csv"):
+            df.to_csv(file_path, index=False)
+        else:
+            df.to_excel(file_path, index=False)
+    return file_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Генератор синтетических операций")
+    parser.add_argument("sizes", nargs="+", choices=list(SIZES))
+    parser.add_argument("--format", choices=["xlsx", "csv"], default=None)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    cli_args = parser.parse_args()
+    for cli_size in cli_args.sizes:
+        print(write_operations(cli_size, cli_args.format, cli_args.seed))
@@ -0,0 +1,66 @@
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from benchmarks.generator import generate_operations
+from src.dates import parse_operation_dates
+from src.records import TransactionRecords
+
+MILLION = 1_000_000
+
+
+def measure_allocation(build: Callable[[], Any]) -> tuple[Any, int, float]:
+    """
+    Измеряет память, которую удерживает построенный объект, и время построения.
+
+    :param build: Функция без аргументов, строящая объект.
+    :return: Кортеж из объекта, удерживаемой памяти в байтах и времени построения в секундах.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, allocated, elapsed
+
+
+def compare_records_memory(rows: int) -> dict[str, dict[str, float]]:
+    """
+    Сравнивает список словарей из to_dict(orient="records") с TransactionRecords по памяти и времени.
+
+    :param rows: Количество синтетических операций.
+    :return: Словарь "форма" -> {"bytes_per_million_rows", "build_s", "iterate_s"}.
+    """
+    df = generate_operations(rows)
+    df["Дата операции"] = parse_operation_dates(df["Дата операции"])
+    builders = {
+        "list[dict]": lambda: df.to_dict(orient="records"),
+        "TransactionRecords": lambda: TransactionRecords.from_dataframe(df),
+    }
+    results = {}
+    for name, build in builders.items():
+        records, allocated, build_s = measure_allocation(build)
+        start = time.perf_counter()
+        total = sum(record["Сумма операции"] for record in records)
+        iterate_s = time.perf_counter() - start
+        results[name] = {
+            "bytes_per_million_rows": allocated / rows * MILLION,
+            "build_s": build_s,
+            "iterate_s": iterate_s,
+            "checksum": round(total, 2),
+        }
+        del records
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Память list[dict] против TransactionRecords")
+    parser.add_argument("--rows", type=int, default=100_000)
+    cli_args = parser.parse_args()
+    for form, stats in compare_records_memory(cli_args.rows).items():
+        print(
+            f"{form:<20} {stats['bytes_per_million_rows'] / 2 ** 20:>10.2f} MiB / 1M rows"
+            f"  build {stats['build_s']:.3f} s  iterate {stats['iterate_s']:.3f} s"
+        )
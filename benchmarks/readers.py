@@ -0,0 +1,60 @@
+import argparse
+import os
+from functools import partial
+
+from benchmarks.generator import EXCEL_MAX_ROWS, SIZES, write_operations
+from benchmarks.run import time_call
+from src.config import PATH_PROJECT
+from src.files import READER_ENGINES, get_reader_engines, read_operations_file
+
+# Столбцы, которые читает страница “Главная”: сравнение полного чтения с чтением части столбцов
+DASHBOARD_COLUMNS = ["Дата операции", "Номер карты", "Статус", "Сумма платежа", "Категория", "Описание"]
+
+
+def get_reader_files(size: str) -> list[str]:
+    """
+    Возвращает файлы для сравнения движков: синтетические CSV и XLSX (если размер допускает Excel)
+    и выгрузку data/operations.xls для формата XLS, который генератор не записывает.
+
+    :param size: Размер набора данных: "10k", "1M" или "10M".
+    :return: Список путей к файлам.
+    """
+    files = [write_operations(size, "csv")]
+    if SIZES[size] <= EXCEL_MAX_ROWS:
+        files.append(write_operations(size, "xlsx"))
+    xls_file = os.path.join(PATH_PROJECT, "data", "operations.xls")
+    if os.path.isfile(xls_file):
+        files.append(xls_file)
+    return files
+
+
+def compare_readers(size: str, repeat: int) -> list[dict]:
+    """
+    Сравнивает движки чтения для каждого формата при чтении всех столбцов и только нужных.
+
+    :param size: Размер набора данных.
+    :param repeat: Количество повторов каждого замера.
+    :return: Список замеров {"file", "engine", "columns", "seconds"}; для неустановленного движка seconds = None.
+    """
+    results = []
+    for file_path in get_reader_files(size):
+        extension = os.path.splitext(file_path)[1]
+        installed = get_reader_engines(extension)
+        for engine, _ in READER_ENGINES[extension]:
+            for columns_name, columns in (("all", None), ("dashboard", DASHBOARD_COLUMNS)):
+                seconds = None
+                if engine in installed:
+                    seconds = time_call(partial(read_operations_file, file_path, columns, engine), repeat)
+                file_name = os.path.basename(file_path)
+                results.append({"file": file_name, "engine": engine, "columns": columns_name, "seconds": seconds})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сравнение движков чтения файлов с операциями")
+    parser.add_argument("--size", choices=list(SIZES), default="10k")
+    parser.add_argument("--repeat", type=int, default=3)
+    cli_args = parser.parse_args()
+    for result in compare_readers(cli_args.size, cli_args.repeat):
+        elapsed = "не установлен" if result["seconds"] is None else f"{result['seconds']:.4f} s"
+        print(f"{result['file']:<22} {result['engine']:<10} {result['columns']:<10} {elapsed:>14}")
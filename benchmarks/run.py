@@ -0,0 +1,285 @@
+import argparse
+import inspect
+import json
+import os
+import sys
+import time
+from functools import partial
+from types import ModuleType
+from typing import Any, Callable
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+from benchmarks.generator import BENCHMARK_DIR, SIZES, write_operations
+
+BASELINES_FILE = os.path.join(BENCHMARK_DIR, "baselines.json")
+# Допустимое замедление относительно baseline и абсолютный запас на шум таймера (секунды)
+DEFAULT_TOLERANCE = 1.5
+NOISE_FLOOR = 0.005
+# Фиксированные бюджеты времени (секунды), которые должны выполняться независимо от baseline.
+# detect_recurring_payments на 10M строк: 16.9 s (1 CPU, 5 ГБ памяти; замер только этой функции,
+# так как полный набор кейсов на 10M не помещается в память)
+TIME_BUDGETS = {"10M": {"src.services.detect_recurring_payments": 30.0}}
+
+DATE = "2021-10-22 11:11:11"
+USER_SETTINGS = {"user_currencies": ["USD", "EUR"], "user_stocks": ["AAPL", "AMZN", "GOOGL", "MSFT", "TSLA"]}
+
+# Кейс бенчмарка: по загруженному DataFrame готовит вызов без аргументов; подготовка не входит в замер
+Case = Callable[[pd.DataFrame], Callable[[], Any]]
+
+
+def fake_requests_get(url: str, params: dict | None = None) -> Mock:
+    """
+    Подменяет requests.get, чтобы бенчмарк измерял обработку данных, а не сеть.
+
+    :param url: Адрес запроса.
+    :param params: Параметры запроса.
+    :return: Объект ответа с кодом 200 и статическими данными.
+    """
+    response = Mock()
+    response.status_code = 200
+    if params:
+        symbols = params["symbols"].split(",")
+        response.json.return_value = {"data": [{"symbol": symbol, "last": 100.0} for symbol in symbols]}
+    else:
+        response.json.return_value = {"Valute": {"USD": {"Value": 75.0}, "EUR": {"Value": 88.0}}}
+    return response
+
+
+def get_cases() -> dict[str, Case]:
+    """
+    Возвращает кейсы бенчмарка для всех публичных функций src.dates, src.utils, src.services, src.reports и src.views.
+
+    :return: Словарь "модуль.функция" -> кейс.
+    """
+    from src import batch, database, dates, reports, services, utils, views
+    from src.cache import view_cache
+    from src.counterparties import CounterpartyLedger
+
+    def category_amounts(df: pd.DataFrame) -> pd.Series:
+        return df.loc[df["Сумма платежа"] < 0].groupby("Категория")["Сумма платежа"].sum()
+
+    def uncached(func: Callable[[], Any]) -> Callable[[], Any]:
+        # Страницы замеряются без кэша результатов, иначе лучшим окажется время попадания в кэш
+        def call() -> Any:
+            view_cache.clear()
+            return func()
+
+        return call
+
+    def with_database(func: Callable[[], Any]) -> Callable[[], Any]:
+        # Создание базы SQLite не входит в замер запросов
+        database.ensure_database()
+        return func
+
+    def transactions(df: pd.DataFrame) -> list[dict]:
+        df = df.copy()
+        df["Дата операции"] = pd.to_datetime(df["Дата операции"], format="%d.%m.%Y %H:%M:%S")
+        return df.to_dict(orient="records")
+
+    return {
+        "src.dates.parse_date": lambda df: partial(dates.parse_date, DATE),
+        "src.dates.parse_dates": lambda df: partial(dates.parse_dates, df["Дата операции"]),
+        "src.dates.parse_operation_dates": lambda df: partial(dates.parse_operation_dates, df["Дата операции"]),
+        "src.utils.with_columns": lambda df: partial(utils.with_columns, ["Категория"], ["Дата операции"]),
+        "src.utils.check_date": lambda df: partial(utils.check_date, DATE),
+        "src.utils.get_time_of_day": lambda df: utils.get_time_of_day,
+        "src.utils.get_api_marketstack": lambda df: utils.get_api_marketstack,
+        "src.utils.get_df_by_interval": lambda df: partial(utils.get_df_by_interval, DATE),
+        "src.utils.get_filtered_df": lambda df: partial(utils.get_filtered_df, DATE, "Y"),
+        "src.utils.get_list_categories_with_amounts": (
+            lambda df: partial(utils.get_list_categories_with_amounts, category_amounts(df))
+        ),
+        "src.utils.get_price_stocks_user": lambda df: partial(utils.get_price_stocks_user, USER_SETTINGS),
+        "src.utils.get_price_currencies_user": lambda df: partial(utils.get_price_currencies_user, USER_SETTINGS),
+        "src.services.categories_of_increased_cashback": (
+            lambda df: partial(services.categories_of_increased_cashback, df.copy(), 2020, 3)
+        ),
+        "src.services.invest_moneybox": lambda df: partial(services.invest_moneybox, "2020-04", transactions(df), 50),
+        "src.services.simple_search": lambda df: partial(services.simple_search, "магнит"),
+        "src.services.detect_recurring_payments": lambda df: partial(services.detect_recurring_payments, df),
+        "src.batch.build_card_statements": lambda df: partial(batch.build_card_statements, df),
+        "src.counterparties.CounterpartyLedger.append": lambda df: partial(CounterpartyLedger().append, df),
+        "src.services.find_recurring_payments": lambda df: partial(services.find_recurring_payments),
+        "src.services.search_by_phone_number": lambda df: services.search_by_phone_number,
+        "src.services.search_for_transfers_to_individuals": lambda df: services.search_for_transfers_to_individuals,
+        "src.reports.spending_by_category": (
+            lambda df: partial(reports.spending_by_category, df.copy(), "Супермаркеты", DATE)
+        ),
+        "src.reports.spending_by_weekday": lambda df: partial(reports.spending_by_weekday, df.copy(), DATE),
+        "src.reports.spending_workday_weekend": lambda df: partial(reports.spending_workday_weekend, df.copy(), DATE),
+        "src.views.get_dashboard_data": (
+            lambda df: partial(views.get_dashboard_data, utils.get_df_by_interval(DATE, df=df))
+        ),
+        "src.views.get_events_data": (
+            lambda df: partial(views.get_events_data, utils.get_filtered_df(DATE, "Y", df=df))
+        ),
+        "src.database.query_dashboard_data": lambda df: with_database(partial(database.query_dashboard_data, DATE)),
+        "src.database.query_events_data": lambda df: with_database(partial(database.query_events_data, DATE, "Y")),
+        "src.database.query_by_description": (
+            lambda df: with_database(partial(database.query_by_description, "магнит", case=False))
+        ),
+        "src.views.get_view_cache_key": lambda df: partial(views.get_view_cache_key, "get_json_events", {}, True),
+        "src.views.get_json_dashboard_info": lambda df: uncached(partial(views.get_json_dashboard_info, DATE)),
+        "src.views.get_json_dashboard_info[cached]": lambda df: partial(views.get_json_dashboard_info, DATE),
+        "src.views.get_json_events": lambda df: uncached(partial(views.get_json_events, DATE, "Y")),
+        "src.views.get_json_events[cached]": lambda df: partial(views.get_json_events, DATE, "Y"),
+    }
+
+
+def get_public_functions(modules: list[ModuleType]) -> list[str]:
+    """
+    Возвращает имена публичных функций, объявленных в переданных модулях.
+
+    :param modules: Список модулей.
+    :return: Список имён вида "модуль.функция".
+    """
+    names = []
+    for module in modules:
+        for name, func in inspect.getmembers(module, inspect.isfunction):
+            if not name.startswith("_") and func.__module__ == module.__name__:
+                names.append(f"{module.__name__}.{name}")
+    return names
+
+
+def check_coverage(cases: dict[str, Case]) -> list[str]:
+    """
+    Проверяет, что для каждой публичной функции анализа есть кейс бенчмарка.
+
+    :param cases: Кейсы бенчмарка.
+    :return: Список функций без кейса.
+    """
+    from src import dates, reports, services, utils, views
+
+    modules = [dates, utils, services, reports, views]
+    return [name for name in get_public_functions(modules) if name not in cases]
+
+
+def time_call(func: Callable[[], Any], repeat: int) -> float:
+    """
+    Измеряет лучшее время выполнения функции из нескольких повторов.
+
+    :param func: Функция без аргументов.
+    :param repeat: Количество повторов.
+    :return: Лучшее время в секундах.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_size(size: str, repeat: int, file_format: str | None = None, only: str | None = None) -> dict[str, float]:
+    """
+    Запускает все кейсы бенчмарка на синтетических данных заданного размера.
+
+    :param size: Размер набора данных: "10k", "1M" или "10M".
+    :param repeat: Количество повторов каждого кейса.
+    :param file_format: Формат файла с данными "xlsx" или "csv".
+    :param only: Подстрока имени для выбора части кейсов или None для всех.
+    :return: Словарь "модуль.функция" -> лучшее время в секундах.
+    """
+    from src.files import get_df_operations
+
+    file_path = write_operations(size, file_format)
+    os.environ["OPERATIONS_FILE"] = file_path
+    os.environ["OPERATIONS_DB"] = os.path.splitext(file_path)[0] + ".sqlite"
+    df = get_df_operations()
+    if df is None:
+        raise RuntimeError(f"Не удалось прочитать {file_path}")
+    timings = {}
+    with patch("requests.get", side_effect=fake_requests_get), patch(
+        "src.views.load_user_settings", return_value=USER_SETTINGS
+    ):
+        for name, case in get_cases().items():
+            if only and only not in name:
+                continue
+            timings[name] = time_call(case(df), repeat)
+            print(f"{size:>4} {name:<55} {timings[name]:>10.4f} s")
+    return timings
+
+
+def compare_with_baselines(
+    size: str, timings: dict[str, float], baselines: dict[str, dict[str, float]], tolerance: float
+) -> list[str]:
+    """
+    Сравнивает замеры с сохранёнными baseline и возвращает описания регрессий.
+
+    :param size: Размер набора данных.
+    :param timings: Замеры текущего запуска.
+    :param baselines: Сохранённые baseline по размерам.
+    :param tolerance: Допустимое относительное замедление.
+    :return: Список описаний регрессий.
+    """
+    regressions = []
+    for name, elapsed in timings.items():
+        baseline = baselines.get(size, {}).get(name)
+        if baseline is not None and elapsed > baseline * tolerance + NOISE_FLOOR:
+            regressions.append(f"{size} {name}: {elapsed:.4f} s > {baseline:.4f} s × {tolerance}")
+    return regressions
+
+
+def check_budgets(size: str, timings: dict[str, float]) -> list[str]:
+    """
+    Проверяет замеры на соответствие фиксированным бюджетам времени.
+
+    :param size: Размер набора данных.
+    :param timings: Замеры текущего запуска.
+    :return: Список описаний превышений бюджета.
+    """
+    violations = []
+    for name, budget in TIME_BUDGETS.get(size, {}).items():
+        if name in timings and timings[name] > budget:
+            violations.append(f"{size} {name}: {timings[name]:.4f} s > бюджет {budget:.1f} s")
+    return violations
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Запускает бенчмарки и сравнивает результаты с baseline.
+
+    :param argv: Аргументы командной строки или None для использования sys.argv.
+    :return: Код возврата: 0 без регрессий, 1 при регрессиях или непокрытых функциях.
+    """
+    parser = argparse.ArgumentParser(description="Бенчмарки bank-transaction-analytics")
+    parser.add_argument("--size", nargs="+", choices=list(SIZES), default=["10k"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--format", choices=["xlsx", "csv"], default=None)
+    parser.add_argument("--only", default=None, help="Запустить только кейсы, имя которых содержит подстроку")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--update-baselines", action="store_true", help="Сохранить результаты как baseline")
+    args = parser.parse_args(argv)
+
+    missing = check_coverage(get_cases())
+    if missing:
+        print(f"[-] Нет бенчмарков для: {', '.join(missing)}")
+        return 1
+
+    baselines: dict[str, dict[str, float]] = {}
+    if os.path.isfile(BASELINES_FILE):
+        with open(BASELINES_FILE, encoding="UTF-8") as file:
+            baselines = json.load(file)
+
+    regressions = []
+    for size in args.size:
+        timings = run_size(size, args.repeat, args.format, args.only)
+        regressions.extend(check_budgets(size, timings))
+        if args.update_baselines:
+            baselines.setdefault(size, {}).update({name: round(value, 6) for name, value in timings.items()})
+        else:
+            regressions.extend(compare_with_baselines(size, timings, baselines, args.tolerance))
+
+    if args.update_baselines:
+        with open(BASELINES_FILE, "w", encoding="UTF-8") as file:
+            json.dump(baselines, file, indent=4, ensure_ascii=False, sort_keys=True)
+        print(f"[+] Baseline сохранены в {BASELINES_FILE}")
+    for regression in regressions:
+        print(f"[-] Регрессия: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
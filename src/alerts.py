@@ -0,0 +1,228 @@
+import json
+import os
+
+import pandas as pd
+
+from src.cache import get_data_version, get_frame_fingerprint, remember_fingerprint
+from src.config import PATH_PROJECT
+from src.dates import parse_operation_dates
+from src.decorators import instrumented
+from src.files import get_df_operations
+from src.loggers import logger
+
+ALERTS_COLUMNS = ["Дата операции", "Номер карты", "Статус", "Сумма платежа", "Категория"]
+ALERTS_STATE_FILE = os.path.join(PATH_PROJECT, "data", "alerts_state.json")
+# Доли лимита, при достижении которых формируется уведомление
+DEFAULT_THRESHOLDS = (0.8, 1.0)
+NO_CARD = ""
+# Количество последних месяцев, суммы которых хранятся: текущий и предыдущий (для операций, проведённых с опозданием)
+ALERTS_KEEP_MONTHS = 2
+
+
+class BudgetTracker:
+    """
+    Накопительные суммы расходов по (месяц, категория, карта) и проверка месячных лимитов по категориям.
+
+    Расходы отбираются по тем же правилам, что и на странице “События”: Сумма платежа < 0 и Статус == "OK".
+    При добавлении операций обрабатываются только новые строки, поэтому стоимость проверки
+    не зависит от длины истории. Хранятся только последние ALERTS_KEEP_MONTHS месяцев (от последнего месяца
+    в операциях): суммы и уведомления за более ранние месяцы удаляются, а операции за них не учитываются.
+    """
+
+    def __init__(
+        self, limits: dict[str, float], thresholds: tuple[float, ...] = DEFAULT_THRESHOLDS, data_version: str = ""
+    ) -> None:
+        """
+        :param limits: Месячные лимиты расходов: категория -> сумма.
+        :param thresholds: Доли лимита, при достижении которых формируется уведомление.
+        :param data_version: Версия файла операций, по которому построены суммы.
+        """
+        self.limits = limits
+        self.thresholds = tuple(sorted(thresholds))
+        self.data_version = data_version
+        # Отпечатки уже добавленных наборов новых операций (см. get_frame_fingerprint)
+        self.applied: list[str] = []
+        # (месяц, категория) -> карта -> сумма расходов; карт в месяце немного, поэтому сумма по категории дешёвая
+        self.totals: dict[tuple[str, str], dict[str, float]] = {}
+        self._fired: set[tuple[str, str, float]] = set()
+
+    def append(self, df: pd.DataFrame) -> list[dict]:
+        """
+        Добавляет новые операции к накопительным суммам и возвращает уведомления о достигнутых порогах.
+
+        Каждое уведомление формируется один раз для пары (месяц, категория) и порога.
+
+        :param df: DataFrame с новыми операциями.
+        :return: Список уведомлений.
+        :raises ValueError: Если в DataFrame нет необходимых столбцов.
+        """
+        for column in ALERTS_COLUMNS:
+            if column not in df.columns:
+                raise ValueError("Переданный DataFrame не содержит необходимые, для обработки, поля")
+        costs = df.loc[(df["Сумма платежа"] < 0) & (df["Статус"] == "OK")]
+        if costs.empty:
+            return []
+        months = parse_operation_dates(costs["Дата операции"]).dt.strftime("%Y-%m")
+        delta = (
+            pd.DataFrame(
+                {
+                    "month": months,
+                    "category": costs["Категория"],
+                    "card": costs["Номер карты"].fillna(NO_CARD),
+                    "amount": -costs["Сумма платежа"],
+                }
+            )
+            .dropna(subset=["month", "category"])
+            .groupby(["month", "category", "card"])["amount"]
+            .sum()
+        )
+        if delta.empty:
+            return []
+        delta_months = delta.index.get_level_values("month")
+        cutoff = self._prune(max([delta_months.max(), *(month for month, _ in self.totals)]))
+        delta = delta[delta_months >= cutoff]
+
+        touched: set[tuple[str, str]] = set()
+        for (month, category, card), amount in zip(delta.index.tolist(), delta.tolist()):
+            cards = self.totals.setdefault((month, category), {})
+            cards[card] = cards.get(card, 0.0) + amount
+            touched.add((month, category))
+        return [alert for month, category in sorted(touched) for alert in self._check(month, category)]
+
+    def _prune(self, latest_month: str) -> str:
+        """
+        Удаляет суммы и отметки об уведомлениях за месяцы, которые больше не хранятся.
+
+        :param latest_month: Последний месяц в операциях в формате YYYY-MM.
+        :return: Первый хранимый месяц в формате YYYY-MM.
+        """
+        cutoff = (pd.Period(latest_month, freq="M") - (ALERTS_KEEP_MONTHS - 1)).strftime("%Y-%m")
+        self.totals = {key: cards for key, cards in self.totals.items() if key[0] >= cutoff}
+        self._fired = {key for key in self._fired if key[0] >= cutoff}
+        return cutoff
+
+    def _check(self, month: str, category: str) -> list[dict]:
+        """
+        Проверяет лимит категории за месяц.
+
+        :param month: Месяц в формате YYYY-MM.
+        :param category: Категория.
+        :return: Список новых уведомлений.
+        """
+        limit = self.limits.get(category)
+        if not limit:
+            return []
+        cards = self.totals[(month, category)]
+        total = sum(cards.values())
+        alerts = []
+        for threshold in self.thresholds:
+            if total >= limit * threshold and (month, category, threshold) not in self._fired:
+                self._fired.add((month, category, threshold))
+                alerts.append(
+                    {
+                        "month": month,
+                        "category": category,
+                        "total": round(total, 2),
+                        "limit": limit,
+                        "threshold": threshold,
+                        "level": "exceeded" if threshold >= 1 else "warning",
+                        "cards": {card: round(amount, 2) for card, amount in cards.items()},
+                    }
+                )
+        return alerts
+
+    def to_dict(self) -> dict:
+        """
+        :return: Состояние трекера в JSON-совместимом виде.
+        """
+        return {
+            "limits": self.limits,
+            "thresholds": list(self.thresholds),
+            "totals": [[*key, card, amount] for key, cards in self.totals.items() for card, amount in cards.items()],
+            "fired": [list(key) for key in sorted(self._fired)],
+            "data_version": self.data_version,
+            "applied": self.applied,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "BudgetTracker":
+        """
+        :param state: Состояние трекера (результат to_dict).
+        :return: Восстановленный трекер.
+        """
+        tracker = cls(state["limits"], tuple(state["thresholds"]), state.get("data_version", ""))
+        tracker.applied = list(state.get("applied", []))
+        for month, category, card, amount in state["totals"]:
+            tracker.totals.setdefault((month, category), {})[card] = amount
+        tracker._fired = {(month, category, threshold) for month, category, threshold in state["fired"]}
+        return tracker
+
+
+def load_budget_tracker(limits: dict[str, float], file_path: str = ALERTS_STATE_FILE) -> BudgetTracker | None:
+    """
+    Загружает сохранённое состояние трекера лимитов.
+
+    :param limits: Текущие лимиты; они заменяют сохранённые.
+    :param file_path: Путь к файлу состояния.
+    :return: Трекер или None, если состояние не сохранено или повреждено.
+    """
+    tracker = None
+    try:
+        if os.path.isfile(file_path):
+            with open(file_path, encoding="UTF-8") as file:
+                tracker = BudgetTracker.from_dict(json.load(file))
+            tracker.limits = limits
+    except Exception as ex:
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
+        tracker = None
+    finally:
+        return tracker
+
+
+def save_budget_tracker(tracker: BudgetTracker, file_path: str = ALERTS_STATE_FILE) -> None:
+    """
+    Сохраняет состояние трекера лимитов.
+
+    :param tracker: Трекер.
+    :param file_path: Путь к файлу состояния.
+    :return: None
+    """
+    try:
+        with open(file_path, "w", encoding="UTF-8") as file:
+            json.dump(tracker.to_dict(), file, ensure_ascii=False)
+    except OSError as os_ex:
+        logger.error("%s: %s", os_ex.__class__.__name__, os_ex)
+
+
+@instrumented()
+def append_operations(
+    new_df: pd.DataFrame, limits: dict[str, float], file_path: str = ALERTS_STATE_FILE
+) -> list[dict]:
+    """
+    Добавляет новые операции к сохранённым накопительным суммам и возвращает уведомления о лимитах.
+
+    Если состояние ещё не сохранено или файл операций изменился, оно строится заново по всему файлу операций,
+    уведомления по которому не возвращаются. Набор операций, который уже был добавлен, повторно не учитывается
+    (хранятся отпечатки последних APPLIED_HISTORY_SIZE наборов). Состояние ограничено последними месяцами,
+    поэтому его перезапись не зависит от длины истории.
+
+    :param new_df: DataFrame с новыми операциями.
+    :param limits: Месячные лимиты расходов: категория -> сумма.
+    :param file_path: Путь к файлу состояния.
+    :return: Список уведомлений по новым операциям.
+    """
+    data_version = get_data_version()
+    tracker = load_budget_tracker(limits, file_path)
+    if tracker is None or tracker.data_version != data_version:
+        tracker = BudgetTracker(limits, data_version=data_version)
+        history = get_df_operations(columns=ALERTS_COLUMNS)
+        if isinstance(history, pd.DataFrame):
+            tracker.append(history)
+    fingerprint = get_frame_fingerprint(new_df, ALERTS_COLUMNS)
+    if fingerprint in tracker.applied:
+        logger.info("Операции уже были добавлены к суммам расходов, повторно не учитываются")
+        return []
+    alerts = tracker.append(new_df)
+    remember_fingerprint(tracker.applied, fingerprint)
+    save_budget_tracker(tracker, file_path)
+    return alerts
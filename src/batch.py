@@ -0,0 +1,339 @@
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from src.dates import parse_operation_dates
+from src.decorators import instrumented
+from src.files import get_df_operations, save_result_in_json
+from src.loggers import logger
+from src.utils import (get_df_by_interval, get_filtered_df, get_price_currencies_user, get_price_stocks_user,
+                       get_time_of_day, with_columns)
+from src.views import DASHBOARD_COLUMNS, EVENTS_COLUMNS, get_dashboard_data, get_events_data
+
+BATCH_COLUMNS = with_columns(DASHBOARD_COLUMNS, EVENTS_COLUMNS)
+MAX_WRITERS = 8
+STATEMENT_TOP_N = 5
+NO_CATEGORY = "Без категории"
+USER_ID_PATTERN = re.compile(r"^[\w-]+$")
+
+
+def load_user_profiles(file_path: str) -> list[dict]:
+    """
+    Загружает профили пользователей для пакетного формирования страниц.
+
+    Файл содержит JSON-список профилей вида
+    {"user_id": "...", "user_currencies": [...], "user_stocks": [...], "cards": ["*7197"]}.
+    Ключ "cards" необязателен: без него в расчёт попадают все карты.
+
+    :param file_path: Путь к JSON-файлу с профилями.
+    :return: Список профилей или пустой список в случае ошибки.
+    """
+    profiles = []
+    try:
+        if not os.path.isfile(file_path):
+            raise ValueError("Файл с профилями пользователей не найден")
+        with open(file_path, encoding="UTF-8") as file:
+            profiles = json.load(file)
+        if not isinstance(profiles, list):
+            profiles = []
+            raise ValueError("Файл с профилями пользователей должен содержать список")
+    except ValueError as val_ex:
+        logger.error("%s: %s", val_ex.__class__.__name__, val_ex)
+    except Exception as ex:
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
+    finally:
+        return profiles
+
+
+def get_market_data(profiles: list[dict]) -> tuple[dict[str, float], dict[str, float]]:
+    """
+    Запрашивает курсы валют и цены акций один раз для объединения символов всех пользователей.
+
+    :param profiles: Список профилей пользователей.
+    :return: Кортеж словарей: валюта -> курс и акция -> цена.
+    """
+    currencies = list(dict.fromkeys(c for profile in profiles for c in profile.get("user_currencies", [])))
+    stocks = list(dict.fromkeys(s for profile in profiles for s in profile.get("user_stocks", [])))
+    currency_rates = get_price_currencies_user({"user_currencies": currencies})
+    stock_prices = get_price_stocks_user({"user_stocks": stocks})
+    return (
+        {rate["currency"]: rate["rate"] for rate in currency_rates},
+        {price["stock"]: price["price"] for price in stock_prices},
+    )
+
+
+def filter_by_cards(df: pd.DataFrame, cards: tuple[str, ...] | None) -> pd.DataFrame:
+    """
+    Оставляет операции по выбранным картам.
+
+    :param df: DataFrame с операциями.
+    :param cards: Номера карт (например, "*7197") или None для всех карт.
+    :return: DataFrame с операциями по выбранным картам.
+    """
+    if cards is None:
+        return df
+    return df.loc[df["Номер карты"].isin(cards)]
+
+
+def get_valid_profiles(profiles: list[dict]) -> list[dict]:
+    """
+    Отбирает корректные профили: user_id из букв, цифр, "_" и "-", уникальный в списке,
+    и необязательный ключ "cards" — список строк.
+
+    Профили с повторяющимся user_id отбрасываются все, так как они записывали бы результаты в одни и те же файлы.
+
+    :param profiles: Список профилей пользователей.
+    :return: Список корректных профилей.
+    """
+    user_ids = [str(profile.get("user_id", "")) for profile in profiles]
+    duplicates = {user_id for user_id in user_ids if user_ids.count(user_id) > 1}
+    valid_profiles = []
+    for profile, user_id in zip(profiles, user_ids):
+        cards = profile.get("cards")
+        if not USER_ID_PATTERN.match(user_id):
+            logger.error("Пропущен профиль с некорректным user_id: %s", profile.get("user_id"))
+        elif user_id in duplicates:
+            logger.error("Пропущен профиль с повторяющимся user_id: %s", user_id)
+        elif cards is not None and not (isinstance(cards, list) and all(isinstance(card, str) for card in cards)):
+            logger.error("Пропущен профиль %s: cards должен быть списком строк", user_id)
+        else:
+            valid_profiles.append(profile)
+    return valid_profiles
+
+
+@instrumented()
+def run_batch_dashboards(
+    date: str, profiles: list[dict], range_data: str = "M", with_rates: bool = True, max_workers: int = MAX_WRITERS
+) -> int:
+    """
+    Формирует страницы “Главная” и “События” для множества пользователей за один проход.
+
+    Операции читаются и фильтруются по периоду один раз, курсы валют и цены акций запрашиваются один раз для
+    объединения символов всех пользователей, а расчёт выполняется один раз для каждого уникального набора карт.
+    Результаты записываются в results/main_info_<user_id>.json и results/events_info_<user_id>.json
+    пулом потоков.
+
+    :param date: Дата в формате YYYY-MM-DD HH:MM:SS.
+    :param profiles: Список профилей пользователей (см. load_user_profiles).
+    :param range_data: Диапазон для страницы “События”: "W", "M", "Y" или "ALL".
+    :param with_rates: Запрашивать ли курсы валют и стоимость акций.
+    :param max_workers: Количество потоков записи результатов.
+    :return: Количество успешно записанных файлов.
+    """
+    written = 0
+    try:
+        if not isinstance(profiles, list) or not all(isinstance(profile, dict) for profile in profiles):
+            raise TypeError("Передан неверный тип данных profiles, ожидается список словарей")
+        valid_profiles = get_valid_profiles(profiles)
+
+        df = get_df_operations(columns=BATCH_COLUMNS)
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("Из files.py не получен DataFrame")
+        df["Дата операции"] = parse_operation_dates(df["Дата операции"])
+        interval_df = get_df_by_interval(date=date, df=df)
+        period_df = get_filtered_df(date=date, range_data=range_data, df=df)
+        if not isinstance(interval_df, pd.DataFrame) or not isinstance(period_df, pd.DataFrame):
+            raise ValueError("Не удалось отфильтровать операции по периоду, смотрите логи")
+
+        currency_prices, stock_prices = get_market_data(valid_profiles) if with_rates else ({}, {})
+        greeting = get_time_of_day()
+
+        # Расчёт выполняется один раз на каждый уникальный набор карт, а не на каждого пользователя
+        results_by_cards: dict[tuple[str, ...] | None, tuple[dict, dict]] = {}
+        outputs = []
+        for profile in valid_profiles:
+            cards = tuple(sorted(profile["cards"])) if profile.get("cards") else None
+            if cards not in results_by_cards:
+                results_by_cards[cards] = (
+                    get_dashboard_data(filter_by_cards(interval_df, cards)),
+                    get_events_data(filter_by_cards(period_df, cards)),
+                )
+            dashboard_data, events_data = results_by_cards[cards]
+            currency_rates = [
+                {"currency": currency, "rate": currency_prices[currency]}
+                for currency in profile.get("user_currencies", [])
+                if currency in currency_prices
+            ]
+            user_stock_prices = [
+                {"stock": stock, "price": stock_prices[stock]}
+                for stock in profile.get("user_stocks", [])
+                if stock in stock_prices
+            ]
+            user_id = profile["user_id"]
+            main_info = {
+                "greeting": greeting,
+                "report_date": date,
+                **dashboard_data,
+                "currency_rates": currency_rates,
+                "stock_prices": user_stock_prices,
+            }
+            events_info = {
+                "report_date": date,
+                "range_date": range_data,
+                **events_data,
+                "currency_rates": currency_rates,
+                "stock_prices": user_stock_prices,
+            }
+            outputs.append((f"main_info_{user_id}.json", main_info))
+            outputs.append((f"events_info_{user_id}.json", events_info))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(save_result_in_json, filename=filename, json_obj=json_obj)
+                for filename, json_obj in outputs
+            ]
+            written = sum(1 for future in as_completed(futures) if future.result())
+        if written < len(futures):
+            logger.error("Не удалось записать %s из %s файлов, смотрите логи", len(futures) - written, len(futures))
+    except TypeError as type_ex:
+        logger.error("%s: %s", type_ex.__class__.__name__, type_ex)
+    except ValueError as val_ex:
+        logger.error("%s: %s", val_ex.__class__.__name__, val_ex)
+    except Exception as ex:
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
+    finally:
+        return written
+
+
+@instrumented()
+def build_card_statements(df: pd.DataFrame, top_n: int = STATEMENT_TOP_N) -> list[dict]:
+    """
+    Формирует помесячные выписки по всем картам за один групповой проход.
+
+    Для каждой пары (карта, месяц) считаются расходы, кэшбэк и поступления, топ транзакций и расходы
+    по категориям. Расходы и карточки транзакций формируются по правилам страницы “Главная”:
+    Сумма платежа < 0, Статус == "OK", кэшбэк — 1 рубль на каждые 100 рублей расходов.
+    Топ-N выбирается одной сортировкой по (выписка, сумма) без отдельной фильтрации для каждой выписки.
+
+    :param df: DataFrame с операциями (столбцы DASHBOARD_COLUMNS).
+    :param top_n: Количество крупнейших расходов в выписке.
+    :return: Список выписок, отсортированный по карте и месяцу.
+    :raises ValueError: Если в DataFrame нет необходимых столбцов.
+    """
+    for column in DASHBOARD_COLUMNS:
+        if column not in df.columns:
+            raise ValueError("Переданный DataFrame не содержит необходимые, для обработки, поля")
+    operations = df.loc[(df["Статус"] == "OK") & df["Номер карты"].notna()]
+    dates = parse_operation_dates(operations["Дата операции"])
+    valid = (dates.notna() & operations["Сумма платежа"].notna()).to_numpy()
+    operations, dates = operations.loc[valid], dates.loc[valid]
+    if operations.empty:
+        return []
+
+    # Номер выписки для каждой операции: группы (карта, год * 100 + месяц) в порядке сортировки
+    month_keys = (dates.dt.year * 100 + dates.dt.month).to_numpy()
+    grouped = pd.DataFrame({"card": operations["Номер карты"].to_numpy(), "month": month_keys}).groupby(
+        ["card", "month"], sort=True
+    )
+    statement_ids = grouped.ngroup().to_numpy()
+    keys: list[tuple[str, int]] = grouped.size().index.tolist()
+    amounts = operations["Сумма платежа"].to_numpy(dtype=np.float64)
+    is_expense = amounts < 0
+    count = len(keys)
+    spent = np.bincount(statement_ids, weights=np.where(is_expense, -amounts, 0.0), minlength=count)
+    income = np.bincount(statement_ids, weights=np.where(amounts > 0, amounts, 0.0), minlength=count)
+    operations_count = np.bincount(statement_ids, minlength=count)
+
+    # Топ-N: устойчивая сортировка расходов по (выписка, сумма) и отбор первых N позиций каждой выписки
+    expense_positions = np.flatnonzero(is_expense)
+    order = expense_positions[np.lexsort((amounts[expense_positions], statement_ids[expense_positions]))]
+    sorted_ids = statement_ids[order]
+    starts = np.searchsorted(sorted_ids, np.arange(count))
+    rank = np.arange(len(order)) - starts[sorted_ids]
+    top = order[rank < top_n]
+    top_ids = statement_ids[top]
+    top_dates = dates.to_numpy()[top]
+    top_amounts = amounts[top].tolist()
+    top_categories = operations["Категория"].to_numpy()[top].tolist()
+    top_descriptions = operations["Описание"].to_numpy()[top].tolist()
+    top_bounds = np.searchsorted(top_ids, np.arange(count + 1))
+
+    categories = (
+        pd.DataFrame(
+            {
+                "statement": statement_ids[expense_positions],
+                # Расходы без категории попадают в отдельную строку, чтобы разбивка сходилась с total_spent
+                "category": operations["Категория"].fillna(NO_CATEGORY).to_numpy()[expense_positions],
+                "amount": amounts[expense_positions],
+            }
+        )
+        .groupby(["statement", "category"], sort=False)["amount"]
+        .sum()
+        .reset_index()
+        .sort_values(["statement", "amount"], kind="stable")
+    )
+    category_ids = categories["statement"].to_numpy()
+    category_names = categories["category"].tolist()
+    category_amounts = categories["amount"].tolist()
+    category_bounds = np.searchsorted(category_ids, np.arange(count + 1))
+
+    statements = []
+    for statement_id, (card, month_key) in enumerate(keys):
+        total_spent = round(float(spent[statement_id]), 2)
+        top_start, top_end = top_bounds[statement_id], top_bounds[statement_id + 1]
+        category_start, category_end = category_bounds[statement_id], category_bounds[statement_id + 1]
+        statements.append(
+            {
+                "last_digits": str(card)[1:],
+                "month": f"{month_key // 100:04d}-{month_key % 100:02d}",
+                "total_spent": total_spent,
+                "cashback": round(total_spent / 100, 2),
+                "income": round(float(income[statement_id]), 2),
+                "operations": int(operations_count[statement_id]),
+                "top_transactions": [
+                    {
+                        "date": pd.Timestamp(top_dates[position]).strftime("%d.%m.%Y"),
+                        "amount": top_amounts[position],
+                        "category": top_categories[position],
+                        "description": top_descriptions[position],
+                    }
+                    for position in range(top_start, top_end)
+                ],
+                "categories": [
+                    {"category": category_names[position], "amount": round(abs(category_amounts[position]), 2)}
+                    for position in range(category_start, category_end)
+                ],
+            }
+        )
+    return statements
+
+
+@instrumented()
+def run_batch_statements(top_n: int = STATEMENT_TOP_N, max_workers: int = MAX_WRITERS) -> int:
+    """
+    Формирует помесячные выписки по всем картам и записывает их в results/statement_<карта>_<YYYY-MM>.json
+    пулом из max_workers потоков.
+
+    :param top_n: Количество крупнейших расходов в выписке.
+    :param max_workers: Количество потоков записи результатов.
+    :return: Количество успешно записанных выписок.
+    """
+    written = 0
+    try:
+        df = get_df_operations(columns=DASHBOARD_COLUMNS)
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("Из files.py не получен DataFrame")
+        statements = build_card_statements(df, top_n)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            for statement in statements:
+                if not USER_ID_PATTERN.match(statement["last_digits"]):
+                    logger.error("Пропущена выписка по карте с некорректным номером: %s", statement["last_digits"])
+                    continue
+                filename = f"statement_{statement['last_digits']}_{statement['month']}.json"
+                futures.append(executor.submit(save_result_in_json, filename=filename, json_obj=statement))
+            written = sum(1 for future in as_completed(futures) if future.result())
+        if written < len(futures):
+            logger.error("Не удалось записать %s из %s выписок, смотрите логи", len(futures) - written, len(futures))
+    except TypeError as type_ex:
+        logger.error("%s: %s", type_ex.__class__.__name__, type_ex)
+    except ValueError as val_ex:
+        logger.error("%s: %s", val_ex.__class__.__name__, val_ex)
+    except Exception as ex:
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
+    finally:
+        return written
@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any
+
+from src.config import get_operations_path
+from src.loggers import logger
+
+VIEW_CACHE_SIZE = 128
+VIEW_CACHE_DIR_ENV = "VIEW_CACHE_DIR"
+# Количество последних отпечатков добавленных наборов операций, которые хранятся в состоянии
+APPLIED_HISTORY_SIZE = 100
+
+
+def get_data_version() -> str:
+    """
+    Возвращает версию хранилища операций: путь, время изменения и размер файла.
+
+    Версия меняется при любой перезаписи файла, а её вычисление не требует чтения данных.
+
+    :return: Строка с версией данных.
+    """
+    file_path = get_operations_path()
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return f"{file_path}:missing"
+    return f"{file_path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def get_market_snapshot_id(with_rates: bool) -> str:
+    """
+    Возвращает идентификатор снимка рыночных данных (курсов валют и цен акций).
+
+    Курсы запрашиваются не чаще раза в час: в пределах часа снимок считается неизменным.
+
+    :param with_rates: Используются ли рыночные данные.
+    :return: Идентификатор снимка.
+    """
+    if not with_rates:
+        return "none"
+    return datetime.now().strftime("%Y-%m-%d %H")
+
+
+def make_cache_key(func_name: str, params: dict, data_version: str, snapshot_id: str) -> str:
+    """
+    Формирует ключ кэша из имени функции, нормализованных параметров, версии данных и снимка рынка.
+
+    :param func_name: Имя функции.
+    :param params: Параметры вызова.
+    :param data_version: Версия хранилища операций.
+    :param snapshot_id: Идентификатор снимка рыночных данных.
+    :return: Хэш ключа.
+    """
+    key = json.dumps([func_name, params, data_version, snapshot_id], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(key.encode("UTF-8")).hexdigest()
+
+
+def get_frame_fingerprint(df: Any, columns: list[str]) -> str:
+    """
+    Возвращает отпечаток набора операций: хэш значений столбцов по всем строкам в порядке следования.
+
+    Используется, чтобы не применять повторно уже добавленный файл с новыми операциями.
+
+    :param df: DataFrame с операциями.
+    :param columns: Столбцы, по которым считается отпечаток; отсутствующие считаются пустыми.
+    :return: Хэш набора операций.
+    """
+    import pandas as pd
+
+    row_hashes = pd.util.hash_pandas_object(df.reindex(columns=columns), index=False).to_numpy()
+    return hashlib.sha256(row_hashes.tobytes()).hexdigest()
+
+
+def remember_fingerprint(applied: list[str], fingerprint: str, maxsize: int = APPLIED_HISTORY_SIZE) -> None:
+    """
+    Добавляет отпечаток в список последних добавленных наборов операций; самые старые отпечатки вытесняются,
+    поэтому состояние не растёт с каждым добавлением.
+
+    :param applied: Отпечатки в порядке добавления (изменяется на месте).
+    :param fingerprint: Отпечаток нового набора операций.
+    :param maxsize: Максимальное количество хранимых отпечатков.
+    :return: None
+    """
+    applied.append(fingerprint)
+    del applied[:-maxsize]
+
+
+class ResultCache:
+    """
+    LRU-кэш результатов (JSON-совместимых объектов) с необязательным слоем на диске.
+    """
+
+    def __init__(self, maxsize: int = VIEW_CACHE_SIZE, cache_dir: str | None = None) -> None:
+        """
+        :param maxsize: Максимальное количество результатов в памяти.
+        :param cache_dir: Каталог для хранения результатов на диске или None, чтобы хранить только в памяти.
+        """
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self._items: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _disk_path(self, key: str) -> str | None:
+        """
+        :param key: Ключ кэша.
+        :return: Путь к файлу результата на диске или None, если слой на диске отключён.
+        """
+        return os.path.join(self.cache_dir, f"{key}.json") if self.cache_dir else None
+
+    def get(self, key: str) -> Any | None:
+        """
+        Возвращает результат из памяти или с диска.
+
+        :param key: Ключ кэша.
+        :return: Сохранённый результат или None, если его нет.
+        """
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+        disk_path = self._disk_path(key)
+        if disk_path and os.path.isfile(disk_path):
+            try:
+                with open(disk_path, encoding="UTF-8") as file:
+                    value = json.load(file)
+            except (OSError, ValueError) as ex:
+                logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
+                return None
+            self._remember(key, value)
+            return value
+        return None
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Сохраняет результат в память и, если слой на диске включён, на диск.
+
+        :param key: Ключ кэша.
+        :param value: JSON-совместимый результат.
+        :return: None
+        """
+        self._remember(key, value)
+        disk_path = self._disk_path(key)
+        if disk_path:
+            try:
+                os.makedirs(os.path.dirname(disk_path), exist_ok=True)
+                with open(disk_path, "w", encoding="UTF-8") as file:
+                    json.dump(value, file, ensure_ascii=False)
+            except OSError as os_ex:
+                logger.error("%s: %s", os_ex.__class__.__name__, os_ex)
+
+    def clear(self) -> None:
+        """
+        Очищает кэш в памяти (файлы на диске не удаляются).
+
+        :return: None
+        """
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _remember(self, key: str, value: Any) -> None:
+        """
+        Помещает результат в память с вытеснением самого давно использованного.
+
+        :param key: Ключ кэша.
+        :param value: Результат.
+        :return: None
+        """
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+
+view_cache = ResultCache(cache_dir=os.getenv(VIEW_CACHE_DIR_ENV))
@@ -1,3 +1,25 @@
 import os
 
 PATH_PROJECT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_operations_path() -> str:
+    """
+    Возвращает путь к файлу с операциями пользователя.
+
+    Путь можно переопределить переменной окружения OPERATIONS_FILE (например, для бенчмарков).
+
+    :return: Путь к файлу с операциями.
+    """
+    return os.getenv("OPERATIONS_FILE", os.path.join(PATH_PROJECT, "data", "operations.xls"))
+
+
+def get_backend() -> str:
+    """
+    Возвращает хранилище операций для расчётов: "pandas" (чтение файла) или "sqlite" (запросы к базе).
+
+    Хранилище задаётся переменной окружения OPERATIONS_BACKEND, по умолчанию используется pandas.
+
+    :return: Имя хранилища.
+    """
+    return "sqlite" if os.getenv("OPERATIONS_BACKEND", "pandas").lower() == "sqlite" else "pandas"
@@ -0,0 +1,276 @@
+import json
+import os
+
+import pandas as pd
+
+from src.cache import get_data_version, get_frame_fingerprint, remember_fingerprint
+from src.config import PATH_PROJECT
+from src.dates import parse_operation_dates
+from src.decorators import instrumented
+from src.files import get_df_operations
+from src.loggers import logger
+from src.merchants import MerchantDimension
+from src.services import INDIVIDUAL_PATTERN, PHONE_PATTERN
+
+COUNTERPARTY_COLUMNS = ["Дата операции", "Статус", "Сумма платежа", "Категория", "Описание"]
+COUNTERPARTIES_STATE_FILE = os.path.join(PATH_PROJECT, "data", "counterparties_state.json")
+
+
+def normalize_name(name: str) -> str:
+    """
+    :param name: Имя получателя, например "Иван С.".
+    :return: Имя без лишних пробелов в нижнем регистре (ключ поиска).
+    """
+    return " ".join(name.split()).casefold()
+
+
+def normalize_phone(phone: str) -> str:
+    """
+    :param phone: Номер телефона в произвольной записи, например "+7 995 555-55-55".
+    :return: Номер из 11 цифр, начинающийся с 7, или пустая строка, если это не номер телефона.
+    """
+    digits = "".join(symbol for symbol in phone if symbol.isdigit())
+    if len(digits) != 11 or digits[0] not in "78":
+        return ""
+    return "7" + digits[1:]
+
+
+class CounterpartyLedger:
+    """
+    Реестр переводов физическим лицам: суммы, количество, первая и последняя даты и помесячные суммы по получателям.
+
+    Переводы отбираются как в поиске переводов физическим лицам (категория “Переводы”, описание с именем
+    или номером телефона); учитываются исполненные списания: Сумма платежа < 0 и Статус == "OK".
+    Получатели проиндексированы по имени и номеру телефона, поэтому поиск — одно обращение к словарю.
+    """
+
+    def __init__(self, data_version: str = "") -> None:
+        """
+        :param data_version: Версия файла операций, по которому построен реестр.
+        """
+        self.data_version = data_version
+        # Получатель (имя или номер телефона) -> сводка по переводам
+        self.counterparties: dict[str, dict] = {}
+        # Нормализованное имя или номер телефона -> получатель
+        self._index: dict[str, str] = {}
+        # Отпечатки последних добавленных наборов новых операций (см. get_frame_fingerprint)
+        self.applied: list[str] = []
+
+    def append(self, df: pd.DataFrame) -> int:
+        """
+        Добавляет переводы из новых операций к сводкам получателей за один групповой проход.
+
+        :param df: DataFrame с новыми операциями.
+        :return: Количество учтённых переводов.
+        :raises ValueError: Если в DataFrame нет необходимых столбцов.
+        """
+        for column in COUNTERPARTY_COLUMNS:
+            if column not in df.columns:
+                raise ValueError("Переданный DataFrame не содержит необходимые, для обработки, поля")
+        transfers = df.loc[(df["Категория"] == "Переводы") & (df["Статус"] == "OK") & (df["Сумма платежа"] < 0)]
+        if transfers.empty:
+            return 0
+        # Имена и номера извлекаются один раз для каждого уникального описания
+        merchants = MerchantDimension.from_series(transfers["Описание"])
+        names = pd.Series(merchants.extract(INDIVIDUAL_PATTERN), index=transfers.index, dtype=object)
+        phones = pd.Series(merchants.extract(PHONE_PATTERN), index=transfers.index, dtype=object)
+        normalized_phones = phones.map(normalize_phone, na_action="ignore").replace("", None)
+        dates = parse_operation_dates(transfers["Дата операции"]).dt.strftime("%Y-%m-%d")
+        frame = pd.DataFrame(
+            {
+                # Получатель без имени записывается номером в едином формате, чтобы разные записи номера совпадали
+                "counterparty": names.where(names.notna(), "+" + normalized_phones),
+                "phone": normalized_phones,
+                "date": dates,
+                "month": dates.str[:7],
+                "amount": -transfers["Сумма платежа"],
+            }
+        ).dropna(subset=["counterparty", "date"])
+        if frame.empty:
+            return 0
+
+        monthly = frame.groupby(["counterparty", "month"]).agg(
+            amount=("amount", "sum"), count=("amount", "size"), first_date=("date", "min"), last_date=("date", "max")
+        )
+        for (counterparty, month), amount, count, first_date, last_date in zip(
+            monthly.index.tolist(),
+            monthly["amount"].tolist(),
+            monthly["count"].tolist(),
+            monthly["first_date"].tolist(),
+            monthly["last_date"].tolist(),
+        ):
+            entry = self._get_or_create(counterparty)
+            entry["total"] += amount
+            entry["count"] += count
+            entry["first_date"] = min(entry["first_date"] or first_date, first_date)
+            entry["last_date"] = max(entry["last_date"] or last_date, last_date)
+            entry["monthly"][month] = entry["monthly"].get(month, 0.0) + amount
+            entry["yearly"][month[:4]] = entry["yearly"].get(month[:4], 0.0) + amount
+
+        phones_frame = frame.loc[frame["phone"].fillna("") != "", ["counterparty", "phone"]].drop_duplicates()
+        for counterparty, phone in zip(phones_frame["counterparty"].tolist(), phones_frame["phone"].tolist()):
+            entry = self.counterparties[counterparty]
+            if phone not in entry["phones"]:
+                entry["phones"].append(phone)
+                self._index.setdefault(phone, counterparty)
+        return len(frame)
+
+    def _get_or_create(self, counterparty: str) -> dict:
+        """
+        :param counterparty: Имя или номер телефона получателя.
+        :return: Сводка по получателю; новая сводка добавляется в реестр и индекс.
+        """
+        entry = self.counterparties.get(counterparty)
+        if entry is None:
+            entry = {
+                "name": counterparty,
+                "phones": [],
+                "total": 0.0,
+                "count": 0,
+                "first_date": None,
+                "last_date": None,
+                "monthly": {},
+                "yearly": {},
+            }
+            self.counterparties[counterparty] = entry
+            self._index.setdefault(normalize_phone(counterparty) or normalize_name(counterparty), counterparty)
+        return entry
+
+    def get(self, query: str) -> dict | None:
+        """
+        Находит получателя по имени ("Иван С.") или номеру телефона в любой записи.
+
+        :param query: Имя или номер телефона.
+        :return: Сводка по получателю или None, если переводов ему нет.
+        """
+        counterparty = self._index.get(normalize_name(query))
+        if counterparty is None:
+            phone = normalize_phone(query)
+            counterparty = self._index.get(phone) if phone else None
+        return None if counterparty is None else self.counterparties[counterparty]
+
+    def sent(self, query: str, year: int | None = None) -> float:
+        """
+        :param query: Имя или номер телефона получателя.
+        :param year: Год или None для суммы за всё время.
+        :return: Сумма переводов получателю.
+        """
+        entry = self.get(query)
+        if entry is None:
+            return 0.0
+        total: float = entry["total"] if year is None else entry["yearly"].get(str(year), 0.0)
+        return round(total, 2)
+
+    def to_records(self) -> list[dict]:
+        """
+        :return: Сводки по получателям в порядке убывания суммы переводов, суммы округлены до копеек.
+        """
+        records = []
+        for entry in sorted(self.counterparties.values(), key=lambda item: (-item["total"], item["name"])):
+            records.append(
+                {
+                    "name": entry["name"],
+                    "phones": entry["phones"],
+                    "total": round(entry["total"], 2),
+                    "count": entry["count"],
+                    "first_date": entry["first_date"],
+                    "last_date": entry["last_date"],
+                    "monthly": {month: round(amount, 2) for month, amount in sorted(entry["monthly"].items())},
+                }
+            )
+        return records
+
+    def to_dict(self) -> dict:
+        """
+        :return: Состояние реестра в JSON-совместимом виде.
+        """
+        return {
+            "data_version": self.data_version,
+            "applied": self.applied,
+            "counterparties": list(self.counterparties.values()),
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "CounterpartyLedger":
+        """
+        :param state: Состояние реестра (результат to_dict).
+        :return: Восстановленный реестр.
+        """
+        ledger = cls(state["data_version"])
+        ledger.applied = list(state.get("applied", []))
+        for entry in state["counterparties"]:
+            ledger._get_or_create(entry["name"]).update(entry)
+            for phone in entry["phones"]:
+                ledger._index.setdefault(phone, entry["name"])
+        return ledger
+
+
+def load_counterparty_ledger(file_path: str = COUNTERPARTIES_STATE_FILE) -> CounterpartyLedger | None:
+    """
+    Загружает сохранённый реестр получателей.
+
+    :param file_path: Путь к файлу состояния.
+    :return: Реестр или None, если он не сохранён или повреждён.
+    """
+    ledger = None
+    try:
+        if os.path.isfile(file_path):
+            with open(file_path, encoding="UTF-8") as file:
+                ledger = CounterpartyLedger.from_dict(json.load(file))
+    except Exception as ex:
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
+        ledger = None
+    finally:
+        return ledger
+
+
+def save_counterparty_ledger(ledger: CounterpartyLedger, file_path: str = COUNTERPARTIES_STATE_FILE) -> None:
+    """
+    Сохраняет реестр получателей.
+
+    :param ledger: Реестр.
+    :param file_path: Путь к файлу состояния.
+    :return: None
+    """
+    try:
+        with open(file_path, "w", encoding="UTF-8") as file:
+            json.dump(ledger.to_dict(), file, ensure_ascii=False)
+    except OSError as os_ex:
+        logger.error("%s: %s", os_ex.__class__.__name__, os_ex)
+
+
+@instrumented()
+def update_counterparty_ledger(
+    new_df: pd.DataFrame | None = None, file_path: str = COUNTERPARTIES_STATE_FILE
+) -> CounterpartyLedger:
+    """
+    Возвращает реестр получателей, дополненный новыми операциями.
+
+    Реестр строится по всему файлу операций один раз и перестраивается, только если файл изменился;
+    новые операции добавляются к сохранённому реестру без повторной обработки истории.
+    Набор операций, который уже был добавлен, повторно не учитывается (хранятся отпечатки последних
+    APPLIED_HISTORY_SIZE наборов).
+
+    :param new_df: DataFrame с новыми операциями или None.
+    :param file_path: Путь к файлу состояния.
+    :return: Реестр получателей.
+    """
+    data_version = get_data_version()
+    ledger = load_counterparty_ledger(file_path)
+    changed = ledger is None or ledger.data_version != data_version
+    if ledger is None or changed:
+        ledger = CounterpartyLedger(data_version)
+        history = get_df_operations(columns=COUNTERPARTY_COLUMNS)
+        if isinstance(history, pd.DataFrame):
+            ledger.append(history)
+    if new_df is not None:
+        fingerprint = get_frame_fingerprint(new_df, COUNTERPARTY_COLUMNS)
+        if fingerprint in ledger.applied:
+            logger.info("Операции уже были добавлены в реестр получателей, повторно не учитываются")
+        else:
+            ledger.append(new_df)
+            remember_fingerprint(ledger.applied, fingerprint)
+            changed = True
+    if changed:
+        save_counterparty_ledger(ledger, file_path)
+    return ledger
@@ -0,0 +1,168 @@
+import os
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from src.config import PATH_PROJECT
+from src.dates import parse_operation_dates
+from src.decorators import instrumented
+from src.loggers import logger
+
+RATES_FILE = os.path.join(PATH_PROJECT, "data", "rates.csv")
+RATES_ARCHIVE_URL = "https://www.cbr-xml-daily.ru/archive/{day:%Y/%m/%d}/daily_json.js"
+BASE_CURRENCY = "RUB"
+# Суммы и валюты, которые пересчитываются: столбец суммы -> столбец валюты
+AMOUNT_COLUMNS = {"Сумма операции": "Валюта операции", "Сумма платежа": "Валюта платежа"}
+
+
+def load_rate_table(file_path: str = RATES_FILE) -> pd.DataFrame:
+    """
+    Загружает локально сохранённую таблицу исторических курсов ЦБ РФ.
+
+    :param file_path: Путь к CSV-файлу с курсами.
+    :return: DataFrame со столбцами date, currency, rate (рублей за единицу валюты), пустой, если файла нет.
+    """
+    rate_table = pd.DataFrame({"date": pd.Series(dtype="datetime64[ns]"), "currency": [], "rate": []})
+    try:
+        if os.path.isfile(file_path):
+            rate_table = pd.read_csv(file_path, parse_dates=["date"], dtype={"currency": str, "rate": float})
+    except Exception as ex:
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
+    finally:
+        return rate_table
+
+
+def fetch_rates_for_date(day: date) -> list[dict] | None:
+    """
+    Запрашивает курсы ЦБ РФ на заданную дату из архива cbr-xml-daily.ru.
+
+    :param day: Дата.
+    :return: Список словарей {"date", "currency", "rate"}, пустой список, если курсы на дату не установлены
+        (выходные и праздники), или None в случае ошибки запроса.
+    """
+    result: list[dict] | None = None
+    try:
+        import requests
+
+        response = requests.get(RATES_ARCHIVE_URL.format(day=day))
+        if response.status_code == 404:
+            result = []
+            return result
+        if not response.status_code == 200:
+            raise ConnectionError(f"Ошибка подключения: {response.status_code}")
+        day_dt = datetime(day.year, day.month, day.day)
+        rates = [{"date": day_dt, "currency": BASE_CURRENCY, "rate": 1.0}]
+        for currency, info in response.json()["Valute"].items():
+            rates.append({"date": day_dt, "currency": currency, "rate": info["Value"] / info["Nominal"]})
+        result = rates
+    except ConnectionError as conn_ex:
+        logger.error("%s: %s", conn_ex.__class__.__name__, conn_ex)
+    except Exception as ex:
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
+    finally:
+        return result
+
+
+@instrumented()
+def update_rate_table(start: date, end: date, file_path: str = RATES_FILE) -> pd.DataFrame:
+    """
+    Дозагружает в локальную таблицу курсы за дни из периода, которых в ней ещё нет, и сохраняет её.
+
+    Сетевые запросы выполняются только здесь; пересчёт сумм работает с локальной таблицей.
+    Прошедшие дни без курсов (выходные и праздники) сохраняются строкой базовой валюты, чтобы не запрашивать
+    их повторно; сегодняшний и будущие дни без курсов (курс ещё не опубликован) и дни, запрос за которые
+    завершился ошибкой, не сохраняются и запрашиваются при следующем запуске.
+
+    :param start: Первый день периода.
+    :param end: Последний день периода.
+    :param file_path: Путь к CSV-файлу с курсами.
+    :return: Обновлённая таблица курсов.
+    """
+    rate_table = load_rate_table(file_path)
+    known_days = set(rate_table["date"].dt.date)
+    new_rows = []
+    today = date.today()
+    day = start
+    while day <= end:
+        if day not in known_days:
+            rates = fetch_rates_for_date(day)
+            if rates == [] and day < today:
+                # Отметка проверенного дня: курс базовой валюты к самой себе не влияет на пересчёт
+                rates = [{"date": datetime(day.year, day.month, day.day), "currency": BASE_CURRENCY, "rate": 1.0}]
+            new_rows.extend(rates or [])
+        day += timedelta(days=1)
+    if new_rows:
+        rate_table = pd.concat([rate_table, pd.DataFrame(new_rows)], ignore_index=True)
+        rate_table = rate_table.sort_values(["date", "currency"], ignore_index=True)
+        rate_table.to_csv(file_path, index=False, date_format="%Y-%m-%d")
+    return rate_table
+
+
+def _lookup_rates(dates: pd.Series, currencies: pd.Series, rate_table: pd.DataFrame) -> np.ndarray:
+    """
+    Находит для каждой строки последний известный курс валюты на дату операции (as-of merge).
+
+    :param dates: Series с датами операций.
+    :param currencies: Series с кодами валют.
+    :param rate_table: Таблица курсов.
+    :return: Массив курсов (рублей за единицу валюты), NaN, если курс не найден.
+    """
+    rates = np.full(len(dates), np.nan)
+    is_base = (currencies == BASE_CURRENCY).to_numpy()
+    rates[is_base] = 1.0
+    to_lookup = ~is_base & dates.notna().to_numpy() & currencies.notna().to_numpy()
+    if to_lookup.any() and not rate_table.empty:
+        left = pd.DataFrame(
+            {
+                "date": dates[to_lookup].astype("datetime64[ns]").to_numpy(),
+                "currency": currencies[to_lookup].astype(str).to_numpy(),
+                "position": np.flatnonzero(to_lookup),
+            }
+        ).sort_values("date", kind="stable")
+        right = rate_table.astype({"date": "datetime64[ns]", "currency": str}).sort_values("date", kind="stable")
+        merged = pd.merge_asof(left, right, on="date", by="currency", direction="backward")
+        rates[merged["position"].to_numpy()] = merged["rate"].to_numpy()
+    return rates
+
+
+@instrumented()
+def convert_operations(
+    df: pd.DataFrame, target: str = BASE_CURRENCY, rate_table: pd.DataFrame | None = None, replace: bool = False
+) -> pd.DataFrame:
+    """
+    Пересчитывает суммы операций в целевую валюту по историческим курсам на дату операции.
+
+    Курс каждой строки находится as-of merge по дате и валюте за один векторный проход, без сетевых запросов.
+    По умолчанию добавляются столбцы "Сумма операции (<валюта>)" и "Сумма платежа (<валюта>)".
+
+    :param df: DataFrame с операциями.
+    :param target: Код целевой валюты.
+    :param rate_table: Таблица курсов или None для загрузки локальной таблицы.
+    :param replace: Заменить исходные суммы и валюты пересчитанными вместо добавления новых столбцов.
+    :return: Новый DataFrame с пересчитанными суммами.
+    :raises ValueError: Если в DataFrame нет столбца с датой операции.
+    """
+    if "Дата операции" not in df.columns:
+        raise ValueError("Переданный DataFrame не содержит столбец Дата операции")
+    if rate_table is None:
+        rate_table = load_rate_table()
+    result_df = df.copy()
+    dates = parse_operation_dates(df["Дата операции"])
+    target_rates = _lookup_rates(dates, pd.Series(target, index=df.index), rate_table)
+    for amount_column, currency_column in AMOUNT_COLUMNS.items():
+        if amount_column not in df.columns or currency_column not in df.columns:
+            continue
+        source_rates = _lookup_rates(dates, df[currency_column], rate_table)
+        converted = df[amount_column].to_numpy(dtype=float) * source_rates / target_rates
+        missing = np.isnan(converted) & df[amount_column].notna().to_numpy()
+        if missing.any():
+            logger.error(
+                "Нет курса для пересчёта %s из %s сумм (%s) в %s", missing.sum(), len(df), amount_column, target
+            )
+        if replace:
+            result_df[amount_column] = converted.round(2)
+            result_df[currency_column] = target
+        else:
+            result_df[f"{amount_column} ({target})"] = converted.round(2)
+    return result_df
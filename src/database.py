@@ -0,0 +1,375 @@
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any
+
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+from src.cache import get_data_version
+from src.config import PATH_PROJECT
+from src.dates import parse_date, parse_operation_dates
+from src.decorators import instrumented
+from src.files import get_df_operations
+from src.loggers import logger
+
+TABLE_NAME = "operations"
+# Дата операции в формате ISO: строки сравниваются так же, как даты, и используют индекс
+DATE_COLUMN = "_date"
+INDEXED_COLUMNS = [DATE_COLUMN, "Номер карты", "Категория", "Статус"]
+SQL_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+EXCLUDED_CATEGORIES = ("Наличные", "Переводы")
+
+
+def get_db_path() -> str:
+    """
+    Возвращает путь к базе SQLite с операциями.
+
+    Путь можно переопределить переменной окружения OPERATIONS_DB.
+
+    :return: Путь к файлу базы.
+    """
+    return os.getenv("OPERATIONS_DB", os.path.join(PATH_PROJECT, "data", "operations.sqlite"))
+
+
+@lru_cache(maxsize=256)
+def _compile(pattern: str, flags: int) -> re.Pattern:
+    """
+    :param pattern: Регулярное выражение.
+    :param flags: Флаги re.
+    :return: Скомпилированное выражение (компилируется один раз на запрос, а не на строку).
+    """
+    return re.compile(pattern, flags)
+
+
+@lru_cache(maxsize=65536)
+def _regexp(pattern: str, value: Any) -> bool:
+    """
+    Реализация оператора REGEXP для SQLite (с учётом регистра).
+    Результат кэшируется, поэтому выражение проверяется один раз на уникальное описание.
+    """
+    return isinstance(value, str) and _compile(pattern, 0).search(value) is not None
+
+
+@lru_cache(maxsize=65536)
+def _regexp_i(pattern: str, value: Any) -> bool:
+    """
+    Поиск по регулярному выражению без учёта регистра, в том числе для кириллицы
+    (встроенные LIKE и lower в SQLite учитывают регистр только для ASCII).
+    """
+    return isinstance(value, str) and _compile(pattern, re.IGNORECASE).search(value) is not None
+
+
+def connect(db_path: str | None = None) -> sqlite3.Connection:
+    """
+    Открывает соединение с базой операций и регистрирует функции поиска по регулярным выражениям.
+
+    :param db_path: Путь к файлу базы или None для пути по умолчанию.
+    :return: Соединение SQLite.
+    """
+    connection = sqlite3.connect(db_path or get_db_path())
+    connection.create_function("regexp", 2, _regexp, deterministic=True)
+    connection.create_function("regexp_i", 2, _regexp_i, deterministic=True)
+    return connection
+
+
+@instrumented()
+def build_database(db_path: str | None = None) -> bool:
+    """
+    Загружает операции из файла в базу SQLite и создаёт индексы по дате, карте, категории и статусу.
+
+    Вместе с таблицей сохраняются версия исходного файла и типы столбцов, чтобы результаты запросов
+    совпадали с результатами обработки в pandas.
+
+    :param db_path: Путь к файлу базы или None для пути по умолчанию.
+    :return: True, если база создана, иначе False.
+    """
+    df = get_df_operations()
+    if not isinstance(df, pd.DataFrame):
+        logger.error("Не удалось создать базу операций: из files.py не получен DataFrame")
+        return False
+    dtypes = {str(column): str(dtype) for column, dtype in df.dtypes.items()}
+    df[DATE_COLUMN] = parse_operation_dates(df["Дата операции"]).dt.strftime(SQL_DATE_FORMAT)
+    with connect(db_path) as connection:
+        df.to_sql(TABLE_NAME, connection, if_exists="replace", index=False, chunksize=100_000)
+        for column in INDEXED_COLUMNS:
+            connection.execute(f'CREATE INDEX "ix_{TABLE_NAME}_{column}" ON {TABLE_NAME} ("{column}")')
+        connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        connection.executemany(
+            "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+            [("data_version", get_data_version()), ("dtypes", json.dumps(dtypes, ensure_ascii=False))],
+        )
+    connection.close()
+    return True
+
+
+def _get_meta(connection: sqlite3.Connection) -> dict[str, str]:
+    """
+    :param connection: Соединение с базой.
+    :return: Служебные данные базы или пустой словарь, если база ещё не создана.
+    """
+    try:
+        return dict(connection.execute("SELECT key, value FROM meta").fetchall())
+    except sqlite3.OperationalError:
+        return {}
+
+
+def ensure_database(db_path: str | None = None) -> dict[str, str]:
+    """
+    Пересоздаёт базу, если её нет или файл с операциями изменился.
+
+    :param db_path: Путь к файлу базы или None для пути по умолчанию.
+    :return: Служебные данные базы.
+    :raises ValueError: Если базу не удалось создать.
+    """
+    connection = connect(db_path)
+    meta = _get_meta(connection)
+    connection.close()
+    if meta.get("data_version") != get_data_version():
+        if not build_database(db_path):
+            raise ValueError("База операций не создана, смотрите логи")
+        connection = connect(db_path)
+        meta = _get_meta(connection)
+        connection.close()
+    return meta
+
+
+def _select(where: str, params: list, columns: list[str] | None = None, suffix: str = "") -> pd.DataFrame:
+    """
+    Выбирает операции по условию в порядке файла и восстанавливает исходные типы столбцов.
+
+    :param where: SQL-условие.
+    :param params: Параметры условия.
+    :param columns: Столбцы результата (в порядке файла, как при чтении части столбцов) или None для всех.
+    :param suffix: Окончание запроса (ORDER BY, LIMIT), по умолчанию порядок строк файла.
+    :return: DataFrame с операциями.
+    """
+    meta = ensure_database()
+    dtypes = json.loads(meta["dtypes"])
+    columns = [column for column in dtypes if columns is None or column in columns]
+    select = ", ".join(f'"{column}"' for column in columns)
+    query = f"SELECT {select} FROM {TABLE_NAME} WHERE {where} {suffix or 'ORDER BY rowid'}"
+    connection = connect()
+    try:
+        df = pd.read_sql_query(query, connection, params=params)
+    finally:
+        connection.close()
+    return df.astype({column: dtypes[column] for column in columns if column in dtypes})
+
+
+def _aggregate(query: str, params: list) -> list[tuple]:
+    """
+    Выполняет агрегирующий запрос к базе операций.
+
+    :param query: SQL-запрос.
+    :param params: Параметры запроса.
+    :return: Строки результата.
+    """
+    ensure_database()
+    connection = connect()
+    try:
+        return connection.execute(query, params).fetchall()
+    finally:
+        connection.close()
+
+
+def _format_date(date_dt: datetime) -> str:
+    return date_dt.strftime(SQL_DATE_FORMAT)
+
+
+def _get_period_condition(date: str, range_data: str) -> tuple[str, list]:
+    """
+    Формирует SQL-условие периода так же, как src.utils.get_filtered_df.
+
+    :param date: Дата в формате YYYY-MM-DD HH:MM:SS.
+    :param range_data: Диапазон: "W", "M", "Y" или "ALL".
+    :return: Условие и его параметры.
+    :raises ValueError: Если передана неверная дата или диапазон.
+    """
+    date_dt = parse_date(date)
+    if not isinstance(range_data, str) or range_data.upper() not in ["W", "M", "Y", "ALL"]:
+        raise ValueError('Передано неверное значение в range_data. Возможные значения: "W", "M", "Y", "ALL"')
+    if range_data == "W":
+        start_week = date_dt - timedelta(days=date_dt.weekday())
+        end_week = start_week + timedelta(days=6)
+        return f"{DATE_COLUMN} BETWEEN ? AND ?", [_format_date(start_week), _format_date(end_week)]
+    if range_data == "M":
+        start = datetime(date_dt.year, date_dt.month, 1)
+        end = datetime(date_dt.year + date_dt.month // 12, date_dt.month % 12 + 1, 1)
+        return f"{DATE_COLUMN} >= ? AND {DATE_COLUMN} < ?", [_format_date(start), _format_date(end)]
+    if range_data == "Y":
+        start, end = datetime(date_dt.year, 1, 1), datetime(date_dt.year + 1, 1, 1)
+        return f"{DATE_COLUMN} >= ? AND {DATE_COLUMN} < ?", [_format_date(start), _format_date(end)]
+    return "1", []
+
+
+@instrumented()
+def query_dashboard_data(date: str) -> dict:
+    """
+    Рассчитывает данные страницы “Главная” запросами к базе (аналог get_dashboard_data по get_df_by_interval).
+
+    :param date: Дата окончания интервала в формате YYYY-MM-DD HH:MM:SS.
+    :return: Словарь с ключами "cards" и "top_transactions".
+    :raises ValueError: Если передана неверная дата.
+    """
+    user_date = parse_date(date)
+    where = f'{DATE_COLUMN} BETWEEN ? AND ? AND "Сумма платежа" < 0 AND "Статус" = \'OK\''
+    params = [_format_date(user_date.replace(day=1)), _format_date(user_date)]
+    dashboard_data: dict = {"cards": [], "top_transactions": []}
+
+    top_transactions = _aggregate(
+        f'SELECT {DATE_COLUMN}, "Сумма платежа", "Категория", "Описание" FROM {TABLE_NAME} WHERE {where} '
+        'ORDER BY "Сумма платежа", rowid LIMIT 5',
+        params,
+    )
+    for date_iso, amount, category, description in top_transactions:
+        dashboard_data["top_transactions"].append(
+            {
+                "date": datetime.strptime(date_iso, SQL_DATE_FORMAT).strftime("%d.%m.%Y"),
+                "amount": amount,
+                "category": category,
+                "description": description,
+            }
+        )
+
+    cards = _aggregate(
+        f'SELECT "Номер карты", SUM("Сумма платежа") FROM {TABLE_NAME} WHERE {where} '
+        'GROUP BY "Номер карты" ORDER BY "Номер карты"',
+        params,
+    )
+    for card, sum_pay in cards:
+        if isinstance(card, str) and isinstance(sum_pay, float):
+            dashboard_data["cards"].append(
+                {
+                    "last_digits": card[1:],
+                    "total_spent": round(abs(sum_pay), 2),
+                    "cashback": round(abs(sum_pay) / 100, 2),
+                }
+            )
+    return dashboard_data
+
+
+def _sum_by_category(where: str, params: list, descending: bool = False, limit: int | None = None) -> list[dict]:
+    """
+    Суммирует платежи по категориям и возвращает список в формате get_list_categories_with_amounts.
+
+    :param where: SQL-условие.
+    :param params: Параметры условия.
+    :param descending: Сортировать суммы по убыванию.
+    :param limit: Количество категорий или None для всех.
+    :return: Список словарей {"category", "amount"}.
+    """
+    order = "DESC" if descending else "ASC"
+    rows = _aggregate(
+        f'SELECT "Категория", SUM("Сумма платежа") AS total FROM {TABLE_NAME} WHERE {where} '
+        f'AND "Категория" IS NOT NULL GROUP BY "Категория" ORDER BY total {order}, "Категория"'
+        + (f" LIMIT {int(limit)}" if limit is not None else ""),
+        params,
+    )
+    return [
+        {"category": category, "amount": round(abs(amount))}
+        for category, amount in rows
+        if isinstance(category, str) and isinstance(amount, float)
+    ]
+
+
+@instrumented()
+def query_events_data(date: str, range_data: str) -> dict:
+    """
+    Рассчитывает данные страницы “События” запросами к базе (аналог get_events_data по get_filtered_df).
+
+    :param date: Дата в формате YYYY-MM-DD HH:MM:SS.
+    :param range_data: Диапазон: "W", "M", "Y" или "ALL".
+    :return: Словарь с ключами "expenses" и "income".
+    :raises ValueError: Если передана неверная дата или диапазон.
+    """
+    period, params = _get_period_condition(date, range_data)
+    costs = f'{period} AND "Сумма платежа" < 0 AND "Статус" = \'OK\''
+    receipts = f'{period} AND "Сумма платежа" > 0 AND "Статус" = \'OK\''
+    excluded = ", ".join(f"'{category}'" for category in EXCLUDED_CATEGORIES)
+    [(total_costs, total_receipts)] = _aggregate(
+        f'SELECT TOTAL(CASE WHEN "Сумма платежа" < 0 THEN "Сумма платежа" END), '
+        f'TOTAL(CASE WHEN "Сумма платежа" > 0 THEN "Сумма платежа" END) '
+        f"FROM {TABLE_NAME} WHERE {period} AND \"Статус\" = 'OK'",
+        params,
+    )
+    return {
+        "expenses": {
+            "total_amount": round(abs(total_costs)),
+            "main": _sum_by_category(f'{costs} AND "Категория" NOT IN ({excluded})', params, limit=7),
+            "transfers_and_cash": _sum_by_category(f'{costs} AND "Категория" IN ({excluded})', params),
+        },
+        "income": {
+            "total_amount": round(total_receipts),
+            "main": _sum_by_category(receipts, params, descending=True),
+        },
+    }
+
+
+@instrumented()
+def query_by_description(pattern: str, case: bool = True, category: str | None = None) -> pd.DataFrame:
+    """
+    Ищет операции по регулярному выражению в описании (аналог df["Описание"].str.contains).
+
+    :param pattern: Регулярное выражение.
+    :param case: Учитывать регистр (без учёта регистра поиск работает и для кириллицы).
+    :param category: Категория операций или None для всех категорий.
+    :return: DataFrame с найденными операциями в порядке файла.
+    """
+    function = "regexp" if case else "regexp_i"
+    where = f'{function}(?, "Описание")'
+    params: list = [pattern]
+    if category is not None:
+        where = f'"Категория" = ? AND {where}'
+        params.insert(0, category)
+    return _select(where, params)
+
+
+@instrumented()
+def query_report_window(
+    date: str | None, columns: list[str], category: str | None = None, months: int = 3
+) -> pd.DataFrame:
+    """
+    Выбирает исполненные траты за последние месяцы до даты (окно отчётов о тратах src.reports).
+
+    Отбор по периоду, статусу, знаку суммы и категории выполняет SQLite по индексам, поэтому в отчёт
+    попадает только окно, а не весь файл операций; отчёт применяет к окну те же условия повторно.
+
+    :param date: Дата окончания периода в формате YYYY-MM-DD HH:MM:SS или None для текущей даты.
+    :param columns: Столбцы результата.
+    :param category: Категория трат или None для всех категорий.
+    :param months: Длина периода в месяцах.
+    :return: DataFrame с операциями в порядке файла.
+    :raises ValueError: Если передана неверная дата.
+    """
+    end = datetime.now() if date is None else parse_date(date)
+    start = end - relativedelta(months=months)
+    where = f'{DATE_COLUMN} BETWEEN ? AND ? AND "Статус" = \'OK\' AND "Сумма операции" < 0'
+    params: list = [_format_date(start), _format_date(end)]
+    if category is not None:
+        where += ' AND "Категория" = ?'
+        params.append(category)
+    return _select(where, params, columns)
+
+
+@instrumented()
+def query_cashback_by_category(year: int, month: int) -> pd.Series:
+    """
+    Суммирует кэшбэк по категориям за месяц (аналог группировки в categories_of_increased_cashback).
+
+    :param year: Год.
+    :param month: Месяц.
+    :return: Series "категория -> сумма кэшбэка", отсортированная по убыванию суммы.
+    """
+    start = datetime(year, month, 1)
+    end = datetime(year + month // 12, month % 12 + 1, 1)
+    rows = _aggregate(
+        f'SELECT "Категория", TOTAL("Кэшбэк") AS total FROM {TABLE_NAME} '
+        f'WHERE {DATE_COLUMN} >= ? AND {DATE_COLUMN} < ? AND "Категория" IS NOT NULL '
+        'GROUP BY "Категория" ORDER BY total DESC, "Категория"',
+        [_format_date(start), _format_date(end)],
+    )
+    return pd.Series(dict(rows), dtype=float)
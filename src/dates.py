@@ -0,0 +1,133 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from src.loggers import logger
+
+USER_DATE_PATTERN = re.compile(r"\b\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\b")
+USER_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+OPERATION_DATE_FORMAT = "%d.%m.%Y %H:%M:%S"
+# Сколько примеров некорректных значений выводить в сводном сообщении лога
+INVALID_SAMPLE_SIZE = 3
+
+
+@lru_cache(maxsize=4096)
+def _parse_user_date(date_str: str) -> datetime:
+    """
+    Разбирает строку с датой в формате YYYY-MM-DD HH:MM:SS; успешные результаты кэшируются.
+
+    :param date_str: Строка с датой.
+    :return: Объект datetime.
+    :raises ValueError: Если строка не содержит дату в ожидаемом формате.
+    """
+    date_match = USER_DATE_PATTERN.search(date_str)
+    if not date_match:
+        raise ValueError("Передан неверный формат даты, ожидается YYYY-MM-DD HH:MM:SS")
+    return datetime.strptime(date_match[0], USER_DATE_FORMAT)
+
+
+def parse_date(date_checked: str) -> datetime:
+    """
+    Разбирает одну пользовательскую дату в формате YYYY-MM-DD HH:MM:SS.
+
+    Регулярное выражение скомпилировано один раз, повторные вызовы с той же строкой берутся из кэша.
+
+    :param date_checked: Строка с датой.
+    :return: Объект datetime.
+    :raises TypeError: Если передан не str.
+    :raises ValueError: Если передан неверный формат даты.
+    """
+    if not isinstance(date_checked, str):
+        raise TypeError("Передан неверный тип данных, ожидается str")
+    return _parse_user_date(date_checked)
+
+
+@lru_cache(maxsize=1)
+def _get_datetime_dtype() -> Any:
+    """
+    Возвращает тип данных, который pandas.to_datetime использует для дат (зависит от версии pandas).
+
+    :return: Тип данных datetime64.
+    """
+    return pd.to_datetime(pd.Series(["01.01.2000 00:00:00"]), format=OPERATION_DATE_FORMAT).dtype
+
+
+def _parse_operation_dates_fast(series: pd.Series) -> pd.Series | None:
+    """
+    Быстрый разбор дат формата ДД.ММ.ГГГГ ЧЧ:ММ:СС перестановкой символов в ISO 8601 средствами NumPy.
+
+    Применяется, только если все непустые значения имеют каноническую форму; иначе возвращается None,
+    и разбор выполняется pandas.to_datetime, чтобы результат совпадал с ним для любых входных данных.
+
+    :param series: Series со строками дат.
+    :return: Series с датами или None, если быстрый разбор невозможен.
+    """
+    present = series.notna().to_numpy()
+    if not series[present].str.len().eq(19).all():
+        return None
+    chars = series[present].to_numpy(dtype="U19").view("U1").reshape(-1, 19)
+    separators = [(2, "."), (5, "."), (10, " "), (13, ":"), (16, ":")]
+    if not all((chars[:, position] == separator).all() for position, separator in separators):
+        return None
+    iso_chars = np.empty_like(chars)
+    iso_chars[:, 0:4] = chars[:, 6:10]
+    iso_chars[:, 4] = "-"
+    iso_chars[:, 5:7] = chars[:, 3:5]
+    iso_chars[:, 7] = "-"
+    iso_chars[:, 8:10] = chars[:, 0:2]
+    iso_chars[:, 10] = "T"
+    iso_chars[:, 11:19] = chars[:, 11:19]
+    try:
+        parsed_values = iso_chars.view("U19").ravel().astype("datetime64[s]")
+    except ValueError:
+        return None
+    result = np.full(len(series), np.datetime64("NaT"), dtype="datetime64[s]")
+    result[present] = parsed_values
+    return pd.Series(result, index=series.index, name=series.name).astype(_get_datetime_dtype())
+
+
+def parse_dates(values: Any, date_format: str = OPERATION_DATE_FORMAT) -> tuple[pd.Series, np.ndarray]:
+    """
+    Векторно разбирает массив дат и возвращает маску некорректных значений.
+
+    Ошибки не логируются по одной: в лог пишется одно сводное сообщение с количеством и примерами.
+    Уже разобранные даты (datetime64) возвращаются без повторного разбора.
+
+    :param values: Series, массив или список строк с датами.
+    :param date_format: Формат дат, по умолчанию формат столбца "Дата операции".
+    :return: Кортеж из Series с датами (NaT на месте некорректных значений) и булевой маски некорректных строк.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series, series.isna().to_numpy()
+    parsed = None
+    if date_format == OPERATION_DATE_FORMAT and pd.api.types.is_string_dtype(series):
+        parsed = _parse_operation_dates_fast(series)
+    if parsed is None:
+        parsed = pd.to_datetime(series, format=date_format, errors="coerce")
+    invalid = parsed.isna().to_numpy()
+    if invalid.any():
+        sample = series[invalid].head(INVALID_SAMPLE_SIZE).tolist()
+        logger.error(
+            "Не удалось разобрать %s из %s дат (формат %s), например: %s",
+            int(invalid.sum()),
+            len(series),
+            date_format,
+            sample,
+        )
+    return parsed, invalid
+
+
+def parse_operation_dates(values: pd.Series) -> pd.Series:
+    """
+    Разбирает столбец "Дата операции"; некорректные значения становятся NaT и не проходят фильтры по датам.
+
+    :param values: Series со строками дат в формате ДД.ММ.ГГГГ ЧЧ:ММ:СС или уже разобранными датами.
+    :return: Series с датами.
+    """
+    parsed, _ = parse_dates(values, OPERATION_DATE_FORMAT)
+    return parsed
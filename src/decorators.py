@@ -7,6 +7,7 @@ import pandas as pd
 
 from src.config import PATH_PROJECT
 from src.loggers import logger
+from src.metrics import count_rows, measure
 
 
 def saving_to_file(filename: str | None = None) -> Callable:
@@ -34,9 +35,40 @@ def saving_to_file(filename: str | None = None) -> Callable:
                 result.to_excel(file_path, index=False)
                 return result
             except TypeError as type_ex:
-                logger.error(f"{type_ex.__class__.__name__}: {type_ex}")
+                logger.error("%s: %s", type_ex.__class__.__name__, type_ex)
             except Exception as ex:
-                logger.debug(f"{ex.__class__.__name__}: {ex}", exc_info=True)
+                logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
+
+        return inner
+
+    return wrapper
+
+
+def instrumented(name: str | None = None) -> Callable:
+    """
+    Декоратор для замера вызовов функции: время, процессорное время, строки на входе и выходе, пик памяти.
+
+    Метрики записываются в реестр src.metrics и в логгер. Если имя функции передано в PROFILE_FUNC,
+    вызов дополнительно профилируется cProfile и tracemalloc.
+
+    :param name: Имя метрики, по умолчанию имя функции.
+    :return: Декорированная функция.
+    """
+
+    def wrapper(func: Callable) -> Callable:
+        metric_name = name or func.__name__
+
+        @wraps(func)
+        def inner(*args: tuple, **kwargs: dict) -> Any:
+            rows_in = None
+            for arg in (*args, *kwargs.values()):
+                rows_in = count_rows(arg)
+                if rows_in is not None:
+                    break
+            with measure(metric_name, rows_in=rows_in) as metric:
+                result = func(*args, **kwargs)
+                metric["rows_out"] = count_rows(result)
+            return result
 
         return inner
 
@@ -1,31 +1,131 @@
+import importlib.util
 import json
 import os
+from functools import lru_cache
 from typing import Any
 
 import pandas as pd
 
-from src.config import PATH_PROJECT
+from src.config import PATH_PROJECT, get_operations_path
+from src.dates import OPERATION_DATE_FORMAT
 from src.loggers import logger
 
+# Движки чтения по расширению в порядке предпочтения: (движок pandas, модуль, который должен быть установлен)
+READER_ENGINES: dict[str, list[tuple[str, str]]] = {
+    ".xls": [("calamine", "python_calamine"), ("xlrd", "xlrd")],
+    ".xlsx": [("calamine", "python_calamine"), ("openpyxl", "openpyxl")],
+    ".csv": [("pyarrow", "pyarrow"), ("c", "")],
+}
+# Типы столбцов задаются заранее, чтобы движки не выводили их по данным
+OPERATIONS_DTYPES = {
+    "Дата операции": "str",
+    "Дата платежа": "str",
+    "Номер карты": "str",
+    "Статус": "str",
+    "Сумма операции": "float64",
+    "Валюта операции": "str",
+    "Сумма платежа": "float64",
+    "Валюта платежа": "str",
+    "Кэшбэк": "float64",
+    "Категория": "str",
+    "MCC": "float64",
+    # Описания повторяются (несколько тысяч мерчантов), поэтому хранятся категориальным столбцом
+    "Описание": "category",
+    "Сумма операции с округлением": "float64",
+}
 
-def get_df_operations() -> pd.DataFrame | None:
+# Формат дат в схеме операций; ячейки дат Excel при чтении строками приходят в формате ISO
+DATE_FORMATS = {"Дата операции": OPERATION_DATE_FORMAT, "Дата платежа": "%d.%m.%Y"}
+
+
+@lru_cache(maxsize=None)
+def get_reader_engines(extension: str) -> list[str]:
+    """
+    Возвращает установленные движки чтения для расширения файла в порядке предпочтения (от быстрого к медленному).
+
+    :param extension: Расширение файла, например ".xls".
+    :return: Список движков pandas.
+    """
+    return [
+        engine
+        for engine, module in READER_ENGINES.get(extension.lower(), [])
+        if not module or importlib.util.find_spec(module) is not None
+    ]
+
+
+def read_operations_file(
+    file_path: str, columns: list[str] | None = None, engine: str | None = None, declared_dtypes: bool = True
+) -> pd.DataFrame:
+    """
+    Читает файл с операциями в формате CSV или Excel самым быстрым из установленных движков.
+
+    Если движок не смог прочитать файл, используется следующий по списку READER_ENGINES.
+    Даты, записанные ячейками дат Excel или строками ISO, приводятся к формату схемы операций.
+
+    :param file_path: Путь к файлу.
+    :param columns: Список столбцов, которые нужно прочитать, или None для чтения всех столбцов.
+    :param engine: Движок pandas или None для автоматического выбора.
+    :param declared_dtypes: Читать столбцы с типами OPERATIONS_DTYPES; False — типы выводятся по данным.
+    :return: DataFrame с операциями.
+    :raises ValueError: Если для формата файла нет установленных движков.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    engines = [engine] if engine else get_reader_engines(extension)
+    if not engines:
+        raise ValueError(f"Нет установленных движков для чтения файлов {extension}")
+    for position, current_engine in enumerate(engines):
+        dtype = OPERATIONS_DTYPES if declared_dtypes else None
+        options: dict[str, Any] = {"usecols": columns, "dtype": dtype, "engine": current_engine}
+        try:
+            if extension == ".csv":
+                df: pd.DataFrame = pd.read_csv(file_path, **options)
+            else:
+                df = pd.read_excel(file_path, **options)
+            return _format_iso_dates(df) if declared_dtypes else df
+        except Exception as ex:
+            if position == len(engines) - 1:
+                raise
+            logger.debug("Движок %s не прочитал %s: %s: %s", current_engine, file_path, ex.__class__.__name__, ex)
+    raise ValueError(f"Нет установленных движков для чтения файлов {extension}")
+
+
+def _format_iso_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Переводит даты в формате ISO (так читаются строками ячейки дат Excel) в формат схемы операций.
+
+    :param df: DataFrame с датами, прочитанными строками.
+    :return: Тот же DataFrame с датами в формате DATE_FORMATS.
+    """
+    for column, date_format in DATE_FORMATS.items():
+        if column not in df.columns:
+            continue
+        # Год в начале строки: "2021-03-01 10:00:00" вместо "01.03.2021 10:00:00"
+        is_iso = (df[column].str.slice(4, 5) == "-").fillna(False).to_numpy(dtype=bool)
+        if is_iso.any():
+            dates = pd.to_datetime(df.loc[is_iso, column], format="ISO8601", errors="coerce")
+            df.loc[is_iso, column] = dates.dt.strftime(date_format)
+    return df
+
+
+def get_df_operations(columns: list[str] | None = None) -> pd.DataFrame | None:
     """
     Возвращает DataFrame с данными операций пользователя из файла.
 
+    :param columns: Список столбцов, которые нужно прочитать, или None для чтения всех столбцов.
     :return: Путь к файлу с операциями пользователя или None в случае ошибки
     :raises ValueError: Если файл с операциями пользователя не найден.
     :raises Exception: Если возникает неожиданная ошибка при чтении файла.
     """
     df_operations = None
     try:
-        file_operations = os.path.join(PATH_PROJECT, "data", "operations.xls")
+        file_operations = get_operations_path()
         if not os.path.isfile(file_operations):
             raise ValueError("Файл с операциями пользователя не найден")
-        df_operations = pd.read_excel(file_operations)
+        df_operations = read_operations_file(file_operations, columns=columns)
     except ValueError as val_ex:
-        logger.error(f"{val_ex.__class__.__name__}: {val_ex}")
+        logger.error("%s: %s", val_ex.__class__.__name__, val_ex)
     except Exception as ex:
-        logger.debug(f"{ex.__class__.__name__}: {ex}", exc_info=True)
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
     finally:
         return df_operations
 
@@ -46,33 +146,62 @@ def get_user_settings() -> dict:
         with open(settings_file, encoding="UTF-8") as file:
             settings = json.load(file)
     except ValueError as val_ex:
-        logger.error(f"{val_ex.__class__.__name__}: {val_ex}")
+        logger.error("%s: %s", val_ex.__class__.__name__, val_ex)
     except Exception as ex:
-        logger.debug(f"{ex.__class__.__name__}: {ex}", exc_info=True)
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
     finally:
         return settings
 
 
-def save_result_in_json(filename: str, json_obj: dict[Any, Any]) -> None:
+def save_result_in_json(filename: str, json_obj: dict[Any, Any]) -> bool:
     """
     Сохраняет переданный Список словарей в файл в формате JSON.
+    Если файл уже содержит тот же результат, он не перезаписывается.
 
     :param filename: Имя файла
     :param json_obj: JSON объект python
-    :return: None
+    :return: True, если результат сохранён (или файл уже содержит его), False в случае ошибки.
     """
+    saved = False
     try:
         if not isinstance(filename, str):
             raise TypeError("Переден неверный тип данных объекта filename, ожидатется строка")
         if not isinstance(json_obj, list | dict):
             raise TypeError("Переден неверный тип данных объекта json_obj, ожидатется список словарей")
         file_path = os.path.join(PATH_PROJECT, "results", filename)
+        content = json.dumps(json_obj, indent=4, ensure_ascii=False)
+        if os.path.isfile(file_path) and os.path.getsize(file_path) == len(content.encode("UTF-8")):
+            with open(file_path, encoding="UTF-8") as file:
+                if file.read() == content:
+                    return True
         with open(file_path, "w", encoding="UTF-8") as file:
-            json.dump(json_obj, file, indent=4, ensure_ascii=False)
+            file.write(content)
+        saved = True
     except TypeError as type_ex:
-        logger.error(f"{type_ex.__class__.__name__}: {type_ex}")
+        logger.error("%s: %s", type_ex.__class__.__name__, type_ex)
     except Exception as ex:
-        logger.debug(f"{ex.__class__.__name__}: {ex}", exc_info=True)
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
+    return saved
+
 
+@lru_cache(maxsize=1)
+def load_user_settings() -> dict:
+    """
+    Возвращает настройки пользователя, читая файл только при первом обращении.
 
-user_settings = get_user_settings()
+    :return: Словарь с настройками пользователя.
+    """
+    return get_user_settings()
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Лениво предоставляет атрибут модуля user_settings, чтобы импорт не читал файл настроек.
+
+    :param name: Имя запрашиваемого атрибута модуля.
+    :return: Значение атрибута.
+    :raises AttributeError: Если атрибут не найден.
+    """
+    if name == "user_settings":
+        return load_user_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,192 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from src.dates import OPERATION_DATE_FORMAT
+from src.decorators import instrumented
+from src.files import DATE_FORMATS, read_operations_file
+from src.loggers import logger
+
+INGEST_EXTENSIONS = (".xls", ".xlsx", ".csv")
+OPERATIONS_COLUMNS = [
+    "Дата операции",
+    "Дата платежа",
+    "Номер карты",
+    "Статус",
+    "Сумма операции",
+    "Валюта операции",
+    "Сумма платежа",
+    "Валюта платежа",
+    "Кэшбэк",
+    "Категория",
+    "MCC",
+    "Описание",
+    "Бонусы (включая кэшбэк)",
+    "Округление на инвесткопилку",
+    "Сумма операции с округлением",
+]
+NUMERIC_COLUMNS = [
+    "Сумма операции",
+    "Сумма платежа",
+    "Кэшбэк",
+    "MCC",
+    "Бонусы (включая кэшбэк)",
+    "Округление на инвесткопилку",
+    "Сумма операции с округлением",
+]
+OCCURRENCE_COLUMN = "_occurrence"
+# Форматы дат, которые встречаются в выгрузках: схема банка и ISO (в том числе даты, записанные из Excel)
+INGEST_DATE_FORMATS = (OPERATION_DATE_FORMAT, "%d.%m.%Y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d")
+FILE_COLUMN = "_file"
+
+
+def _parse_statement_dates(values: pd.Series) -> pd.Series:
+    """
+    Разбирает даты выгрузки, пробуя форматы INGEST_DATE_FORMATS по очереди для ещё не разобранных значений.
+
+    :param values: Series с датами: datetime64, строки или объекты datetime.
+    :return: Series с датами, NaT на месте пропусков и значений, которые не удалось разобрать.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    text = values.astype("string").str.strip()
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    for date_format in INGEST_DATE_FORMATS:
+        missing = parsed.isna() & text.notna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(text[missing], format=date_format, errors="coerce")
+    return parsed
+
+
+def normalize_schema(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Приводит выгрузку к схеме data/operations.xls: порядок и имена столбцов, числовые суммы, даты строками.
+
+    Отсутствующие столбцы добавляются пустыми, лишние отбрасываются. Даты в любом из форматов
+    INGEST_DATE_FORMATS записываются в формате схемы; строки без даты операции или с датой, которую
+    не удалось разобрать, отделяются от операций.
+
+    :param df: DataFrame из файла выгрузки.
+    :return: DataFrame в общей схеме и DataFrame с отклонёнными строками (даты в исходном виде).
+    """
+    df = df.rename(columns=lambda column: str(column).strip())
+    extra_columns = [column for column in df.columns if column not in OPERATIONS_COLUMNS]
+    if extra_columns:
+        logger.debug("Отброшены столбцы, которых нет в схеме операций: %s", extra_columns)
+    df = df.reindex(columns=OPERATIONS_COLUMNS)
+    for column in NUMERIC_COLUMNS:
+        if not pd.api.types.is_numeric_dtype(df[column]):
+            # Суммы в некоторых выгрузках записаны строками с запятой в качестве разделителя
+            values = df[column].astype("str").str.replace(r"\s", "", regex=True).str.replace(",", ".")
+            df[column] = pd.to_numeric(values, errors="coerce")
+    # Пустые описания остаются пропусками (astype("str") в pandas 2 превращает их в строку "nan")
+    df["Описание"] = df["Описание"].astype("string")
+
+    dates = {column: _parse_statement_dates(df[column]) for column in DATE_FORMATS}
+    rejected = dates["Дата операции"].isna() | (dates["Дата платежа"].isna() & df["Дата платежа"].notna())
+    if rejected.any():
+        logger.error(
+            "Отклонено %s из %s строк: не удалось разобрать дату, например: %s",
+            int(rejected.sum()),
+            len(df),
+            df.loc[rejected, list(DATE_FORMATS)].head(3).to_dict(orient="records"),
+        )
+    rejected_df = df.loc[rejected]
+    df = df.loc[~rejected].copy()
+    for column, date_format in DATE_FORMATS.items():
+        df[column] = dates[column][~rejected].dt.strftime(date_format)
+    return df, rejected_df
+
+
+def read_statement(file_path: str) -> tuple[str, pd.DataFrame | None, pd.DataFrame | None, float, str | None]:
+    """
+    Читает и нормализует один файл выгрузки (выполняется в процессе-обработчике).
+
+    Одинаковые строки внутри файла нумеруются, чтобы при объединении удалялись только повторы между файлами.
+
+    :param file_path: Путь к файлу.
+    :return: Путь, DataFrame с операциями и DataFrame с отклонёнными строками или None в случае ошибки,
+    время обработки в секундах и текст ошибки.
+    """
+    start = time.perf_counter()
+    try:
+        # Типы выводятся по данным: выгрузки могут содержать суммы строками, их приводит normalize_schema
+        df, rejected = normalize_schema(read_operations_file(file_path, declared_dtypes=False))
+        df[OCCURRENCE_COLUMN] = df.groupby(OPERATIONS_COLUMNS, dropna=False, sort=False).cumcount()
+        return file_path, df, rejected, time.perf_counter() - start, None
+    except Exception as ex:
+        return file_path, None, None, time.perf_counter() - start, f"{ex.__class__.__name__}: {ex}"
+
+
+def list_statement_files(directory: str) -> list[str]:
+    """
+    :param directory: Каталог с выгрузками.
+    :return: Отсортированный список файлов выгрузок (.xls, .xlsx, .csv) в каталоге.
+    """
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.lower().endswith(INGEST_EXTENSIONS) and not name.startswith(("~$", "."))
+    )
+
+
+@instrumented()
+def ingest_directory(directory: str, max_workers: int | None = None) -> tuple[pd.DataFrame, pd.DataFrame, list[dict]]:
+    """
+    Читает все выгрузки из каталога пулом процессов, объединяет их и удаляет повторяющиеся операции.
+
+    Разбор Excel ограничен процессором, поэтому файлы читаются в отдельных процессах, каждый из которых
+    сам приводит свой файл к общей схеме. Операции сортируются по убыванию даты, как в выгрузке банка.
+
+    :param directory: Каталог с выгрузками.
+    :param max_workers: Количество процессов или None для количества ядер.
+    :return: DataFrame с операциями, DataFrame с отклонёнными строками (столбец FILE_COLUMN — имя файла)
+    и отчёт по файлам: file, rows, rejected, seconds, error.
+    :raises ValueError: Если каталог не найден или в нём нет выгрузок.
+    """
+    if not os.path.isdir(directory):
+        raise ValueError(f"Каталог с выгрузками не найден: {directory}")
+    files = list_statement_files(directory)
+    if not files:
+        raise ValueError(f"В каталоге {directory} нет файлов {', '.join(INGEST_EXTENSIONS)}")
+    workers = min(max_workers or os.cpu_count() or 1, len(files))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(read_statement, files))
+    else:
+        results = [read_statement(file_path) for file_path in files]
+
+    report = []
+    frames = []
+    rejected_frames = []
+    for file_path, df, rejected, seconds, error in results:
+        report.append(
+            {
+                "file": os.path.basename(file_path),
+                "rows": 0 if df is None else len(df),
+                "rejected": 0 if rejected is None else len(rejected),
+                "seconds": round(seconds, 4),
+                "error": error,
+            }
+        )
+        if error:
+            logger.error("Не удалось прочитать %s: %s", file_path, error)
+        elif df is not None:
+            frames.append(df)
+        if rejected is not None and not rejected.empty:
+            rejected_frames.append(rejected.assign(**{FILE_COLUMN: os.path.basename(file_path)}))
+    if not frames:
+        raise ValueError("Не удалось прочитать ни одной выгрузки, смотрите логи")
+
+    operations = pd.concat(frames, ignore_index=True).drop_duplicates(ignore_index=True)
+    operations = operations.drop(columns=OCCURRENCE_COLUMN)
+    dates = pd.to_datetime(operations["Дата операции"], format=OPERATION_DATE_FORMAT, errors="coerce")
+    order = dates.sort_values(ascending=False, kind="stable", na_position="last").index
+    operations = operations.loc[order].reset_index(drop=True)
+    operations["Описание"] = operations["Описание"].astype("category")
+    columns = OPERATIONS_COLUMNS + [FILE_COLUMN]
+    rejected_operations = pd.concat(rejected_frames, ignore_index=True) if rejected_frames else pd.DataFrame()
+    return operations, rejected_operations.reindex(columns=columns), report
@@ -1,30 +1,147 @@
+import atexit
+import json
 import logging.config
+import logging.handlers
 import os
+import queue
+import threading
 from datetime import datetime
 
 from src.config import PATH_PROJECT
 
+# Ротация лог-файла по размеру и формат вывода ("json" для структурированных логов)
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+LOG_FORMAT_ENV = "LOG_FORMAT"
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Форматирует записи лога в JSON-строку (по одной записи на строку).
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Преобразует запись лога в JSON-строку.
+
+        :param record: Запись лога.
+        :return: JSON-строка с временем, уровнем, местом вызова, сообщением и трассировкой исключения.
+        """
+        log_record = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "file": record.filename,
+            "func": record.funcName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            log_record["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(log_record, ensure_ascii=False)
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    Помещает записи лога в очередь без форматирования.
+
+    Сообщение и трассировка форматируются в потоке QueueListener, а не в потоке, который вызвал логгер.
+    Поток QueueListener запускается при первой записи в текущем процессе (а не при импорте модуля),
+    поэтому процессы-обработчики и тесты, которые ничего не логируют, не создают лишних потоков.
+    """
+
+    def __init__(self, log_queue: queue.SimpleQueue, *handlers: logging.Handler) -> None:
+        """
+        :param log_queue: Очередь записей лога.
+        :param handlers: Обработчики, которым QueueListener передаёт записи из очереди.
+        """
+        super().__init__(log_queue)
+        self.listener_handlers = handlers
+        self.listener: logging.handlers.QueueListener | None = None
+        self._listener_pid: int | None = None
+        self._listener_lock = threading.Lock()
+
+    def start_listener(self) -> None:
+        """
+        Запускает QueueListener в текущем процессе, если он ещё не запущен, и регистрирует остановку в atexit.
+
+        :return: None
+        """
+        with self._listener_lock:
+            if self._listener_pid == os.getpid() or not self.listener_handlers:
+                return
+            # В дочернем процессе поток родителя не существует, поэтому создаётся новый QueueListener
+            self.listener = logging.handlers.QueueListener(
+                self.queue, *self.listener_handlers, respect_handler_level=True
+            )
+            self.listener.start()
+            self._listener_pid = os.getpid()
+            atexit.register(self.stop_listener)
+
+    def stop_listener(self) -> None:
+        """
+        Останавливает QueueListener текущего процесса, дописав оставшиеся в очереди записи.
+
+        :return: None
+        """
+        with self._listener_lock:
+            if self.listener is None or self._listener_pid != os.getpid():
+                return
+            self.listener.stop()
+            self.listener = None
+            self._listener_pid = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Помещает запись в очередь, при необходимости запустив QueueListener.
+
+        :param record: Запись лога.
+        :return: None
+        """
+        if self._listener_pid != os.getpid():
+            self.start_listener()
+        super().emit(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Возвращает запись лога без изменений, так как очередь и обработчики находятся в одном процессе.
+
+        :param record: Запись лога.
+        :return: Та же запись лога.
+        """
+        return record
+
 
 def my_logger() -> logging.Logger:
     """
     Конфигурирует и возвращает пользовательский логгер.
 
+    Логгер пишет записи в очередь, а запись в файл с ротацией по размеру выполняет фоновый QueueListener,
+    который запускается при первой записи лога.
+    Повторный вызов не добавляет обработчики повторно.
+
     :return: Экземпляр настроенного логгера.
     """
     try:
         file_logger = logging.getLogger("logger")
+        if any(isinstance(handler, logging.handlers.QueueHandler) for handler in file_logger.handlers):
+            return file_logger
         file_logger.setLevel("DEBUG")
         log_file = os.path.join(PATH_PROJECT, "logs", f'log_{datetime.today().strftime("%d_%m_%Y")}.log')
-        file_handler = logging.FileHandler(filename=log_file, encoding="UTF-8")
-        file_formatter = logging.Formatter(
-            "[%(asctime)s] %(levelname)s %(filename)s-%(funcName)s: %(message)s", datefmt="%d.%m.%Y-%H:%M:%S"
+        file_handler = logging.handlers.RotatingFileHandler(
+            filename=log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="UTF-8", delay=True
         )
+        if os.getenv(LOG_FORMAT_ENV, "").lower() == "json":
+            file_formatter: logging.Formatter = JsonFormatter(datefmt="%d.%m.%Y-%H:%M:%S")
+        else:
+            file_formatter = logging.Formatter(
+                "[%(asctime)s] %(levelname)s %(filename)s-%(funcName)s: %(message)s", datefmt="%d.%m.%Y-%H:%M:%S"
+            )
         file_handler.setFormatter(file_formatter)
-        file_logger.addHandler(file_handler)
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        file_logger.addHandler(LazyQueueHandler(log_queue, file_handler))
         return file_logger
     except Exception as ex:
         ex_logger = logging.getLogger()
-        ex_logger.debug(f"{ex.__class__.__name__}: {ex}", exc_info=True)
+        ex_logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
         return ex_logger
 
 
@@ -1,68 +1,434 @@
-import pandas as pd
+import argparse
+import os
+from datetime import datetime
 
-from src.files import get_df_operations
-from src.reports import spending_by_category, spending_by_weekday, spending_workday_weekend
-from src.services import (categories_of_increased_cashback, invest_moneybox, search_by_phone_number,
-                          search_for_transfers_to_individuals, simple_search)
-from src.views import get_json_dashboard_info, get_json_events
+from src.config import PATH_PROJECT
 
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
-def main() -> None:
+CASHBACK_COLUMNS = ["Дата операции", "Категория", "Кэшбэк"]
+MONEYBOX_COLUMNS = ["Дата операции", "Статус", "Категория", "Сумма операции"]
+REPORT_COLUMNS = ["Дата операции", "Статус", "Категория", "Сумма операции", "Сумма платежа"]
+
+
+def parse_limit(value: str) -> tuple[str, float]:
     """
-    Основная функция программы.
+    Разбирает лимит категории из аргумента командной строки.
 
-    Выводит информацию о различных аспектах финансов и трат, такие как главная информация, события,
-    категории повышенного кэшбэка, инвестиции в копилку, траты по категории, траты по дням недели и в рабочие/выходные
-    дни, простой поиск, поиск по телефонным номерам и поиск переводов физическим лицам.
+    :param value: Строка вида "Категория=сумма".
+    :return: Кортеж (категория, сумма).
+    :raises argparse.ArgumentTypeError: Если строка не содержит категорию и неотрицательную сумму.
+    """
+    category, _, amount = value.rpartition("=")
+    try:
+        limit = float(amount)
+    except ValueError:
+        limit = -1.0
+    if not category or limit < 0:
+        raise argparse.ArgumentTypeError(f'ожидается "Категория=сумма", получено "{value}"')
+    return category, limit
 
-    :return: None
+
+def run_dashboard(args: argparse.Namespace) -> None:
     """
+    Формирует страницу “Главная”.
 
-    print("[+] Start")
+    :param args: Аргументы командной строки.
+    :return: None
+    """
+    from src.views import get_json_dashboard_info
 
-    # Страница “Главная”
-    get_json_dashboard_info(date="2020-09-22 11:11:11")
+    get_json_dashboard_info(date=args.date, with_rates=args.rates)
     print("[+] Save main")
 
-    # Страница “События”
-    get_json_events(date="2020-09-22 11:11:11", range_data="Y")
+
+def run_events(args: argparse.Namespace) -> None:
+    """
+    Формирует страницу “События”.
+
+    :param args: Аргументы командной строки.
+    :return: None
+    """
+    from src.views import get_json_events
+
+    get_json_events(date=args.date, range_data=args.range, with_rates=args.rates)
     print("[+] Save events")
 
-    df_operations: pd.DataFrame | None = get_df_operations()
+
+def run_cashback(args: argparse.Namespace) -> None:
+    """
+    Рассчитывает выгодные категории повышенного кэшбэка.
+
+    :param args: Аргументы командной строки.
+    :return: None
+    """
+    from src.config import get_backend
+    from src.files import get_df_operations
+    from src.services import categories_of_increased_cashback
+
+    if get_backend() == "sqlite":
+        # Кэшбэк суммируется запросом к базе, файл операций не читается
+        categories_of_increased_cashback(data=None, year=args.year, month=args.month)
+        print("[+] Save cashback")
+        return
+    df_operations = get_df_operations(columns=CASHBACK_COLUMNS)
     if df_operations is not None:
-        # Выгодные категории повышенного кэшбэка
-        categories_of_increased_cashback(data=df_operations, year=2020, month=3)
+        categories_of_increased_cashback(data=df_operations, year=args.year, month=args.month)
         print("[+] Save cashback")
 
-        # Инвесткопилка
-        transactions: list[dict] = df_operations.to_dict(orient="records")
-        invest_moneybox(month="2020-04", transactions=transactions, limit=50)
+
+def run_moneybox(args: argparse.Namespace) -> None:
+    """
+    Рассчитывает сумму, которую удалось бы отложить в инвесткопилку.
+
+    :param args: Аргументы командной строки.
+    :return: None
+    """
+    from src.dates import parse_operation_dates
+    from src.files import get_df_operations
+    from src.records import TransactionRecords
+    from src.services import invest_moneybox
+
+    df_operations = get_df_operations(columns=MONEYBOX_COLUMNS)
+    if df_operations is not None:
+        df_operations["Дата операции"] = parse_operation_dates(df_operations["Дата операции"])
+        transactions = TransactionRecords.from_dataframe(df_operations)
+        invest_moneybox(month=args.month, transactions=transactions, limit=args.limit)
         print("[+] Save invest moneybox")
 
-        # Траты по категории
-        spending_by_category(df=df_operations, category="Супермаркеты", date="2019-01-22 11:11:11")
-        print("[+] Report spending by category OK")
 
-        # Траты по дням недели
-        spending_by_weekday(df=df_operations, date="2020-10-22 11:11:11")
-        print("[+] Report spending by weekday OK")
+def run_reports(args: argparse.Namespace) -> None:
+    """
+    Формирует отчёт о тратах выбранного вида.
+
+    :param args: Аргументы командной строки.
+    :return: None
+    """
+    from src.config import get_backend
+    from src.files import get_df_operations
+    from src.reports import spending_by_category, spending_by_weekday, spending_workday_weekend
+
+    columns = REPORT_COLUMNS + ["Валюта операции", "Валюта платежа"] if args.currency else REPORT_COLUMNS
+    if get_backend() == "sqlite":
+        from src.database import query_report_window
+        from src.loggers import logger
+
+        # Окно отчёта выбирается запросом к базе; дата фиксируется, чтобы окно и отчёт совпадали
+        args.date = args.date or datetime.now().strftime(DATE_FORMAT)
+        category = args.category if args.kind == "category" else None
+        try:
+            df_operations = query_report_window(args.date, columns, category=category)
+        except (TypeError, ValueError) as ex:
+            logger.error("%s: %s", ex.__class__.__name__, ex)
+            df_operations = None
+    else:
+        df_operations = get_df_operations(columns=columns)
+    if df_operations is not None and args.currency:
+        from src.currency import convert_operations
+
+        df_operations = convert_operations(df_operations, target=args.currency, replace=True)
+    if df_operations is not None:
+        if args.kind == "category":
+            spending_by_category(df=df_operations, category=args.category, date=args.date)
+            print("[+] Report spending by category OK")
+        elif args.kind == "weekday":
+            spending_by_weekday(df=df_operations, date=args.date)
+            print("[+] Report spending by weekday OK")
+        else:
+            spending_workday_weekend(df=df_operations, date=args.date)
+            print("[+] Report spending workday weekend OK")
+
 
-        # Траты в рабочий/выходной день
-        spending_workday_weekend(df=df_operations, date="2020-10-22 11:11:11")
-        print("[+] Report spending workday weekend OK")
+def run_search(args: argparse.Namespace) -> None:
+    """
+    Выполняет простой поиск по описанию транзакций.
+
+    :param args: Аргументы командной строки.
+    :return: None
+    """
+    from src.services import simple_search
 
-    # Простой поиск
-    simple_search(query="магнит")
+    simple_search(query=args.query)
     print("[+] Save simple search")
 
-    # Поиск по телефонным номерам
+
+def run_search_phones(args: argparse.Namespace) -> None:
+    """
+    Выполняет поиск транзакций с телефонными номерами в описании.
+
+    :param args: Аргументы командной строки.
+    :return: None
+    """
+    from src.services import search_by_phone_number
+
     search_by_phone_number()
     print("[+] Save search by phone number")
 
-    # Поиск переводов физическим лицам
+
+def run_search_transfers(args: argparse.Namespace) -> None:
+    """
+    Выполняет поиск переводов физическим лицам.
+
+    :param args: Аргументы командной строки.
+    :return: None
+    """
+    from src.services import search_for_transfers_to_individuals
+
     search_for_transfers_to_individuals()
-    print("[+] search for transfers to individuals")
+    print("[+] Save search for transfers to individuals")
+
+
+def run_recurring(args: argparse.Namespace) -> None:
+    """
+    Выполняет поиск повторяющихся платежей (подписок).
+
+    :param args: Аргументы командной строки.
+    :return: None
+    """
+    from src.services import find_recurring_payments
+
+    find_recurring_payments(min_occurrences=args.min_occurrences)
+    print("[+] Save recurring payments")
+
+
+def run_alerts(args: argparse.Namespace) -> None:
+    """
+    Добавляет новые операции к накопительным суммам расходов и сохраняет уведомления о лимитах.
+
+    :param args: Аргументы командной строки.
+    :return: None
+    """
+    from src.alerts import ALERTS_COLUMNS, append_operations
+    from src.files import load_user_settings, read_operations_file, save_result_in_json
+
+    limits = dict(load_user_settings().get("budget_limits", {}))
+    limits.update(args.limit)
+    alerts = append_operations(read_operations_file(args.new_file, columns=ALERTS_COLUMNS), limits)
+    save_result_in_json(filename="budget_alerts.json", json_obj={"result": alerts})
+    print(f"[+] Save budget alerts: {len(alerts)}")
+
+
+def run_counterparties(args: argparse.Namespace) -> None:
+    """
+    Сохраняет сводки по переводам физическим лицам или сводку по одному получателю.
+
+    :param args: Аргументы командной строки.
+    :return: None
+    """
+    from src.counterparties import COUNTERPARTY_COLUMNS, update_counterparty_ledger
+    from src.files import read_operations_file, save_result_in_json
+
+    new_df = read_operations_file(args.new_file, columns=COUNTERPARTY_COLUMNS) if args.new_file else None
+    ledger = update_counterparty_ledger(new_df)
+    if args.query:
+        sent = ledger.sent(args.query, args.year)
+        json_obj = {"query": args.query, "year": args.year, "sent": sent, "result": ledger.get(args.query)}
+    else:
+        json_obj = {"result": ledger.to_records()}
+    save_result_in_json(filename="counterparties.json", json_obj=json_obj)
+    print(f"[+] Save counterparties: {len(ledger.counterparties)}")
+
+
+def run_ingest(args: argparse.Namespace) -> None:
+    """
+    Объединяет выгрузки из каталога в один файл с операциями.
+
+    :param args: Аргументы командной строки.
+    :return: None
+    """
+    from src.files import save_result_in_json
+    from src.ingest import ingest_directory
+
+    operations, rejected, report = ingest_directory(args.dir, max_workers=args.workers)
+    for file_report in report:
+        status = file_report["error"] or "OK"
+        print(
+            f"    {file_report['file']}: {file_report['rows']} rows, {file_report['rejected']} rejected, "
+            f"{file_report['seconds']:.2f} s, {status}"
+        )
+    operations.to_csv(args.output, index=False)
+    json_report = {"rows": len(operations), "rejected": len(rejected), "files": report}
+    save_result_in_json(filename="ingest_report.json", json_obj=json_report)
+    print(f"[+] Save {len(operations)} operations to {args.output}")
+    if not rejected.empty:
+        rejected_file = f"{os.path.splitext(args.output)[0]}_rejected.csv"
+        rejected.to_csv(rejected_file, index=False)
+        print(f"[+] Save {len(rejected)} rejected rows to {rejected_file}")
+
+
+def run_batch(args: argparse.Namespace) -> None:
+    """
+    Формирует страницы “Главная” и “События” для всех пользователей из файла профилей.
+
+    :param args: Аргументы командной строки.
+    :return: None
+    """
+    from src.batch import load_user_profiles, run_batch_dashboards
+
+    profiles = load_user_profiles(args.profiles)
+    written = run_batch_dashboards(
+        date=args.date, profiles=profiles, range_data=args.range, with_rates=args.rates, max_workers=args.workers
+    )
+    print(f"[+] Save {written} batch dashboard files for {len(profiles)} users")
+
+
+def run_statements(args: argparse.Namespace) -> None:
+    """
+    Формирует помесячные выписки по всем картам.
+
+    :param args: Аргументы командной строки.
+    :return: None
+    """
+    from src.batch import run_batch_statements
+
+    written = run_batch_statements(top_n=args.top, max_workers=args.workers)
+    print(f"[+] Save {written} card statements")
+
+
+def run_rates(args: argparse.Namespace) -> None:
+    """
+    Дозагружает исторические курсы ЦБ РФ за период в локальную таблицу курсов.
 
+    :param args: Аргументы командной строки.
+    :return: None
+    """
+    from src.currency import update_rate_table
+
+    start = datetime.strptime(args.start, "%Y-%m-%d").date()
+    end = datetime.strptime(args.end, "%Y-%m-%d").date() if args.end else datetime.now().date()
+    rate_table = update_rate_table(start, end)
+    print(f"[+] Rate table: {len(rate_table)} rows")
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """
+    Создаёт парсер аргументов командной строки с подкомандами для каждой страницы, сервиса и отчёта.
+
+    :return: Настроенный парсер аргументов.
+    """
+    now = datetime.now().strftime(DATE_FORMAT)
+    parser = argparse.ArgumentParser(prog="bank-analytics", description="Анализ банковских транзакций")
+    parser.add_argument("--metrics", default=None, help="Файл JSON lines для метрик вызовов функций")
+    parser.add_argument("--profile", default=None, help="Имя функции для профилирования cProfile и tracemalloc")
+    parser.add_argument(
+        "--backend",
+        choices=["pandas", "sqlite"],
+        default=None,
+        help="Хранилище операций для страниц, поиска, отчётов и кэшбэка",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    dashboard = subparsers.add_parser("dashboard", help="Страница “Главная”")
+    dashboard.add_argument("--date", default=now, help="Дата в формате YYYY-MM-DD HH:MM:SS")
+    dashboard.add_argument("--rates", action="store_true", help="Запросить курсы валют и стоимость акций")
+    dashboard.set_defaults(handler=run_dashboard)
+
+    events = subparsers.add_parser("events", help="Страница “События”")
+    events.add_argument("--date", default=now, help="Дата в формате YYYY-MM-DD HH:MM:SS")
+    events.add_argument("--range", default="M", choices=["W", "M", "Y", "ALL"], help="Диапазон данных")
+    events.add_argument("--rates", action="store_true", help="Запросить курсы валют и стоимость акций")
+    events.set_defaults(handler=run_events)
+
+    cashback = subparsers.add_parser("cashback", help="Выгодные категории повышенного кэшбэка")
+    cashback.add_argument("--year", type=int, required=True, help="Год для анализа")
+    cashback.add_argument("--month", type=int, required=True, help="Месяц для анализа")
+    cashback.set_defaults(handler=run_cashback)
+
+    moneybox = subparsers.add_parser("moneybox", help="Инвесткопилка")
+    moneybox.add_argument("--month", required=True, help="Месяц в формате YYYY-MM")
+    moneybox.add_argument("--limit", type=int, default=50, help="Предел округления суммы операции")
+    moneybox.set_defaults(handler=run_moneybox)
+
+    reports = subparsers.add_parser("reports", help="Отчёты о тратах")
+    reports.add_argument("kind", choices=["category", "weekday", "workday"], help="Вид отчёта")
+    reports.add_argument("--date", default=None, help="Дата в формате YYYY-MM-DD HH:MM:SS")
+    reports.add_argument("--category", default="Супермаркеты", help="Категория для отчёта category")
+    reports.add_argument("--currency", default=None, help="Пересчитать суммы в валюту по локальной таблице курсов")
+    reports.set_defaults(handler=run_reports)
+
+    search = subparsers.add_parser("search", help="Простой поиск")
+    search.add_argument("--query", required=True, help="Строка запроса")
+    search.set_defaults(handler=run_search)
+
+    search_phones = subparsers.add_parser("search-phones", help="Поиск по телефонным номерам")
+    search_phones.set_defaults(handler=run_search_phones)
+
+    search_transfers = subparsers.add_parser("search-transfers", help="Поиск переводов физическим лицам")
+    search_transfers.set_defaults(handler=run_search_transfers)
+
+    recurring = subparsers.add_parser("recurring", help="Поиск повторяющихся платежей (подписок)")
+    recurring.add_argument("--min-occurrences", type=int, default=3, help="Минимальное количество платежей в серии")
+    recurring.set_defaults(handler=run_recurring)
+
+    rates = subparsers.add_parser("rates", help="Загрузка исторических курсов ЦБ РФ в локальную таблицу")
+    rates.add_argument("--start", required=True, help="Первый день периода в формате YYYY-MM-DD")
+    rates.add_argument("--end", default=None, help="Последний день периода в формате YYYY-MM-DD")
+    rates.set_defaults(handler=run_rates)
+
+    alerts = subparsers.add_parser("alerts", help="Уведомления о месячных лимитах расходов по новым операциям")
+    alerts.add_argument("--new-file", required=True, help="Файл CSV или Excel с новыми операциями")
+    alerts.add_argument(
+        "--limit",
+        action="append",
+        type=parse_limit,
+        default=[],
+        help='Лимит категории "Категория=сумма" (дополняет budget_limits)',
+    )
+    alerts.set_defaults(handler=run_alerts)
+
+    counterparties = subparsers.add_parser("counterparties", help="Сводки по переводам физическим лицам")
+    counterparties.add_argument("--new-file", default=None, help="Файл CSV или Excel с новыми операциями")
+    counterparties.add_argument("--query", default=None, help="Имя или номер телефона получателя")
+    counterparties.add_argument("--year", type=int, default=None, help="Год для суммы переводов получателю")
+    counterparties.set_defaults(handler=run_counterparties)
+
+    ingest = subparsers.add_parser("ingest", help="Объединение выгрузок из каталога в один файл операций")
+    ingest.add_argument("--dir", required=True, help="Каталог с файлами .xls, .xlsx и .csv")
+    ingest.add_argument(
+        "--output",
+        default=os.path.join(PATH_PROJECT, "data", "operations.csv"),
+        help="CSV-файл для объединённых операций",
+    )
+    ingest.add_argument("--workers", type=int, default=None, help="Количество процессов (по умолчанию — ядра)")
+    ingest.set_defaults(handler=run_ingest)
+
+    batch = subparsers.add_parser("batch", help="Страницы “Главная” и “События” для множества пользователей")
+    batch.add_argument("--profiles", required=True, help="JSON-файл со списком профилей пользователей")
+    batch.add_argument("--date", default=now, help="Дата в формате YYYY-MM-DD HH:MM:SS")
+    batch.add_argument("--range", default="M", choices=["W", "M", "Y", "ALL"], help="Диапазон данных для событий")
+    batch.add_argument("--rates", action="store_true", help="Запросить курсы валют и стоимость акций")
+    batch.add_argument("--workers", type=int, default=8, help="Количество потоков записи результатов")
+    batch.set_defaults(handler=run_batch)
+
+    statements = subparsers.add_parser("statements", help="Помесячные выписки по всем картам")
+    statements.add_argument("--top", type=int, default=5, help="Количество крупнейших расходов в выписке")
+    statements.add_argument("--workers", type=int, default=8, help="Количество потоков записи результатов")
+    statements.set_defaults(handler=run_statements)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Основная функция программы.
+
+    Разбирает аргументы командной строки и выполняет только выбранную подкоманду: главную страницу, события,
+    категории повышенного кэшбэка, инвесткопилку, отчёты о тратах, простой поиск, поиск по телефонным номерам
+    или поиск переводов физическим лицам. Тяжёлые модули импортируются внутри обработчиков подкоманд.
+
+    :param argv: Список аргументов командной строки или None для использования sys.argv.
+    :return: None
+    """
+    parser = create_parser()
+    args = parser.parse_args(argv)
+    if args.metrics:
+        os.environ["METRICS_FILE"] = args.metrics
+    if args.profile:
+        os.environ["PROFILE_FUNC"] = args.profile
+    if args.backend:
+        os.environ["OPERATIONS_BACKEND"] = args.backend
+    print("[+] Start")
+    args.handler(args)
     print("[+] Finish")
 
 
@@ -0,0 +1,146 @@
+import re
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from src.cache import get_data_version
+
+MERCHANT_COLUMN = "Описание"
+
+
+class MerchantDimension:
+    """
+    Словарь описаний операций: каждой строке соответствует целочисленный код уникального описания (мерчанта).
+
+    Фильтры и извлечения по регулярным выражениям выполняются один раз для каждого уникального описания,
+    кэшируются и распространяются на строки по кодам.
+    """
+
+    def __init__(self, codes: np.ndarray, merchants: pd.Index) -> None:
+        """
+        :param codes: Код описания для каждой строки (-1 для пустых описаний).
+        :param merchants: Уникальные описания, позиция в индексе равна коду.
+        """
+        self.codes = codes
+        self.merchants = merchants
+        self._matches: dict[tuple[str, bool], np.ndarray] = {}
+        self._extracts: dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_series(cls, descriptions: pd.Series) -> "MerchantDimension":
+        """
+        Кодирует описания операций. Для категориального столбца используются его готовые коды.
+
+        :param descriptions: Series с описаниями операций.
+        :return: Словарь описаний.
+        """
+        if isinstance(descriptions.dtype, pd.CategoricalDtype):
+            codes = descriptions.cat.codes.to_numpy()
+            merchants = descriptions.cat.categories
+        else:
+            codes, merchants = pd.factorize(descriptions)
+        return cls(codes.astype(np.int32), pd.Index(merchants))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Возвращает таблицу измерения: код, описание и нормализованное описание (без лишних пробелов, casefold).
+
+        :return: DataFrame со столбцами code, description, normalized.
+        """
+        descriptions = self.merchants.astype(str)
+        normalized = descriptions.str.split().str.join(" ").str.casefold()
+        return pd.DataFrame(
+            {"code": np.arange(len(self.merchants)), "description": descriptions, "normalized": normalized}
+        )
+
+    def _broadcast(self, values: np.ndarray, fill_value: Any) -> np.ndarray:
+        """
+        :param values: Значения для уникальных описаний.
+        :param fill_value: Значение для строк без описания.
+        :return: Значения для каждой строки.
+        """
+        # Значение для пустых описаний добавляется последним, поэтому код -1 указывает на него
+        result: np.ndarray = np.append(values, np.array([fill_value], dtype=values.dtype))[self.codes]
+        return result
+
+    def contains(self, pattern: str, case: bool = True) -> np.ndarray:
+        """
+        Проверяет описания на совпадение с регулярным выражением (аналог Series.str.contains).
+
+        :param pattern: Регулярное выражение.
+        :param case: Учитывать регистр.
+        :return: Булев массив по строкам; для пустых описаний False.
+        """
+        key = (pattern, case)
+        if key not in self._matches:
+            compiled = re.compile(pattern, 0 if case else re.IGNORECASE)
+            self._matches[key] = np.fromiter(
+                (compiled.search(str(merchant)) is not None for merchant in self.merchants),
+                dtype=bool,
+                count=len(self.merchants),
+            )
+        return self._broadcast(self._matches[key], False)
+
+    def extract(self, pattern: str) -> np.ndarray:
+        """
+        Извлекает из описаний первое совпадение с регулярным выражением.
+
+        :param pattern: Регулярное выражение.
+        :return: Массив совпадений по строкам; None, если совпадения нет.
+        """
+        if pattern not in self._extracts:
+            compiled = re.compile(pattern)
+            matches = np.empty(len(self.merchants), dtype=object)
+            for position, merchant in enumerate(self.merchants):
+                match = compiled.search(str(merchant))
+                matches[position] = match.group(0) if match else None
+            self._extracts[pattern] = matches
+        return self._broadcast(self._extracts[pattern], None)
+
+
+_dimensions: dict[str, tuple[pd.Series, MerchantDimension]] = {}
+
+
+def _is_same_series(descriptions: pd.Series, source: pd.Series) -> bool:
+    """
+    Проверяет, что столбец описаний совпадает со столбцом, по которому построен словарь.
+
+    :param descriptions: Переданный столбец.
+    :param source: Столбец, по которому построен словарь.
+    :return: True, если значения и порядок строк совпадают.
+    """
+    if descriptions is source:
+        return True
+    if len(descriptions) != len(source) or not descriptions.index.equals(source.index):
+        return False
+    if isinstance(descriptions.dtype, pd.CategoricalDtype) and isinstance(source.dtype, pd.CategoricalDtype):
+        # Сравнение целочисленных кодов дешевле сравнения строк
+        return bool(
+            descriptions.cat.categories.equals(source.cat.categories)
+            and np.array_equal(descriptions.cat.codes.to_numpy(), source.cat.codes.to_numpy())
+        )
+    return descriptions.equals(source)
+
+
+def get_merchant_dimension(descriptions: pd.Series) -> MerchantDimension:
+    """
+    Возвращает словарь описаний для столбца, прочитанного из файла операций.
+
+    Словарь и кэш результатов регулярных выражений переиспользуются между вызовами, пока файл не изменился
+    и передан тот же столбец (те же строки в том же порядке); для другого столбца словарь строится заново.
+
+    :param descriptions: Series с описаниями всех операций из файла.
+    :return: Словарь описаний.
+    """
+    data_version = get_data_version()
+    cached = _dimensions.get(data_version)
+    if cached is not None and _is_same_series(descriptions, cached[0]):
+        return cached[1]
+    dimension = MerchantDimension.from_series(descriptions)
+    _dimensions.clear()
+    _dimensions[data_version] = (descriptions, dimension)
+    return dimension
@@ -0,0 +1,208 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from collections.abc import Mapping, Sequence
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Iterator
+
+import pandas as pd
+
+from src.config import PATH_PROJECT
+from src.loggers import logger
+
+# Переменные окружения: файл JSON lines для метрик, постоянный tracemalloc и имя профилируемой функции
+METRICS_FILE_ENV = "METRICS_FILE"
+METRICS_TRACEMALLOC_ENV = "METRICS_TRACEMALLOC"
+PROFILE_ENV = "PROFILE_FUNC"
+PROFILE_DIR = os.path.join(PATH_PROJECT, "logs")
+REGISTRY_SIZE = 10_000
+
+_registry: deque[dict[str, Any]] = deque(maxlen=REGISTRY_SIZE)
+_registry_lock = threading.Lock()
+_local = threading.local()
+
+
+def count_rows(obj: Any) -> int | None:
+    """
+    Возвращает количество строк в объекте с данными.
+
+    :param obj: DataFrame, Series или последовательность записей (словарей, TransactionRecords).
+    :return: Количество строк или None, если объект не содержит строк.
+    """
+    if isinstance(obj, pd.DataFrame | pd.Series):
+        return len(obj)
+    if isinstance(obj, Sequence) and not isinstance(obj, str) and (not obj or isinstance(obj[0], Mapping)):
+        return len(obj)
+    return None
+
+
+def record_metric(metric: dict[str, Any]) -> None:
+    """
+    Сохраняет метрику вызова в реестр процесса и, если задан METRICS_FILE, дописывает её в файл JSON lines.
+
+    :param metric: Словарь с метрикой вызова.
+    :return: None
+    """
+    with _registry_lock:
+        _registry.append(metric)
+        metrics_file = os.getenv(METRICS_FILE_ENV)
+        if metrics_file:
+            try:
+                with open(metrics_file, "a", encoding="UTF-8") as file:
+                    file.write(json.dumps(metric, ensure_ascii=False) + "\n")
+            except OSError as os_ex:
+                logger.error("%s: %s", os_ex.__class__.__name__, os_ex)
+
+
+def metrics_enabled() -> bool:
+    """
+    :return: True, если метрики пишутся в файл (задан METRICS_FILE) и должны дублироваться в лог.
+    """
+    return bool(os.getenv(METRICS_FILE_ENV))
+
+
+def get_metrics(name: str | None = None) -> list[dict[str, Any]]:
+    """
+    Возвращает накопленные метрики вызовов.
+
+    :param name: Имя функции или блока для отбора метрик или None для всех метрик.
+    :return: Список метрик в порядке записи.
+    """
+    with _registry_lock:
+        return [metric for metric in _registry if name is None or metric["name"] == name]
+
+
+def clear_metrics() -> None:
+    """
+    Очищает реестр метрик процесса.
+
+    :return: None
+    """
+    with _registry_lock:
+        _registry.clear()
+
+
+def _get_peak_stack() -> list[int]:
+    """
+    Возвращает стек пиков памяти вложенных замеров текущего потока.
+
+    :return: Стек пиков памяти в байтах.
+    """
+    if not hasattr(_local, "peaks"):
+        _local.peaks = []
+    peaks: list[int] = _local.peaks
+    return peaks
+
+
+def _get_max_rss_kb() -> int | None:
+    """
+    Возвращает пиковое потребление памяти процессом.
+
+    :return: Пик резидентной памяти в килобайтах или None, если платформа не поддерживает resource.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _dump_profile(name: str, profiler: Any, snapshot: tracemalloc.Snapshot) -> None:
+    """
+    Записывает профиль cProfile и топ выделений памяти tracemalloc в каталог логов.
+
+    :param name: Имя профилируемой функции.
+    :param profiler: Объект cProfile.Profile с собранным профилем.
+    :param snapshot: Снимок tracemalloc после вызова.
+    :return: None
+    """
+    stamp = datetime.now().strftime("%d_%m_%Y_%H_%M_%S_%f")
+    base_path = os.path.join(PROFILE_DIR, f"profile_{name}_{stamp}")
+    profiler.dump_stats(f"{base_path}.prof")
+    with open(f"{base_path}_memory.txt", "w", encoding="UTF-8") as file:
+        for stat in snapshot.statistics("lineno")[:25]:
+            file.write(f"{stat}\n")
+    logger.debug("Профиль %s сохранён в %s.prof", name, base_path)
+
+
+@contextmanager
+def measure(name: str, rows_in: int | None = None) -> Iterator[dict[str, Any]]:
+    """
+    Контекстный менеджер, измеряющий блок кода: время выполнения, процессорное время, строки и пик памяти.
+
+    Пик памяти блока (peak_memory_kb, прирост относительно начала блока) считается по tracemalloc и доступен
+    только при включённой трассировке (METRICS_TRACEMALLOC или профилирование). Без неё записывается
+    process_max_rss_kb — максимум резидентной памяти процесса за всё время (ru_maxrss), а не пик блока.
+    Строка в лог пишется, только если метрики включены (задан METRICS_FILE).
+
+    Возвращаемый словарь метрики можно дополнить внутри блока (например, указать rows_out).
+    Если имя совпадает с PROFILE_FUNC, блок дополнительно профилируется cProfile и tracemalloc.
+
+    :param name: Имя функции или блока.
+    :param rows_in: Количество входных строк или None.
+    :return: Итератор со словарём метрики.
+    """
+    metric: dict[str, Any] = {
+        "name": name,
+        "started_at": datetime.now().isoformat(timespec="milliseconds"),
+        "rows_in": rows_in,
+        "rows_out": None,
+    }
+    profiler = None
+    started_tracing = False
+    if os.getenv(PROFILE_ENV) == name:
+        import cProfile
+
+        profiler = cProfile.Profile()
+    if (profiler is not None or os.getenv(METRICS_TRACEMALLOC_ENV)) and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        started_tracing = profiler is not None
+
+    peaks = _get_peak_stack()
+    tracing = tracemalloc.is_tracing()
+    memory_start = 0
+    if tracing:
+        memory_start, peak_before = tracemalloc.get_traced_memory()
+        if peaks:
+            peaks[-1] = max(peaks[-1], peak_before)
+        tracemalloc.reset_peak()
+        peaks.append(0)
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield metric
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        metric["wall_s"] = round(time.perf_counter() - wall_start, 6)
+        metric["cpu_s"] = round(time.process_time() - cpu_start, 6)
+        if tracing:
+            peak = max(peaks.pop(), tracemalloc.get_traced_memory()[1])
+            if peaks:
+                peaks[-1] = max(peaks[-1], peak)
+            metric["peak_memory_kb"] = round((peak - memory_start) / 1024)
+            metric["memory_source"] = "tracemalloc"
+        else:
+            metric["process_max_rss_kb"] = _get_max_rss_kb()
+            metric["memory_source"] = "maxrss"
+        if profiler is not None:
+            _dump_profile(name, profiler, tracemalloc.take_snapshot())
+        if started_tracing:
+            tracemalloc.stop()
+        record_metric(metric)
+        if metrics_enabled():
+            logger.debug(
+                "%s: %.4f s wall, %.4f s cpu, rows %s -> %s",
+                name,
+                metric["wall_s"],
+                metric["cpu_s"],
+                metric["rows_in"],
+                metric["rows_out"],
+            )
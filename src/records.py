@@ -0,0 +1,98 @@
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Any, overload
+
+import numpy as np
+import pandas as pd
+
+
+class TransactionRecord(Mapping):
+    """
+    Ленивое представление одной транзакции из TransactionRecords.
+
+    Ведёт себя как словарь только для чтения (record["Сумма операции"], .get, .items), но хранит лишь ссылку
+    на столбцы и номер строки: значение поля читается из столбца при обращении.
+    """
+
+    __slots__ = ("_records", "_index")
+
+    def __init__(self, records: "TransactionRecords", index: int) -> None:
+        """
+        :param records: Столбцовое хранилище транзакций.
+        :param index: Номер строки.
+        """
+        self._records = records
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        return self._records.columns[key][self._index]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records.columns)
+
+    def __len__(self) -> int:
+        return len(self._records.columns)
+
+    def __repr__(self) -> str:
+        return f"TransactionRecord({dict(self)!r})"
+
+
+class TransactionRecords(Sequence):
+    """
+    Компактная замена списку словарей из DataFrame.to_dict(orient="records").
+
+    Данные хранятся по столбцам (массивы NumPy/pandas), а строки выдаются как TransactionRecord
+    по требованию, поэтому на строку не создаётся словарь с ключами-строками.
+    """
+
+    __slots__ = ("columns", "_length")
+
+    def __init__(self, columns: dict[str, Any], length: int) -> None:
+        """
+        :param columns: Словарь "имя столбца" -> массив значений.
+        :param length: Количество строк.
+        """
+        self.columns = columns
+        self._length = length
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "TransactionRecords":
+        """
+        Создаёт хранилище из DataFrame без построчного копирования.
+
+        Столбцы с датами хранятся как DatetimeArray, чтобы поле возвращало pd.Timestamp (как в to_dict).
+
+        :param df: DataFrame с транзакциями.
+        :return: Хранилище транзакций.
+        """
+        columns: dict[str, Any] = {}
+        for column in df.columns:
+            series = df[column]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                columns[str(column)] = series.array
+            else:
+                columns[str(column)] = series.to_numpy()
+        return cls(columns, len(df))
+
+    @overload
+    def __getitem__(self, index: int) -> TransactionRecord: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "TransactionRecords": ...
+
+    def __getitem__(self, index: int | slice) -> "TransactionRecord | TransactionRecords":
+        if isinstance(index, slice):
+            positions = np.arange(self._length)[index]
+            columns = {name: values[positions] for name, values in self.columns.items()}
+            return TransactionRecords(columns, len(positions))
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Индекс транзакции вне диапазона")
+        return TransactionRecord(self, index)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[TransactionRecord]:
+        for index in range(self._length):
+            yield TransactionRecord(self, index)
@@ -3,11 +3,13 @@ from datetime import datetime
 import pandas as pd
 from dateutil.relativedelta import relativedelta
 
-from src.decorators import saving_to_file
+from src.dates import parse_operation_dates
+from src.decorators import instrumented, saving_to_file
 from src.loggers import logger
 from src.utils import check_date
 
 
+@instrumented()
 @saving_to_file()
 def spending_by_category(df: pd.DataFrame, category: str, date: str | None = None) -> pd.DataFrame | None:
     """
@@ -35,7 +37,7 @@ def spending_by_category(df: pd.DataFrame, category: str, date: str | None = Non
         for column in ["Дата операции", "Категория"]:
             if column not in df.columns:
                 raise ValueError("Проблема с переданным объектом DataFrame, нет столбцов по которым происходит отбор")
-        df["Дата операции"] = pd.to_datetime(df["Дата операции"], format="%d.%m.%Y %H:%M:%S")
+        df["Дата операции"] = parse_operation_dates(df["Дата операции"])
         back_date_dt = user_date_dt - relativedelta(months=3)
         filtered_df = df[
             (df["Статус"] == "OK")
@@ -45,15 +47,16 @@ def spending_by_category(df: pd.DataFrame, category: str, date: str | None = Non
             & (df["Категория"] == category)
         ]
     except TypeError as type_ex:
-        logger.error(f"{type_ex.__class__.__name__}: {type_ex}")
+        logger.error("%s: %s", type_ex.__class__.__name__, type_ex)
     except ValueError as val_ex:
-        logger.error(f"{val_ex.__class__.__name__}: {val_ex}")
+        logger.error("%s: %s", val_ex.__class__.__name__, val_ex)
     except Exception as ex:
-        logger.debug(f"{ex.__class__.__name__}: {ex}", exc_info=True)
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
     finally:
         return filtered_df
 
 
+@instrumented()
 @saving_to_file()
 def spending_by_weekday(df: pd.DataFrame, date: str | None = None) -> pd.DataFrame:
     """
@@ -74,7 +77,7 @@ def spending_by_weekday(df: pd.DataFrame, date: str | None = None) -> pd.DataFra
             raise ValueError("Проблема с переданной датой, смотрите логи")
         if not isinstance(df, pd.DataFrame):
             raise TypeError("Передан неверный формат объекта с транзакциями, ожидается DataFrame")
-        df["Дата операции"] = pd.to_datetime(df["Дата операции"], format="%d.%m.%Y %H:%M:%S")
+        df["Дата операции"] = parse_operation_dates(df["Дата операции"])
         back_date_dt = user_date_dt - relativedelta(months=3)
         filtered_df = df[
             (df["Статус"] == "OK")
@@ -90,15 +93,16 @@ def spending_by_weekday(df: pd.DataFrame, date: str | None = None) -> pd.DataFra
                 result_df["Дни недели"].append(week_days[i])
                 result_df["Средняя сумма платежей"].append(round(abs(mean_pay), 2))
     except TypeError as type_ex:
-        logger.error(f"{type_ex.__class__.__name__}: {type_ex}")
+        logger.error("%s: %s", type_ex.__class__.__name__, type_ex)
     except ValueError as val_ex:
-        logger.error(f"{val_ex.__class__.__name__}: {val_ex}")
+        logger.error("%s: %s", val_ex.__class__.__name__, val_ex)
     except Exception as ex:
-        logger.debug(f"{ex.__class__.__name__}: {ex}", exc_info=True)
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
     finally:
         return pd.DataFrame(result_df)
 
 
+@instrumented()
 @saving_to_file()
 def spending_workday_weekend(df: pd.DataFrame, date: str | None = None) -> pd.DataFrame:
     """
@@ -121,7 +125,7 @@ def spending_workday_weekend(df: pd.DataFrame, date: str | None = None) -> pd.Da
             raise ValueError("Проблема с переданной датой, смотрите логи")
         if not isinstance(df, pd.DataFrame):
             raise TypeError("Передан неверный формат объекта с транзакциями, ожидается DataFrame")
-        df["Дата операции"] = pd.to_datetime(df["Дата операции"], format="%d.%m.%Y %H:%M:%S")
+        df["Дата операции"] = parse_operation_dates(df["Дата операции"])
         back_date_dt = user_date_dt - relativedelta(months=3)
         filtered_df = df[
             (df["Статус"] == "OK")
@@ -142,10 +146,10 @@ def spending_workday_weekend(df: pd.DataFrame, date: str | None = None) -> pd.Da
                 result_df["Средняя сумма платежей"][0] = round(workday_pays, 2)
                 result_df["Средняя сумма платежей"][1] = round(weekend_pays, 2)
     except TypeError as type_ex:
-        logger.error(f"{type_ex.__class__.__name__}: {type_ex}")
+        logger.error("%s: %s", type_ex.__class__.__name__, type_ex)
     except ValueError as val_ex:
-        logger.error(f"{val_ex.__class__.__name__}: {val_ex}")
+        logger.error("%s: %s", val_ex.__class__.__name__, val_ex)
     except Exception as ex:
-        logger.debug(f"{ex.__class__.__name__}: {ex}", exc_info=True)
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
     finally:
         return pd.DataFrame(result_df)
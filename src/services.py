@@ -1,61 +1,86 @@
 import json
 import re
+from collections.abc import Mapping, Sequence
 from datetime import datetime
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
+from src.config import get_backend
+from src.dates import parse_operation_dates
+from src.decorators import instrumented
 from src.files import get_df_operations, save_result_in_json
 from src.loggers import logger
+from src.merchants import MerchantDimension, get_merchant_dimension
 
+PHONE_PATTERN = r"\+?[78][- ]?\d{3}[- ]?\d{3}[- ]?\d{2}[- ]?\d{2}"
+INDIVIDUAL_PATTERN = r"[А-Я][а-я]+ [А-Я]\."
+# Периоды повторяющихся платежей: средний интервал и допуск в днях
+RECURRING_PERIODS = {"weekly": (7.0, 1.0), "monthly": (30.4, 3.5)}
+RECURRING_AMOUNT_BAND = 0.1
+RECURRING_MIN_SHARE = 0.75
+RECURRING_MIN_OCCURRENCES = 3
 
-def categories_of_increased_cashback(data: pd.DataFrame, year: int, month: int) -> None:
+
+@instrumented()
+def categories_of_increased_cashback(data: pd.DataFrame | None, year: int, month: int) -> None:
     """
     Анализирует данные по кэшбэку за определенный год и месяц, и записывает в json файл список
     со словарями категорий с увеличенным кэшбэком, отсортированных по убыванию.
 
-    :param data: DataFrame с данными о платежах.
+    :param data: DataFrame с данными о платежах или None, чтобы при хранилище SQLite суммировать кэшбэк
+    запросом к базе операций.
     :param year: Год для анализа.
     :param month: Месяц для анализа.
     :return: None
     """
     json_result: dict = {"year": 0, "month": 0, "result": []}
     try:
-        if not isinstance(data, pd.DataFrame):
-            raise TypeError("Передан неверный тип данных объекта data, ожидается DataFrame")
         if not isinstance(year, int):
             raise TypeError("Передан неверный тип данных year, ожидается int")
         if not isinstance(month, int):
             raise TypeError("Передан неверный тип данных month, ожидается int")
+        if data is None and get_backend() == "sqlite":
+            from src.database import query_cashback_by_category
+
+            sorted_result = query_cashback_by_category(year, month)
+        else:
+            if not isinstance(data, pd.DataFrame):
+                raise TypeError("Передан неверный тип данных объекта data, ожидается DataFrame")
+            data["Дата операции"] = parse_operation_dates(data["Дата операции"])
+            filtered_of_ym = data.loc[
+                (data["Дата операции"].dt.year == year) & (data["Дата операции"].dt.month == month)
+            ]
+            group_by_category = filtered_of_ym.groupby(filtered_of_ym["Категория"])
+            analysis_result = group_by_category["Кэшбэк"].sum()
+            sorted_result = analysis_result.sort_values(ascending=False)
         json_result["year"] = year
         json_result["month"] = month
-        data["Дата операции"] = pd.to_datetime(data["Дата операции"], format="%d.%m.%Y %H:%M:%S")
-        filtered_of_ym = data.loc[(data["Дата операции"].dt.year == year) & (data["Дата операции"].dt.month == month)]
-        group_by_category = filtered_of_ym.groupby(filtered_of_ym["Категория"])
-        analysis_result = group_by_category["Кэшбэк"].sum()
-        sorted_result = analysis_result.sort_values(ascending=False)
         for category, cashback in sorted_result.items():
             if cashback <= 0:
                 break
             json_result["result"].append({category: cashback})
     except TypeError as type_ex:
-        logger.error(f"{type_ex.__class__.__name__}: {type_ex}")
+        logger.error("%s: %s", type_ex.__class__.__name__, type_ex)
     except KeyError as key_ex:
-        logger.error(f"{key_ex.__class__.__name__}: {key_ex}")
+        logger.error("%s: %s", key_ex.__class__.__name__, key_ex)
     except Exception as ex:
-        logger.debug(f"{ex.__class__.__name__}: {ex}", exc_info=True)
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
     finally:
         filename = f"cashback_info_{year}_{month}.json"
         save_result_in_json(filename=filename, json_obj=json_result)
 
 
-def invest_moneybox(month: str, transactions: list[dict[str, Any]], limit: int) -> None:
+@instrumented()
+def invest_moneybox(month: str, transactions: Sequence[Mapping[str, Any]], limit: int) -> None:
     """
     Функция рассчитывает возможные накопления по предоставленным данным и записывает в json файл
     сумму, которую удалось бы отложить в инвесткопилку.
 
     :param month: Месяц, для которого рассчитывается отложенная сумма (строка в формате YYYY-MM)
-    :param transactions: Список словарей, содержащий информацию о транзакциях, в которых содержатся следующие поля:
+    :param transactions: Список словарей (или TransactionRecords), содержащий информацию о транзакциях,
+    в которых содержатся следующие поля:
         Дата операции - Дата, когда произошла транзакция (строка в формате YYYY-MM-DD)
         Сумма операции - Сумма транзакции в оригинальной валюте (число)
     :param limit: Предел, до которого нужно округлять суммы операций (целое число)
@@ -66,7 +91,7 @@ def invest_moneybox(month: str, transactions: list[dict[str, Any]], limit: int)
     try:
         if not isinstance(month, str):
             raise TypeError("Переден неверный тип данных объекта month, ожидатется строка")
-        if not isinstance(transactions, list) or not isinstance(transactions[0], dict):
+        if not isinstance(transactions, Sequence) or not isinstance(transactions[0], Mapping):
             raise TypeError("Переден неверный тип данных объекта transactions, ожидатется список словарей")
         if not isinstance(limit, int):
             raise TypeError("Переден неверный тип данных объекта limit, ожидатется целое число")
@@ -87,16 +112,17 @@ def invest_moneybox(month: str, transactions: list[dict[str, Any]], limit: int)
         else:
             json_result["total"] = round(total, 2)
     except TypeError as type_ex:
-        logger.error(f"{type_ex.__class__.__name__}: {type_ex}")
+        logger.error("%s: %s", type_ex.__class__.__name__, type_ex)
     except ValueError as val_ex:
-        logger.error(f"{val_ex.__class__.__name__}: {val_ex}")
+        logger.error("%s: %s", val_ex.__class__.__name__, val_ex)
     except Exception as ex:
-        logger.debug(f"{ex.__class__.__name__}: {ex}", exc_info=True)
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
     finally:
         filename = "invest_moneybox_result.json"
         save_result_in_json(filename=filename, json_obj=json_result)
 
 
+@instrumented()
 def simple_search(query: str) -> None:
     """
     Выполняет простой поиск в описании транзакций по заданному запросу и сохраняет результат в JSON-файл.
@@ -108,21 +134,27 @@ def simple_search(query: str) -> None:
     try:
         if not isinstance(query, str):
             raise TypeError("Переден неверный тип данных объекта query, ожидатется строка")
-        df = get_df_operations()
-        if not isinstance(df, pd.DataFrame):
-            raise TypeError("Из files.py не получен DataFrame")
-        search_result = df[df["Описание"].str.contains(query, case=False)]
+        if get_backend() == "sqlite":
+            from src.database import query_by_description
+
+            search_result = query_by_description(query, case=False)
+        else:
+            df = get_df_operations()
+            if not isinstance(df, pd.DataFrame):
+                raise TypeError("Из files.py не получен DataFrame")
+            search_result = df[get_merchant_dimension(df["Описание"]).contains(query, case=False)]
         result_search_dict = search_result.to_dict(orient="records")
         json_result["result"] = result_search_dict
     except TypeError as type_ex:
-        logger.error(f"{type_ex.__class__.__name__}: {type_ex}")
+        logger.error("%s: %s", type_ex.__class__.__name__, type_ex)
     except Exception as ex:
-        logger.debug(f"{ex.__class__.__name__}: {ex}", exc_info=True)
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
     finally:
         filename = "simple_search.json"
         save_result_in_json(filename=filename, json_obj=json_result)
 
 
+@instrumented()
 def search_by_phone_number() -> None:
     """
     Выполняет поиск транзакций по наличию телефонных номеров в описаниях и сохраняет результат в JSON-файл.
@@ -131,20 +163,26 @@ def search_by_phone_number() -> None:
     """
     json_result: dict = {"result": []}
     try:
-        df = get_df_operations()
-        if not isinstance(df, pd.DataFrame):
-            raise TypeError("Из files.py не получен DataFrame")
-        search_result = df[df["Описание"].str.findall(r"\+?[78][- ]?\d{3}[- ]?\d{3}[- ]?\d{2}[- ]?\d{2}").apply(bool)]
+        if get_backend() == "sqlite":
+            from src.database import query_by_description
+
+            search_result = query_by_description(PHONE_PATTERN)
+        else:
+            df = get_df_operations()
+            if not isinstance(df, pd.DataFrame):
+                raise TypeError("Из files.py не получен DataFrame")
+            search_result = df[get_merchant_dimension(df["Описание"]).contains(PHONE_PATTERN)]
         json_result["result"] = json.loads(search_result.to_json(orient="records"))
     except TypeError as type_ex:
-        logger.error(f"{type_ex.__class__.__name__}: {type_ex}")
+        logger.error("%s: %s", type_ex.__class__.__name__, type_ex)
     except Exception as ex:
-        logger.debug(f"{ex.__class__.__name__}: {ex}", exc_info=True)
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
     finally:
         filename = "search_by_phone_number.json"
         save_result_in_json(filename=filename, json_obj=json_result)
 
 
+@instrumented()
 def search_for_transfers_to_individuals() -> None:
     """
     Выполняет поиск транзакций по категории "Переводы" и сохраняет результат в JSON-файл.
@@ -153,15 +191,126 @@ def search_for_transfers_to_individuals() -> None:
     """
     json_result: dict = {"result": []}
     try:
-        df = get_df_operations()
-        if not isinstance(df, pd.DataFrame):
-            raise TypeError("Из files.py не получен DataFrame")
-        search_result = df[(df["Категория"] == "Переводы") & df["Описание"].str.contains(r"[А-Я][а-я]+ [А-Я]\.")]
+        if get_backend() == "sqlite":
+            from src.database import query_by_description
+
+            search_result = query_by_description(INDIVIDUAL_PATTERN, category="Переводы")
+        else:
+            df = get_df_operations()
+            if not isinstance(df, pd.DataFrame):
+                raise TypeError("Из files.py не получен DataFrame")
+            is_individual = get_merchant_dimension(df["Описание"]).contains(INDIVIDUAL_PATTERN)
+            search_result = df[(df["Категория"] == "Переводы") & is_individual]
         json_result["result"] = json.loads(search_result.to_json(orient="records"))
     except TypeError as type_ex:
-        logger.error(f"{type_ex.__class__.__name__}: {type_ex}")
+        logger.error("%s: %s", type_ex.__class__.__name__, type_ex)
     except Exception as ex:
-        logger.debug(f"{ex.__class__.__name__}: {ex}", exc_info=True)
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
     finally:
         filename = "search_for_transfers_to_individuals.json"
         save_result_in_json(filename=filename, json_obj=json_result)
+
+
+@instrumented()
+def detect_recurring_payments(df: pd.DataFrame, min_occurrences: int = RECURRING_MIN_OCCURRENCES) -> list[dict]:
+    """
+    Находит повторяющиеся платежи (подписки): серии трат у одного мерчанта с близкой суммой,
+    повторяющиеся раз в неделю или раз в месяц.
+
+    Операции группируются по нормализованному описанию и полосе суммы (соседние по величине суммы
+    отличаются не более чем на 10 %) и сортируются по (мерчант, полоса, дата) за O(n log n);
+    интервалы между соседними платежами серии считаются одним векторным проходом по отсортированным
+    массивам, без попарных сравнений.
+
+    :param df: DataFrame с операциями (Дата операции, Статус, Сумма платежа, Описание).
+    :param min_occurrences: Минимальное количество платежей в серии.
+    :return: Список серий с периодом, количеством платежей, суммой, датами последнего и следующего платежа.
+    :raises ValueError: Если в DataFrame нет необходимых столбцов.
+    """
+    for column in ["Дата операции", "Статус", "Сумма платежа", "Описание"]:
+        if column not in df.columns:
+            raise ValueError("Переданный DataFrame не содержит необходимые, для обработки, поля")
+    expenses = df.loc[(df["Сумма платежа"] < 0) & (df["Статус"] == "OK"), ["Дата операции", "Сумма платежа"]]
+    dates = parse_operation_dates(expenses["Дата операции"])
+    merchants = MerchantDimension.from_series(df.loc[expenses.index, "Описание"])
+    valid = (dates.notna() & expenses["Сумма платежа"].notna()).to_numpy() & (merchants.codes >= 0)
+    if not valid.any():
+        return []
+
+    # Мерчант: код нормализованного описания
+    normalized_codes, _ = pd.factorize(merchants.to_frame()["normalized"])
+    merchant = normalized_codes[merchants.codes[valid]]
+    amount = -expenses["Сумма платежа"].to_numpy()[valid]
+    # Полоса суммы: суммы мерчанта по возрастанию делятся на полосы там, где следующая сумма
+    # больше предыдущей более чем на 10 %, поэтому близкие суммы не разделяются фиксированной границей
+    by_amount = np.lexsort((amount, merchant))
+    is_band_start = np.ones(len(by_amount), dtype=bool)
+    sorted_amount = amount[by_amount]
+    is_band_start[1:] = (merchant[by_amount][1:] != merchant[by_amount][:-1]) | (
+        sorted_amount[1:] > sorted_amount[:-1] * (1 + RECURRING_AMOUNT_BAND)
+    )
+    band = np.empty(len(by_amount), dtype=np.int64)
+    band[by_amount] = np.cumsum(is_band_start)
+    timestamps = dates.to_numpy()[valid]
+    days = (timestamps - timestamps.min()) / np.timedelta64(1, "D")
+    description_codes = merchants.codes[valid]
+
+    order = np.lexsort((days, band, merchant))
+    merchant, band, days, amount = merchant[order], band[order], days[order], amount[order]
+    timestamps, description_codes = timestamps[order], description_codes[order]
+
+    is_start = np.ones(len(order), dtype=bool)
+    is_start[1:] = (merchant[1:] != merchant[:-1]) | (band[1:] != band[:-1])
+    group_ids = np.cumsum(is_start) - 1
+    starts = np.flatnonzero(is_start)
+    counts = np.diff(np.append(starts, len(order)))
+    lasts = starts + counts - 1
+    gaps = np.diff(days, prepend=0.0)
+
+    result = []
+    for period, (period_days, tolerance) in RECURRING_PERIODS.items():
+        # Доля интервалов серии, совпадающих с периодом; первый платёж серии интервала не имеет
+        regular = ~is_start & (np.abs(gaps - period_days) <= tolerance)
+        share = np.bincount(group_ids, weights=regular, minlength=len(starts)) / np.maximum(counts - 1, 1)
+        for group in np.flatnonzero((counts >= min_occurrences) & (share >= RECURRING_MIN_SHARE)):
+            last = lasts[group]
+            last_date = pd.Timestamp(timestamps[last])
+            next_date = last_date + (pd.DateOffset(months=1) if period == "monthly" else pd.Timedelta(days=7))
+            result.append(
+                {
+                    "description": str(merchants.merchants[description_codes[last]]),
+                    "period": period,
+                    "occurrences": int(counts[group]),
+                    "amount": round(float(amount[last]), 2),
+                    "last_date": last_date.strftime("%d.%m.%Y"),
+                    "next_date": next_date.strftime("%d.%m.%Y"),
+                }
+            )
+    return sorted(result, key=lambda series: (series["description"], series["period"], series["amount"]))
+
+
+@instrumented()
+def find_recurring_payments(min_occurrences: int = RECURRING_MIN_OCCURRENCES) -> None:
+    """
+    Находит повторяющиеся платежи (подписки) и сохраняет результат в JSON-файл.
+
+    :param min_occurrences: Минимальное количество платежей в серии.
+    :return: None
+    """
+    json_result: dict = {"result": []}
+    try:
+        if not isinstance(min_occurrences, int):
+            raise TypeError("Переден неверный тип данных объекта min_occurrences, ожидатется целое число")
+        df = get_df_operations(columns=["Дата операции", "Статус", "Сумма платежа", "Описание"])
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("Из files.py не получен DataFrame")
+        json_result["result"] = detect_recurring_payments(df, min_occurrences)
+    except TypeError as type_ex:
+        logger.error("%s: %s", type_ex.__class__.__name__, type_ex)
+    except ValueError as val_ex:
+        logger.error("%s: %s", val_ex.__class__.__name__, val_ex)
+    except Exception as ex:
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
+    finally:
+        filename = "recurring_payments.json"
+        save_result_in_json(filename=filename, json_obj=json_result)
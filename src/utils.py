@@ -1,22 +1,61 @@
 import os
-import re
 from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any
 
 import pandas as pd
-import requests
-from dotenv import load_dotenv
 
+from src.dates import parse_date, parse_operation_dates
+from src.decorators import instrumented
 from src.files import get_df_operations
 from src.loggers import logger
 
-load_dotenv()
-API_MARKETSTACK = os.getenv("API_MARKETSTACK")
+
+@lru_cache(maxsize=1)
+def get_api_marketstack() -> str | None:
+    """
+    Возвращает ключ API Marketstack, загружая переменные окружения из .env при первом обращении.
+
+    :return: Ключ API или None, если он не задан.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return os.getenv("API_MARKETSTACK")
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Лениво предоставляет атрибут модуля API_MARKETSTACK, чтобы импорт не читал .env.
+
+    :param name: Имя запрашиваемого атрибута модуля.
+    :return: Значение атрибута.
+    :raises AttributeError: Если атрибут не найден.
+    """
+    if name == "API_MARKETSTACK":
+        return get_api_marketstack()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def with_columns(columns: list[str] | None, required: list[str]) -> list[str] | None:
+    """
+    Дополняет список читаемых столбцов столбцами, без которых невозможна фильтрация.
+
+    :param columns: Запрошенные столбцы или None для чтения всех столбцов.
+    :param required: Столбцы, необходимые для фильтрации.
+    :return: Объединённый список столбцов без повторов или None, если читаются все столбцы.
+    """
+    if columns is None:
+        return None
+    return list(dict.fromkeys([*columns, *required]))
 
 
 def check_date(date_checked: str) -> datetime | None:
     """
     Проверяет строку с датой на соответствие формату и возвращает объект datetime.
 
+    Для массивов дат используйте src.dates.parse_dates, который разбирает их векторно.
+
     :param date_checked: Строка с датой в формате YYYY-MM-DD HH:MM:SS.
     :return: Объект datetime, представляющий дату и время или None в случае ошибки.
     :raises TypeError: Если передан неверный тип данных в date_checked (ожидается str).
@@ -25,19 +64,13 @@ def check_date(date_checked: str) -> datetime | None:
     """
     result_date = None
     try:
-        if not isinstance(date_checked, str):
-            raise TypeError("Передан неверный тип данных, ожидается str")
-        pattern = re.compile(r"\b\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\b")
-        date_str = pattern.search(date_checked)
-        if not date_str:
-            raise ValueError("Передан неверный формат даты, ожидается YYYY-MM-DD HH:MM:SS")
-        result_date = datetime.strptime(date_str[0], "%Y-%m-%d %H:%M:%S")
+        result_date = parse_date(date_checked)
     except TypeError as type_ex:
-        logger.error(f"{type_ex.__class__.__name__}: {type_ex}")
+        logger.error("%s: %s", type_ex.__class__.__name__, type_ex)
     except ValueError as val_ex:
-        logger.error(f"{val_ex.__class__.__name__}: {val_ex}")
+        logger.error("%s: %s", val_ex.__class__.__name__, val_ex)
     except Exception as ex:
-        logger.debug(f"{ex.__class__.__name__}: {ex}", exc_info=True)
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
     finally:
         return result_date
 
@@ -60,10 +93,16 @@ def get_time_of_day() -> str:
     return message
 
 
-def get_df_by_interval(date: str) -> pd.DataFrame | None:
+@instrumented()
+def get_df_by_interval(
+    date: str, columns: list[str] | None = None, df: pd.DataFrame | None = None
+) -> pd.DataFrame | None:
     """
     Формирует операции пользователя из файла, в заданном временном интервале.
 
+    :param date: Дата окончания интервала в формате "ГГГГ-ММ-ДД ЧЧ:ММ:СС".
+    :param columns: Столбцы, которые нужно прочитать из файла, или None для чтения всех столбцов.
+    :param df: Уже загруженные операции; если передан, файл не читается, а сам DataFrame не изменяется.
     :return: DataFrame с операциями пользователя с начала месяца и до переданной даты или None в случае ошибки
     """
     result_df: pd.DataFrame | None = None
@@ -72,10 +111,13 @@ def get_df_by_interval(date: str) -> pd.DataFrame | None:
         if not isinstance(user_date, datetime):
             raise ValueError("Проблема с переданной датой, смотрите логи")
         start_date = datetime.replace(user_date, day=1)
-        df = get_df_operations()
+        if df is None:
+            df = get_df_operations(columns=with_columns(columns, ["Дата операции", "Сумма платежа", "Статус"]))
+        else:
+            df = df.copy(deep=False)
         if not isinstance(df, pd.DataFrame):
             raise TypeError("Из files.py не получен DataFrame")
-        df["Дата операции"] = pd.to_datetime(df["Дата операции"], format="%d.%m.%Y %H:%M:%S")
+        df["Дата операции"] = parse_operation_dates(df["Дата операции"])
         result_df = df[
             (df["Дата операции"] >= start_date)
             & (df["Дата операции"] <= user_date)
@@ -83,22 +125,27 @@ def get_df_by_interval(date: str) -> pd.DataFrame | None:
             & (df["Статус"] == "OK")
         ]
     except TypeError as type_ex:
-        logger.error(f"{type_ex.__class__.__name__}: {type_ex}")
+        logger.error("%s: %s", type_ex.__class__.__name__, type_ex)
     except ValueError as val_ex:
-        logger.error(f"{val_ex.__class__.__name__}: {val_ex}")
+        logger.error("%s: %s", val_ex.__class__.__name__, val_ex)
     except Exception as ex:
-        logger.debug(f"{ex.__class__.__name__}: {ex}", exc_info=True)
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
     finally:
         return result_df
 
 
-def get_filtered_df(date: str, range_data: str) -> pd.DataFrame | None:
+@instrumented()
+def get_filtered_df(
+    date: str, range_data: str, columns: list[str] | None = None, df: pd.DataFrame | None = None
+) -> pd.DataFrame | None:
     """
     Функция выполняет фильтрацию операций на основе переданной даты и диапазона данных.
 
     :param date: Дата для фильтрации в формате "ГГГГ-ММ-ДД ЧЧ:ММ:СС".
     :param range_data: Диапазон данных для фильтрации.
     Возможные значения: "W" (неделя), "M" (месяц), "Y" (год), "ALL" (все).
+    :param columns: Столбцы, которые нужно прочитать из файла, или None для чтения всех столбцов.
+    :param df: Уже загруженные операции; если передан, файл не читается, а сам DataFrame не изменяется.
     :return: DataFrame с отфильтрованными операциями или None в случае ошибки.
     """
     result_df: pd.DataFrame | None = None
@@ -108,10 +155,13 @@ def get_filtered_df(date: str, range_data: str) -> pd.DataFrame | None:
             raise ValueError("Проблема с переданной датой, смотрите логи")
         if not isinstance(range_data, str) or range_data.upper() not in ["W", "M", "Y", "ALL"]:
             raise ValueError('Передано неверное значение в range_data. Возможные значения: "W", "M", "Y", "ALL"')
-        df = get_df_operations()
+        if df is None:
+            df = get_df_operations(columns=with_columns(columns, ["Дата операции"]))
+        else:
+            df = df.copy(deep=False)
         if not isinstance(df, pd.DataFrame):
             raise TypeError("Из files.py не получен DataFrame")
-        df["Дата операции"] = pd.to_datetime(df["Дата операции"], format="%d.%m.%Y %H:%M:%S")
+        df["Дата операции"] = parse_operation_dates(df["Дата операции"])
 
         if range_data == "W":
             weekday = date_dt.weekday()
@@ -127,15 +177,16 @@ def get_filtered_df(date: str, range_data: str) -> pd.DataFrame | None:
         else:
             result_df = df
     except TypeError as type_ex:
-        logger.error(f"{type_ex.__class__.__name__}: {type_ex}")
+        logger.error("%s: %s", type_ex.__class__.__name__, type_ex)
     except ValueError as val_ex:
-        logger.error(f"{val_ex.__class__.__name__}: {val_ex}")
+        logger.error("%s: %s", val_ex.__class__.__name__, val_ex)
     except Exception as ex:
-        logger.debug(f"{ex.__class__.__name__}: {ex}", exc_info=True)
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
     finally:
         return result_df
 
 
+@instrumented()
 def get_list_categories_with_amounts(df_to_handle: pd.Series) -> list | list[dict]:
     """
     Функция создает список словарей, в которых каждый словарь содержит информацию о категории и сумме трат по ней.
@@ -150,11 +201,12 @@ def get_list_categories_with_amounts(df_to_handle: pd.Series) -> list | list[dic
                 if isinstance(category, str) and isinstance(sum_pay, float):
                     result.append({"category": category, "amount": round(abs(sum_pay))})
     except Exception as ex:
-        logger.debug(f"{ex.__class__.__name__}: {ex}", exc_info=True)
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
     finally:
         return result
 
 
+@instrumented()
 def get_price_stocks_user(user_settings_dict: dict) -> list | list[dict[str, float]]:
     """
     Получает текущие цены акций из S&P 500.
@@ -170,8 +222,10 @@ def get_price_stocks_user(user_settings_dict: dict) -> list | list[dict[str, flo
             raise ValueError("Ошибка в переданном объекте с настройками пользователя")
         tickers_stocks = {key: 0.0 for key in user_settings_dict["user_stocks"]}
         if tickers_stocks:
+            import requests
+
             symbols = ",".join(tickers_stocks.keys())
-            params = {"access_key": API_MARKETSTACK, "symbols": symbols}
+            params = {"access_key": get_api_marketstack(), "symbols": symbols}
             url = "http://api.marketstack.com/v1/intraday/latest"
             response = requests.get(url, params)
             status_code = response.status_code
@@ -183,15 +237,16 @@ def get_price_stocks_user(user_settings_dict: dict) -> list | list[dict[str, flo
             for stock in json_data["data"]:
                 result.append({"stock": stock["symbol"], "price": stock["last"]})
     except ConnectionError as conn_ex:
-        logger.error(f"{conn_ex.__class__.__name__}: {conn_ex}")
+        logger.error("%s: %s", conn_ex.__class__.__name__, conn_ex)
     except ValueError as val_ex:
-        logger.error(f"{val_ex.__class__.__name__}: {val_ex}")
+        logger.error("%s: %s", val_ex.__class__.__name__, val_ex)
     except Exception as ex:
-        logger.debug(f"{ex.__class__.__name__}: {ex}", exc_info=True)
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
     finally:
         return result
 
 
+@instrumented()
 def get_price_currencies_user(user_settings_dict: dict) -> list | list[dict[str, float]]:
     """
     Получает текущие курсы валют.
@@ -205,6 +260,8 @@ def get_price_currencies_user(user_settings_dict: dict) -> list | list[dict[str,
             raise ValueError("Ошибка в переданном объекте с настройками пользователя")
         user_currency = user_settings_dict["user_currencies"]
         if user_currency:
+            import requests
+
             url = "https://www.cbr-xml-daily.ru/daily_json.js"
             response = requests.get(url)
             if not response.status_code == 200:
@@ -213,10 +270,10 @@ def get_price_currencies_user(user_settings_dict: dict) -> list | list[dict[str,
             for curr in user_currency:
                 result.append({"currency": curr, "rate": currency_info["Valute"][curr]["Value"]})
     except ConnectionError as conn_ex:
-        logger.error(f"{conn_ex.__class__.__name__}: {conn_ex}")
+        logger.error("%s: %s", conn_ex.__class__.__name__, conn_ex)
     except ValueError as val_ex:
-        logger.error(f"{val_ex.__class__.__name__}: {val_ex}")
+        logger.error("%s: %s", val_ex.__class__.__name__, val_ex)
     except Exception as ex:
-        logger.debug(f"{ex.__class__.__name__}: {ex}", exc_info=True)
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
     finally:
         return result
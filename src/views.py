@@ -1,12 +1,143 @@
 import pandas as pd
 
-from src.files import save_result_in_json, user_settings
+from src.cache import get_data_version, get_market_snapshot_id, make_cache_key, view_cache
+from src.config import get_backend
+from src.decorators import instrumented
+from src.files import load_user_settings, save_result_in_json
 from src.loggers import logger
 from src.utils import (get_df_by_interval, get_filtered_df, get_list_categories_with_amounts,
                        get_price_currencies_user, get_price_stocks_user, get_time_of_day)
 
+DASHBOARD_COLUMNS = ["Дата операции", "Номер карты", "Статус", "Сумма платежа", "Категория", "Описание"]
+EVENTS_COLUMNS = ["Дата операции", "Статус", "Сумма платежа", "Категория"]
 
-def get_json_dashboard_info(date: str) -> None:
+
+def get_view_cache_key(func_name: str, params: dict, with_rates: bool) -> str:
+    """
+    Формирует ключ кэша результата страницы: функция, параметры, версия файла операций и снимок рынка.
+
+    Настройки пользователя входят в ключ, только если запрашиваются курсы валют и стоимость акций.
+    Хранилище операций (pandas или sqlite) входит в ключ всегда.
+
+    :param func_name: Имя функции страницы.
+    :param params: Параметры вызова.
+    :param with_rates: Запрашиваются ли курсы валют и стоимость акций.
+    :return: Ключ кэша.
+    """
+    params = {**params, "backend": get_backend(), "user_settings": load_user_settings() if with_rates else None}
+    return make_cache_key(func_name, params, get_data_version(), get_market_snapshot_id(with_rates))
+
+
+def _is_market_data_complete(user_settings: dict, json_result: dict) -> bool:
+    """
+    Проверяет, что курсы валют и стоимость акций получены для настроек пользователя.
+
+    Пустой список при непустых настройках означает ошибку запроса; такой результат не кэшируется.
+
+    :param user_settings: Настройки пользователя.
+    :param json_result: Результат страницы с ключами "currency_rates" и "stock_prices".
+    :return: True, если рыночные данные получены.
+    """
+    if user_settings.get("user_currencies") and not json_result["currency_rates"]:
+        return False
+    if user_settings.get("user_stocks") and not json_result["stock_prices"]:
+        return False
+    return True
+
+
+def get_dashboard_data(filtered_df: pd.DataFrame) -> dict:
+    """
+    Рассчитывает данные страницы “Главная” по операциям с начала месяца:
+    информацию по каждой карте и топ-5 транзакций по сумме платежа.
+
+    :param filtered_df: DataFrame с расходами с начала месяца (результат get_df_by_interval).
+    :return: Словарь с ключами "cards" и "top_transactions".
+    :raises TypeError: Если передан не DataFrame.
+    :raises ValueError: Если в DataFrame нет необходимых столбцов.
+    """
+    dashboard_data: dict = {"cards": [], "top_transactions": []}
+    if not isinstance(filtered_df, pd.DataFrame):
+        raise TypeError("Ожидается тип данных DataFrame")
+    for column in ["Дата операции", "Сумма платежа", "Описание", "Категория"]:
+        if column not in filtered_df.columns:
+            raise ValueError("Переданный DataFrame не содержит необходимые, для обработки, поля")
+    top_transactions = filtered_df.sort_values(by="Сумма платежа", ascending=True, kind="stable").head(5)
+    if not top_transactions.empty:
+        for _, transaction in top_transactions.iterrows():
+            dashboard_data["top_transactions"].append(
+                {
+                    "date": transaction["Дата операции"].strftime("%d.%m.%Y"),
+                    "amount": transaction["Сумма платежа"],
+                    "category": transaction["Категория"],
+                    "description": transaction["Описание"],
+                }
+            )
+
+    group_num_cards = filtered_df.groupby(filtered_df["Номер карты"])
+    sum_pay_info = group_num_cards["Сумма платежа"].sum()
+    if not sum_pay_info.empty:
+        for card, sum_pay in sum_pay_info.items():
+            if isinstance(card, str) and isinstance(sum_pay, float):
+                dashboard_data["cards"].append(
+                    {
+                        "last_digits": card[1:],
+                        "total_spent": round(abs(sum_pay), 2),
+                        "cashback": round(abs(sum_pay) / 100, 2),
+                    }
+                )
+    return dashboard_data
+
+
+def get_events_data(filtered_df: pd.DataFrame) -> dict:
+    """
+    Рассчитывает данные страницы “События”: расходы и поступления за период.
+
+    :param filtered_df: DataFrame с операциями за период (результат get_filtered_df).
+    :return: Словарь с ключами "expenses" и "income".
+    :raises TypeError: Если передан не DataFrame.
+    :raises ValueError: Если в DataFrame нет необходимых столбцов.
+    """
+    events_data: dict = {
+        "expenses": {"total_amount": 0.0, "main": [], "transfers_and_cash": []},
+        "income": {"total_amount": 0.0, "main": []},
+    }
+    if not isinstance(filtered_df, pd.DataFrame):
+        raise TypeError("Ожидается тип данных DataFrame")
+    for column in ["Сумма платежа", "Статус", "Категория"]:
+        if column not in filtered_df.columns:
+            raise ValueError("Переданный DataFrame не содержит необходимые, для обработки, поля")
+
+    # Сумма расходов
+    df_costs = filtered_df.loc[(filtered_df["Сумма платежа"] < 0) & (filtered_df["Статус"] == "OK")]
+    total_sum_costs = df_costs["Сумма платежа"].sum()
+    events_data["expenses"]["total_amount"] = round(abs(total_sum_costs))
+
+    # Основные расходы
+    df_main = df_costs.loc[~df_costs["Категория"].isin(["Наличные", "Переводы"])]
+    group_by_category_main = df_main.groupby(df_costs["Категория"])
+    sum_by_category_main = group_by_category_main["Сумма платежа"].sum().sort_values(ascending=True).head(7)
+    events_data["expenses"]["main"] = get_list_categories_with_amounts(sum_by_category_main)
+
+    # Переводы и наличные
+    df_transfer_cash = df_costs.loc[df_costs["Категория"].isin(["Наличные", "Переводы"])]
+    group_by_category_tc = df_transfer_cash.groupby(df_costs["Категория"])
+    sum_by_category_tc = group_by_category_tc["Сумма платежа"].sum().sort_values(ascending=True)
+    events_data["expenses"]["transfers_and_cash"] = get_list_categories_with_amounts(sum_by_category_tc)
+
+    # Сумма поступлений
+    df_receipt = filtered_df.loc[(filtered_df["Сумма платежа"] > 0) & (filtered_df["Статус"] == "OK")]
+    total_sum_receipt = df_receipt["Сумма платежа"].sum()
+    events_data["income"]["total_amount"] = round(total_sum_receipt)
+
+    # Поступления по категориям
+    group_by_category_receipt = df_receipt.groupby(df_receipt["Категория"])
+    sum_by_category_receipt = group_by_category_receipt["Сумма платежа"].sum().sort_values(ascending=False)
+    events_data["income"]["main"] = get_list_categories_with_amounts(sum_by_category_receipt)
+    return events_data
+
+
+@instrumented()
+def get_json_dashboard_info(date: str, with_rates: bool = True) -> None:
     """
     Функция принимает на вход строку с датой и временем в формате YYYY-MM-DD HH:MM:SS,
     и записывает в JSON файл ответ со следующими данными:
@@ -16,6 +147,7 @@ def get_json_dashboard_info(date: str) -> None:
     Курсы валют и стоимость акций из S&P 500
 
     :param date: Строка с датой и временем в формате YYYY-MM-DD HH:MM:SS.
+    :param with_rates: Запрашивать ли курсы валют и стоимость акций (требует сетевых запросов).
     :return: None
     """
     widget_message = get_time_of_day()
@@ -29,53 +161,41 @@ def get_json_dashboard_info(date: str) -> None:
     }
 
     try:
-        filtered_df = get_df_by_interval(date=date)
-        json_result["report_date"] = date
-        if not isinstance(filtered_df, pd.DataFrame):
-            raise TypeError("Ожидается тип данных DataFrame")
-        for column in ["Дата операции", "Сумма платежа", "Описание", "Категория"]:
-            if column not in filtered_df.columns:
-                raise ValueError("Переданный DataFrame не содержит необходимые, для обработки, поля")
-        top_transactions = filtered_df.sort_values(by="Сумма платежа", ascending=True).head(5)
-        if not top_transactions.empty:
-            for _, transaction in top_transactions.iterrows():
-                json_result["top_transactions"].append(
-                    {
-                        "date": transaction["Дата операции"].strftime("%d.%m.%Y"),
-                        "amount": transaction["Сумма платежа"],
-                        "category": transaction["Категория"],
-                        "description": transaction["Описание"],
-                    }
-                )
-
-        group_num_cards = filtered_df.groupby(filtered_df["Номер карты"])
-        sum_pay_info = group_num_cards["Сумма платежа"].sum()
-        if not sum_pay_info.empty:
-            for card, sum_pay in sum_pay_info.items():
-                if isinstance(card, str) and isinstance(sum_pay, float):
-                    json_result["cards"].append(
-                        {
-                            "last_digits": card[1:],
-                            "total_spent": round(abs(sum_pay), 2),
-                            "cashback": round(abs(sum_pay) / 100, 2),
-                        }
-                    )
-
-        json_result["currency_rates"] = get_price_currencies_user(user_settings)
-        json_result["stock_prices"] = get_price_stocks_user(user_settings)
+        cache_key = get_view_cache_key("get_json_dashboard_info", {"date": date}, with_rates)
+        cached_result = view_cache.get(cache_key)
+        if cached_result is not None:
+            json_result.update(cached_result)
+        else:
+            if get_backend() == "sqlite":
+                from src.database import query_dashboard_data
+
+                dashboard_data = query_dashboard_data(date)
+            else:
+                dashboard_data = get_dashboard_data(get_df_by_interval(date=date, columns=DASHBOARD_COLUMNS))
+            json_result["report_date"] = date
+            json_result.update(dashboard_data)
+
+            user_settings = load_user_settings() if with_rates else {}
+            if with_rates:
+                json_result["currency_rates"] = get_price_currencies_user(user_settings)
+                json_result["stock_prices"] = get_price_stocks_user(user_settings)
+            if _is_market_data_complete(user_settings, json_result):
+                # Приветствие зависит от текущего времени и в кэш не попадает
+                view_cache.put(cache_key, {key: value for key, value in json_result.items() if key != "greeting"})
 
     except TypeError as type_ex:
-        logger.error(f"{type_ex.__class__.__name__}: {type_ex}")
+        logger.error("%s: %s", type_ex.__class__.__name__, type_ex)
     except ValueError as val_ex:
-        logger.error(f"{val_ex.__class__.__name__}: {val_ex}")
+        logger.error("%s: %s", val_ex.__class__.__name__, val_ex)
     except Exception as ex:
-        logger.debug(f"{ex.__class__.__name__}: {ex}", exc_info=True)
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
     finally:
         filename = "main_info.json"
         save_result_in_json(filename=filename, json_obj=json_result)
 
 
-def get_json_events(date: str, range_data: str = "M") -> None:
+@instrumented()
+def get_json_events(date: str, range_data: str = "M", with_rates: bool = True) -> None:
     """
     Функция енерирует и сохраняет отчет о финансовых событиях в формате JSON
     на основе заданной даты и диапазона данных.
@@ -83,6 +203,7 @@ def get_json_events(date: str, range_data: str = "M") -> None:
     :param date: Дата для формирования отчета в формате "ГГГГ-ММ-ДД ЧЧ:ММ:СС".
     :param range_data: Диапазон данных для анализа.
     Возможные значения: "W" (неделя), "M" (месяц), "Y" (год), "ALL" (все).
+    :param with_rates: Запрашивать ли курсы валют и стоимость акций (требует сетевых запросов).
     :return: None
     """
     json_result: dict = {
@@ -94,52 +215,36 @@ def get_json_events(date: str, range_data: str = "M") -> None:
         "stock_prices": [],
     }
     try:
-        filtered_df = get_filtered_df(date=date, range_data=range_data)
-        json_result["report_date"] = date
-        json_result["range_date"] = range_data
-        if not isinstance(filtered_df, pd.DataFrame):
-            raise TypeError("Ожидается тип данных DataFrame")
-        for column in ["Сумма платежа", "Статус", "Категория"]:
-            if column not in filtered_df.columns:
-                raise ValueError("Переданный DataFrame не содержит необходимые, для обработки, поля")
-
-        # Сумма расходов
-        df_costs = filtered_df.loc[(filtered_df["Сумма платежа"] < 0) & (filtered_df["Статус"] == "OK")]
-        total_sum_costs = df_costs["Сумма платежа"].sum()
-        json_result["expenses"]["total_amount"] = round(abs(total_sum_costs))
-
-        # Основные расходы
-        df_main = df_costs.loc[~df_costs["Категория"].isin(["Наличные", "Переводы"])]
-        group_by_category_main = df_main.groupby(df_costs["Категория"])
-        sum_by_category_main = group_by_category_main["Сумма платежа"].sum().sort_values(ascending=True).head(7)
-        json_result["expenses"]["main"] = get_list_categories_with_amounts(sum_by_category_main)
-
-        # Переводы и наличные
-        df_transfer_cash = df_costs.loc[df_costs["Категория"].isin(["Наличные", "Переводы"])]
-        group_by_category_tc = df_transfer_cash.groupby(df_costs["Категория"])
-        sum_by_category_tc = group_by_category_tc["Сумма платежа"].sum().sort_values(ascending=True)
-        json_result["expenses"]["transfers_and_cash"] = get_list_categories_with_amounts(sum_by_category_tc)
-
-        # Сумма поступлений
-        df_receipt = filtered_df.loc[(filtered_df["Сумма платежа"] > 0) & (filtered_df["Статус"] == "OK")]
-        total_sum_receipt = df_receipt["Сумма платежа"].sum()
-        json_result["income"]["total_amount"] = round(total_sum_receipt)
-
-        # Поступления по категориям
-        group_by_category_receipt = df_receipt.groupby(df_receipt["Категория"])
-        sum_by_category_receipt = group_by_category_receipt["Сумма платежа"].sum().sort_values(ascending=False)
-        json_result["income"]["main"] = get_list_categories_with_amounts(sum_by_category_receipt)
-
-        # Валюта и акции
-        json_result["currency_rates"] = get_price_currencies_user(user_settings)
-        json_result["stock_prices"] = get_price_stocks_user(user_settings)
+        cache_key = get_view_cache_key("get_json_events", {"date": date, "range_data": range_data}, with_rates)
+        cached_result = view_cache.get(cache_key)
+        if cached_result is not None:
+            json_result.update(cached_result)
+        else:
+            if get_backend() == "sqlite":
+                from src.database import query_events_data
+
+                events_data = query_events_data(date, range_data)
+            else:
+                filtered_df = get_filtered_df(date=date, range_data=range_data, columns=EVENTS_COLUMNS)
+                events_data = get_events_data(filtered_df)
+            json_result["report_date"] = date
+            json_result["range_date"] = range_data
+            json_result.update(events_data)
+
+            # Валюта и акции
+            user_settings = load_user_settings() if with_rates else {}
+            if with_rates:
+                json_result["currency_rates"] = get_price_currencies_user(user_settings)
+                json_result["stock_prices"] = get_price_stocks_user(user_settings)
+            if _is_market_data_complete(user_settings, json_result):
+                view_cache.put(cache_key, dict(json_result))
 
     except TypeError as type_ex:
-        logger.error(f"{type_ex.__class__.__name__}: {type_ex}")
+        logger.error("%s: %s", type_ex.__class__.__name__, type_ex)
     except ValueError as val_ex:
-        logger.error(f"{val_ex.__class__.__name__}: {val_ex}")
+        logger.error("%s: %s", val_ex.__class__.__name__, val_ex)
     except Exception as ex:
-        logger.debug(f"{ex.__class__.__name__}: {ex}", exc_info=True)
+        logger.debug("%s: %s", ex.__class__.__name__, ex, exc_info=True)
     finally:
         filename = "events_info.json"
         save_result_in_json(filename=filename, json_obj=json_result)
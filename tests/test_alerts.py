@@ -0,0 +1,105 @@
+import json
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.alerts import BudgetTracker, append_operations
+from src.cache import APPLIED_HISTORY_SIZE
+
+
+def make_operations(rows):
+    return pd.DataFrame(rows, columns=["Дата операции", "Номер карты", "Статус", "Сумма платежа", "Категория"])
+
+
+@pytest.fixture
+def tracker():
+    return BudgetTracker({"Супермаркеты": 1000.0})
+
+
+def test_alerts_fire_once_per_threshold(tracker):
+    assert tracker.append(make_operations([("01.03.2021 10:00:00", "*7197", "OK", -500.0, "Супермаркеты")])) == []
+    warning = tracker.append(make_operations([("02.03.2021 10:00:00", "*4556", "OK", -350.0, "Супермаркеты")]))
+    assert len(warning) == 1
+    assert warning[0]["level"] == "warning"
+    assert warning[0]["total"] == 850.0
+    assert warning[0]["cards"] == {"*7197": 500.0, "*4556": 350.0}
+    exceeded = tracker.append(make_operations([("03.03.2021 10:00:00", None, "OK", -200.0, "Супермаркеты")]))
+    assert [alert["level"] for alert in exceeded] == ["exceeded"]
+    assert tracker.append(make_operations([("04.03.2021 10:00:00", "*7197", "OK", -10.0, "Супермаркеты")])) == []
+
+
+def test_alerts_use_expense_rules(tracker):
+    operations = make_operations(
+        [
+            ("01.03.2021 10:00:00", "*7197", "FAILED", -5000.0, "Супермаркеты"),
+            ("01.03.2021 11:00:00", "*7197", "OK", 5000.0, "Супермаркеты"),
+            ("01.04.2021 11:00:00", "*7197", "OK", -900.0, "Супермаркеты"),
+            ("01.03.2021 12:00:00", "*7197", "OK", -900.0, "Переводы"),
+        ]
+    )
+    alerts = tracker.append(operations)
+    assert [(alert["month"], alert["category"]) for alert in alerts] == [("2021-04", "Супермаркеты")]
+    assert tracker.totals[("2021-03", "Переводы")] == {"*7197": 900.0}
+
+
+def test_tracker_state_roundtrip(tracker):
+    tracker.append(make_operations([("01.03.2021 10:00:00", "*7197", "OK", -900.0, "Супермаркеты")]))
+    restored = BudgetTracker.from_dict(tracker.to_dict())
+    assert restored.totals == tracker.totals
+    new_rows = make_operations([("05.03.2021 10:00:00", "*7197", "OK", -100.0, "Супермаркеты")])
+    assert [alert["level"] for alert in restored.append(new_rows)] == ["exceeded"]
+
+
+def test_tracker_keeps_only_recent_months(tracker):
+    tracker.append(make_operations([("01.01.2021 10:00:00", "*7197", "OK", -1000.0, "Супермаркеты")]))
+    tracker.append(make_operations([("01.02.2021 10:00:00", "*7197", "OK", -100.0, "Супермаркеты")]))
+    assert set(tracker.totals) == {("2021-01", "Супермаркеты"), ("2021-02", "Супермаркеты")}
+    assert tracker.append(make_operations([("01.03.2021 10:00:00", "*7197", "OK", -100.0, "Супермаркеты")])) == []
+    assert set(tracker.totals) == {("2021-02", "Супермаркеты"), ("2021-03", "Супермаркеты")}
+    assert tracker.to_dict()["fired"] == []
+    # Операции за месяц, который больше не хранится, не учитываются
+    assert tracker.append(make_operations([("02.01.2021 10:00:00", "*7197", "OK", -5.0, "Супермаркеты")])) == []
+    assert ("2021-01", "Супермаркеты") not in tracker.totals
+
+
+def test_append_operations_keeps_recent_fingerprints(tmp_path):
+    state_file = str(tmp_path / "alerts_state.json")
+    batches = [
+        make_operations([("01.03.2021 10:00:00", "*7197", "OK", -float(number), "Супермаркеты")])
+        for number in range(1, APPLIED_HISTORY_SIZE + 2)
+    ]
+    with patch("src.alerts.get_df_operations", return_value=make_operations([])):
+        for batch in batches:
+            append_operations(batch, {}, state_file)
+        assert append_operations(batches[-1], {"Супермаркеты": 1.0}, state_file) == []
+    with open(state_file, encoding="UTF-8") as file:
+        assert len(json.load(file)["applied"]) == APPLIED_HISTORY_SIZE
+
+
+def test_append_operations_builds_state_once(tmp_path):
+    state_file = str(tmp_path / "alerts_state.json")
+    history = make_operations([("01.03.2021 10:00:00", "*7197", "OK", -900.0, "Супермаркеты")])
+    new_rows = make_operations([("05.03.2021 10:00:00", "*7197", "OK", -100.0, "Супермаркеты")])
+    with patch("src.alerts.get_df_operations", return_value=history) as mock_history:
+        assert append_operations(new_rows.iloc[:0], {"Супермаркеты": 1000.0}, state_file) == []
+        alerts = append_operations(new_rows, {"Супермаркеты": 1000.0}, state_file)
+    mock_history.assert_called_once()
+    assert [alert["level"] for alert in alerts] == ["exceeded"]
+
+
+def test_append_operations_skips_repeated_batches_and_rebuilds_on_new_data(tmp_path):
+    state_file = str(tmp_path / "alerts_state.json")
+    history = make_operations([("01.03.2021 10:00:00", "*7197", "OK", -700.0, "Супермаркеты")])
+    new_rows = make_operations([("05.03.2021 10:00:00", "*7197", "OK", -100.0, "Супермаркеты")])
+    limits = {"Супермаркеты": 1000.0}
+    with patch("src.alerts.get_df_operations", return_value=history) as mock_history:
+        with patch("src.alerts.get_data_version", return_value="v1"):
+            assert [alert["level"] for alert in append_operations(new_rows, limits, state_file)] == ["warning"]
+            assert append_operations(new_rows.copy(), limits, state_file) == []
+            assert append_operations(new_rows, {"Супермаркеты": 850.0}, state_file) == []
+        assert mock_history.call_count == 1
+        with patch("src.alerts.get_data_version", return_value="v2"):
+            alerts = append_operations(new_rows, {"Супермаркеты": 800.0}, state_file)
+        assert mock_history.call_count == 2
+    assert [(alert["level"], alert["total"]) for alert in alerts] == [("exceeded", 800.0)]
@@ -0,0 +1,88 @@
+import json
+from functools import partial
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src import reports, services, views
+from src.cache import view_cache
+from src.config import get_backend
+from src.database import _regexp_i, query_by_description, query_report_window
+from src.files import get_df_operations
+from src.main import CASHBACK_COLUMNS, REPORT_COLUMNS
+
+DATE = "2020-09-22 11:11:11"
+
+
+def cashback_case(year, month):
+    data = None if get_backend() == "sqlite" else get_df_operations(columns=CASHBACK_COLUMNS)
+    services.categories_of_increased_cashback(data, year, month)
+
+
+CASES = {
+    "dashboard": partial(views.get_json_dashboard_info, DATE, with_rates=False),
+    "dashboard_year_start": partial(views.get_json_dashboard_info, "2021-01-03 08:00:00", with_rates=False),
+    "events_week": partial(views.get_json_events, DATE, "W", with_rates=False),
+    "events_month": partial(views.get_json_events, DATE, "M", with_rates=False),
+    "events_year": partial(views.get_json_events, DATE, "Y", with_rates=False),
+    "events_all": partial(views.get_json_events, DATE, "ALL", with_rates=False),
+    "simple_search": partial(services.simple_search, "магнит"),
+    "simple_search_regex": partial(services.simple_search, "^кофе"),
+    "search_by_phone_number": services.search_by_phone_number,
+    "search_for_transfers_to_individuals": services.search_for_transfers_to_individuals,
+    "cashback": partial(cashback_case, 2021, 11),
+    "cashback_december": partial(cashback_case, 2021, 12),
+    "cashback_empty_month": partial(cashback_case, 2017, 1),
+}
+
+REPORTS = {
+    "category": partial(reports.spending_by_category, category="Супермаркеты"),
+    "weekday": reports.spending_by_weekday,
+    "workday": reports.spending_workday_weekend,
+}
+
+
+@pytest.fixture(scope="module")
+def db_path(tmp_path_factory):
+    return str(tmp_path_factory.mktemp("db") / "operations.sqlite")
+
+
+def run_with_backend(backend, case, db_path, monkeypatch):
+    monkeypatch.setenv("OPERATIONS_BACKEND", backend)
+    monkeypatch.setenv("OPERATIONS_DB", db_path)
+    view_cache.clear()
+    with patch("src.views.save_result_in_json") as mock_views, patch("src.services.save_result_in_json") as mock_services:
+        case()
+    mock_save = mock_views if mock_views.called else mock_services
+    result = mock_save.call_args.kwargs["json_obj"]
+    result.pop("greeting", None)
+    return result
+
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_sqlite_backend_matches_pandas(name, db_path, monkeypatch):
+    expected = run_with_backend("pandas", CASES[name], db_path, monkeypatch)
+    result = run_with_backend("sqlite", CASES[name], db_path, monkeypatch)
+    # Результаты сравниваются в том виде, в котором записываются в файл (NaN != NaN в словарях)
+    assert json.dumps(result, ensure_ascii=False) == json.dumps(expected, ensure_ascii=False)
+
+
+def test_search_is_case_insensitive_for_cyrillic(db_path, monkeypatch):
+    monkeypatch.setenv("OPERATIONS_DB", db_path)
+    assert _regexp_i("магнит", "МАГНИТ")
+    lower_result = query_by_description("магнит", case=False)
+    assert not lower_result.empty
+    assert lower_result.equals(query_by_description("МАГНИТ", case=False))
+    assert len(query_by_description("магнит")) <= len(lower_result)
+
+
+@pytest.mark.parametrize("date", [DATE, "2021-12-31 23:59:59", "2018-01-02 00:00:00"])
+@pytest.mark.parametrize("name", list(REPORTS))
+def test_sqlite_report_window_matches_pandas(name, date, db_path, monkeypatch):
+    monkeypatch.setenv("OPERATIONS_DB", db_path)
+    category = "Супермаркеты" if name == "category" else None
+    with patch.object(pd.DataFrame, "to_excel"):
+        expected = REPORTS[name](df=get_df_operations(columns=REPORT_COLUMNS), date=date)
+        result = REPORTS[name](df=query_report_window(date, REPORT_COLUMNS, category=category), date=date)
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True))
@@ -0,0 +1,145 @@
+from unittest.mock import Mock, patch
+
+import pandas as pd
+import pytest
+
+from benchmarks.generator import generate_operations
+from src.batch import build_card_statements, get_valid_profiles, run_batch_dashboards, run_batch_statements
+from src.dates import parse_operation_dates
+from src.views import DASHBOARD_COLUMNS, get_dashboard_data
+
+
+@pytest.fixture
+def profiles():
+    return [
+        {"user_id": "alice", "user_currencies": ["USD"], "user_stocks": ["TSLA"]},
+        {"user_id": "bob", "user_currencies": ["EUR", "USD"], "user_stocks": ["AAPL"], "cards": ["*7197"]},
+        {"user_id": "../evil", "user_currencies": ["USD"]},
+    ]
+
+
+def fake_get(url, params=None):
+    response = Mock()
+    response.status_code = 200
+    if params:
+        response.json.return_value = {"data": [{"symbol": s, "last": 1.0} for s in params["symbols"].split(",")]}
+    else:
+        response.json.return_value = {"Valute": {"USD": {"Value": 75.0}, "EUR": {"Value": 88.0}}}
+    return response
+
+
+@patch("src.batch.save_result_in_json")
+@patch("requests.get", side_effect=fake_get)
+def test_run_batch_dashboards_fetches_market_data_once(mock_get, mock_save, profiles):
+    run_batch_dashboards("2020-09-22 11:11:11", profiles, range_data="Y")
+    assert mock_get.call_count == 2
+    assert mock_get.call_args_list[1].args[1]["symbols"] == "TSLA,AAPL"
+    saved = {call.kwargs["filename"]: call.kwargs["json_obj"] for call in mock_save.call_args_list}
+    assert sorted(saved) == [
+        "events_info_alice.json",
+        "events_info_bob.json",
+        "main_info_alice.json",
+        "main_info_bob.json",
+    ]
+    assert saved["main_info_bob.json"]["currency_rates"] == [
+        {"currency": "EUR", "rate": 88.0},
+        {"currency": "USD", "rate": 75.0},
+    ]
+    assert saved["main_info_alice.json"]["stock_prices"] == [{"stock": "TSLA", "price": 1.0}]
+    assert [card["last_digits"] for card in saved["main_info_bob.json"]["cards"]] == ["7197"]
+    assert len(saved["main_info_alice.json"]["cards"]) > 1
+
+
+@patch("src.batch.save_result_in_json", side_effect=[True, True, False, True])
+@patch("requests.get")
+def test_run_batch_dashboards_without_rates(mock_get, mock_save, profiles):
+    assert run_batch_dashboards("2020-09-22 11:11:11", profiles, with_rates=False, max_workers=1) == 3
+    mock_get.assert_not_called()
+    assert mock_save.call_count == 4
+
+
+def test_get_valid_profiles_rejects_duplicates_and_bad_cards():
+    profiles = [
+        {"user_id": "alice"},
+        {"user_id": "bob", "cards": "*7197"},
+        {"user_id": "carol", "cards": ["*7197", 4556]},
+        {"user_id": "dave", "cards": ["*7197"]},
+        {"user_id": "erin"},
+        {"user_id": "erin", "cards": ["*4556"]},
+    ]
+    assert [profile["user_id"] for profile in get_valid_profiles(profiles)] == ["alice", "dave"]
+
+
+@patch("src.batch.save_result_in_json")
+def test_run_batch_dashboards_incorrect_profiles(mock_save):
+    run_batch_dashboards("2020-09-22 11:11:11", "incorrect")
+    mock_save.assert_not_called()
+
+
+@pytest.fixture
+def operations():
+    return pd.DataFrame(
+        [
+            ("03.03.2021 10:00:00", "*7197", "OK", -100.0, "Супермаркеты", "Магнит"),
+            ("04.03.2021 10:00:00", "*7197", "OK", -300.0, "Фастфуд", "KFC"),
+            ("05.03.2021 10:00:00", "*7197", "OK", -300.0, "Супермаркеты", "Лента"),
+            ("06.03.2021 10:00:00", "*7197", "FAILED", -900.0, "Супермаркеты", "Лента"),
+            ("07.03.2021 10:00:00", "*7197", "OK", 500.0, "Пополнения", "Пополнение"),
+            ("01.04.2021 10:00:00", "*7197", "OK", -50.0, "Фастфуд", "KFC"),
+            ("02.03.2021 10:00:00", "*4556", "OK", -70.0, "Фастфуд", "KFC"),
+            ("02.03.2021 11:00:00", None, "OK", -70.0, "Фастфуд", "KFC"),
+            ("08.03.2021 10:00:00", "*7197", "OK", -20.0, None, "Перевод"),
+        ],
+        columns=DASHBOARD_COLUMNS,
+    )
+
+
+def test_build_card_statements(operations):
+    statements = build_card_statements(operations, top_n=2)
+    assert [(item["last_digits"], item["month"], item["operations"]) for item in statements] == [
+        ("4556", "2021-03", 1),
+        ("7197", "2021-03", 5),
+        ("7197", "2021-04", 1),
+    ]
+    march = statements[1]
+    assert (march["total_spent"], march["cashback"], march["income"]) == (720.0, 7.2, 500.0)
+    assert [item["description"] for item in march["top_transactions"]] == ["KFC", "Лента"]
+    assert march["categories"] == [
+        {"category": "Супермаркеты", "amount": 400.0},
+        {"category": "Фастфуд", "amount": 300.0},
+        {"category": "Без категории", "amount": 20.0},
+    ]
+    assert sum(item["amount"] for item in march["categories"]) == march["total_spent"]
+
+
+def test_build_card_statements_match_dashboard():
+    df = generate_operations(3000, seed=5)
+    statements = build_card_statements(df)
+    for statement in statements[:: max(len(statements) // 10, 1)]:
+        dates = parse_operation_dates(df["Дата операции"])
+        card_df = df.assign(**{"Дата операции": dates}).loc[
+            (df["Номер карты"] == "*" + statement["last_digits"])
+            & (dates.dt.strftime("%Y-%m") == statement["month"])
+            & (df["Сумма платежа"] < 0)
+            & (df["Статус"] == "OK")
+        ]
+        dashboard = get_dashboard_data(card_df)
+        assert statement["top_transactions"] == dashboard["top_transactions"]
+        assert [statement["total_spent"], statement["cashback"]] == [
+            dashboard["cards"][0]["total_spent"],
+            dashboard["cards"][0]["cashback"],
+        ]
+
+
+@patch("src.batch.save_result_in_json", return_value=True)
+def test_run_batch_statements(mock_save, operations):
+    with patch("src.batch.get_df_operations", return_value=operations):
+        assert run_batch_statements(max_workers=2) == 3
+    filenames = sorted(call.kwargs["filename"] for call in mock_save.call_args_list)
+    assert filenames == ["statement_4556_2021-03.json", "statement_7197_2021-03.json", "statement_7197_2021-04.json"]
+
+
+@patch("src.batch.save_result_in_json", side_effect=[True, False, True])
+def test_run_batch_statements_counts_successful_writes(mock_save, operations):
+    with patch("src.batch.get_df_operations", return_value=operations):
+        assert run_batch_statements(max_workers=1) == 2
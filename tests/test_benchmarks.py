@@ -0,0 +1,29 @@
+import pandas as pd
+
+from benchmarks.generator import COLUMNS, generate_operations
+from benchmarks.run import check_coverage, compare_with_baselines, get_cases
+
+
+def test_generate_operations_schema():
+    df = generate_operations(1000)
+    assert list(df.columns) == COLUMNS
+    assert len(df) == 1000
+    dates = pd.to_datetime(df["Дата операции"], format="%d.%m.%Y %H:%M:%S")
+    assert dates.is_monotonic_decreasing
+    assert set(df["Статус"]) <= {"OK", "FAILED"}
+
+
+def test_generate_operations_is_seeded():
+    pd.testing.assert_frame_equal(generate_operations(500, seed=1), generate_operations(500, seed=1))
+    assert not generate_operations(500, seed=1).equals(generate_operations(500, seed=2))
+
+
+def test_every_public_function_is_benchmarked():
+    assert check_coverage(get_cases()) == []
+
+
+def test_compare_with_baselines():
+    baselines = {"10k": {"a": 1.0, "b": 1.0}}
+    regressions = compare_with_baselines("10k", {"a": 1.2, "b": 2.0, "c": 5.0}, baselines, 1.5)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("10k b:")
@@ -0,0 +1,108 @@
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.cache import (ResultCache, get_data_version, get_frame_fingerprint, get_market_snapshot_id, make_cache_key,
+                       remember_fingerprint, view_cache)
+from src.files import save_result_in_json
+from src.views import get_json_dashboard_info, get_json_events, get_view_cache_key
+
+
+@pytest.fixture(autouse=True)
+def clear_view_cache():
+    view_cache.clear()
+    yield
+    view_cache.clear()
+
+
+def test_result_cache_evicts_least_recently_used():
+    cache = ResultCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_result_cache_disk_layer(tmp_path):
+    ResultCache(cache_dir=str(tmp_path)).put("key", {"cards": [1, 2]})
+    cache = ResultCache(cache_dir=str(tmp_path))
+    assert cache.get("key") == {"cards": [1, 2]}
+    assert cache.get("missing") is None
+
+
+def test_make_cache_key_normalizes_params():
+    key = make_cache_key("view", {"a": 1, "b": 2}, "v1", "none")
+    assert key == make_cache_key("view", {"b": 2, "a": 1}, "v1", "none")
+    assert key != make_cache_key("view", {"a": 1, "b": 2}, "v2", "none")
+    assert key != make_cache_key("view", {"a": 1, "b": 2}, "v1", "2024-01-01 10")
+
+
+def test_frame_fingerprint():
+    df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+    assert get_frame_fingerprint(df, ["a", "b"]) == get_frame_fingerprint(df.copy(), ["a", "b"])
+    assert get_frame_fingerprint(df, ["a", "b"]) != get_frame_fingerprint(df.iloc[::-1], ["a", "b"])
+    assert get_frame_fingerprint(df, ["a", "b"]) != get_frame_fingerprint(df.iloc[:1], ["a", "b"])
+
+
+def test_remember_fingerprint_keeps_latest():
+    applied: list[str] = []
+    for fingerprint in ["a", "b", "c"]:
+        remember_fingerprint(applied, fingerprint, maxsize=2)
+    assert applied == ["b", "c"]
+
+
+def test_data_version_changes_with_file(tmp_path, monkeypatch):
+    file_path = tmp_path / "operations.csv"
+    file_path.write_text("a\n1\n")
+    monkeypatch.setenv("OPERATIONS_FILE", str(file_path))
+    version = get_data_version()
+    file_path.write_text("a\n1\n2\n")
+    assert get_data_version() != version
+    assert get_market_snapshot_id(False) == "none"
+
+
+@patch("src.views.save_result_in_json")
+def test_dashboard_served_from_cache(mock_save):
+    get_json_dashboard_info("2020-09-22 11:11:11", with_rates=False)
+    with patch("src.views.get_df_by_interval") as mock_interval:
+        get_json_dashboard_info("2020-09-22 11:11:11", with_rates=False)
+    mock_interval.assert_not_called()
+    first, second = (call.kwargs["json_obj"] for call in mock_save.call_args_list)
+    assert first == second
+    assert first["cards"]
+
+
+@patch("src.views.save_result_in_json")
+@patch("src.views.get_price_stocks_user", return_value=[])
+@patch("src.views.get_price_currencies_user", return_value=[])
+def test_failed_market_data_not_cached(mock_currencies, mock_stocks, mock_save):
+    get_json_events("2020-09-22 11:11:11", "M", with_rates=True)
+    get_json_events("2020-09-22 11:11:11", "M", with_rates=True)
+    assert mock_currencies.call_count == 2
+    assert len(view_cache) == 0
+
+
+def test_view_cache_key_includes_backend(monkeypatch):
+    monkeypatch.setenv("OPERATIONS_BACKEND", "pandas")
+    key = get_view_cache_key("get_json_events", {}, False)
+    monkeypatch.setenv("OPERATIONS_BACKEND", "sqlite")
+    assert get_view_cache_key("get_json_events", {}, False) != key
+
+
+def test_save_result_skips_unchanged(tmp_path, monkeypatch):
+    (tmp_path / "results").mkdir()
+    monkeypatch.setattr("src.files.PATH_PROJECT", str(tmp_path))
+    save_result_in_json("result.json", {"a": 1})
+    file_path = tmp_path / "results" / "result.json"
+    mtime = file_path.stat().st_mtime_ns
+    with patch("src.files.open", side_effect=open) as mock_open:
+        save_result_in_json("result.json", {"a": 1})
+    assert all(call.args[1:2] != ("w",) for call in mock_open.call_args_list)
+    assert file_path.stat().st_mtime_ns == mtime
+    save_result_in_json("result.json", {"a": 2})
+    assert '"a": 2' in file_path.read_text(encoding="UTF-8")
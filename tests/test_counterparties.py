@@ -0,0 +1,101 @@
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.cache import APPLIED_HISTORY_SIZE
+from src.counterparties import CounterpartyLedger, normalize_phone, update_counterparty_ledger
+
+
+def make_operations(rows):
+    return pd.DataFrame(rows, columns=["Дата операции", "Статус", "Сумма платежа", "Категория", "Описание"])
+
+
+@pytest.fixture
+def operations():
+    return make_operations(
+        [
+            ("01.03.2021 10:00:00", "OK", -500.0, "Переводы", "Иван С."),
+            ("15.03.2021 10:00:00", "OK", -300.0, "Переводы", "Иван С."),
+            ("02.01.2020 10:00:00", "OK", -1000.0, "Переводы", "Иван С."),
+            ("03.03.2021 10:00:00", "FAILED", -700.0, "Переводы", "Иван С."),
+            ("04.03.2021 10:00:00", "OK", 900.0, "Переводы", "Иван С."),
+            ("05.03.2021 10:00:00", "OK", -200.0, "Переводы", "Перевод +7 921 111-22-33"),
+            ("06.03.2021 10:00:00", "OK", -100.0, "Мобильная связь", "МТС +7 921 111-22-33"),
+            ("07.03.2021 10:00:00", "OK", -50.0, "Переводы", "Перевод на карту"),
+        ]
+    )
+
+
+def test_normalize_phone():
+    assert normalize_phone("8 (921) 111-22-33") == "79211112233"
+    assert normalize_phone("Иван С.") == ""
+
+
+def test_ledger_summaries(operations):
+    ledger = CounterpartyLedger()
+    assert ledger.append(operations) == 4
+    entry = ledger.get(" иван   с. ")
+    assert entry is not None
+    assert (entry["total"], entry["count"]) == (1800.0, 3)
+    assert (entry["first_date"], entry["last_date"]) == ("2020-01-02", "2021-03-15")
+    assert entry["monthly"] == {"2020-01": 1000.0, "2021-03": 800.0}
+    assert ledger.sent("Иван С.", 2021) == 800.0
+    assert ledger.sent("8 921 111 22 33") == 200.0
+    assert ledger.get("Пётр П.") is None
+
+
+def test_ledger_merges_phone_spellings():
+    ledger = CounterpartyLedger()
+    ledger.append(
+        make_operations(
+            [
+                ("05.03.2021 10:00:00", "OK", -200.0, "Переводы", "Перевод +7 921 111-22-33"),
+                ("06.03.2021 10:00:00", "OK", -300.0, "Переводы", "Перевод 8 921 111 22 33"),
+            ]
+        )
+    )
+    assert list(ledger.counterparties) == ["+79211112233"]
+    assert ledger.sent("+79211112233") == ledger.sent("8 (921) 111-22-33") == 500.0
+
+
+def test_ledger_append_is_incremental(operations):
+    ledger = CounterpartyLedger()
+    ledger.append(operations.iloc[:2])
+    ledger.append(operations.iloc[2:])
+    full = CounterpartyLedger()
+    full.append(operations)
+    assert ledger.to_records() == full.to_records()
+    restored = CounterpartyLedger.from_dict(ledger.to_dict())
+    assert restored.to_records() == full.to_records()
+    assert restored.sent("+79211112233") == 200.0
+
+
+def test_update_counterparty_ledger_rebuilds_on_new_data_version(operations, tmp_path):
+    state_file = str(tmp_path / "counterparties_state.json")
+    new_rows = make_operations([("20.03.2021 10:00:00", "OK", -100.0, "Переводы", "Иван С.")])
+    with patch("src.counterparties.get_df_operations", return_value=operations) as mock_history:
+        with patch("src.counterparties.get_data_version", return_value="v1"):
+            update_counterparty_ledger(file_path=state_file)
+            update_counterparty_ledger(new_rows, file_path=state_file)
+            ledger = update_counterparty_ledger(new_rows.copy(), file_path=state_file)
+            assert mock_history.call_count == 1
+            assert ledger.sent("Иван С.") == 1900.0
+        with patch("src.counterparties.get_data_version", return_value="v2"):
+            ledger = update_counterparty_ledger(file_path=state_file)
+    assert mock_history.call_count == 2
+    assert ledger.sent("Иван С.") == 1800.0
+
+
+def test_update_counterparty_ledger_keeps_recent_fingerprints(tmp_path):
+    state_file = str(tmp_path / "counterparties_state.json")
+    batches = [
+        make_operations([("20.03.2021 10:00:00", "OK", -float(number), "Переводы", "Иван С.")])
+        for number in range(1, APPLIED_HISTORY_SIZE + 2)
+    ]
+    with patch("src.counterparties.get_df_operations", return_value=make_operations([])):
+        for batch in batches:
+            update_counterparty_ledger(batch, file_path=state_file)
+        ledger = update_counterparty_ledger(batches[-1], file_path=state_file)
+    assert len(ledger.applied) == APPLIED_HISTORY_SIZE
+    assert ledger.get("Иван С.")["count"] == APPLIED_HISTORY_SIZE + 1
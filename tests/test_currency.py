@@ -0,0 +1,97 @@
+from datetime import date
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.currency import convert_operations, fetch_rates_for_date, load_rate_table, update_rate_table
+
+
+@pytest.fixture
+def rate_table():
+    return pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2023-06-01", "2023-06-01", "2023-06-03", "2023-06-03"]),
+            "currency": ["USD", "EUR", "USD", "EUR"],
+            "rate": [80.0, 90.0, 82.0, 91.0],
+        }
+    )
+
+
+@pytest.fixture
+def operations():
+    return pd.DataFrame(
+        {
+            "Дата операции": ["02.06.2023 10:00:00", "03.06.2023 12:00:00", "01.06.2023 09:00:00", "31.05.2023 09:00:00"],
+            "Сумма операции": [-10.0, -20.0, -500.0, -5.0],
+            "Валюта операции": ["USD", "EUR", "RUB", "USD"],
+            "Сумма платежа": [-800.0, -1820.0, -500.0, -400.0],
+            "Валюта платежа": ["RUB", "RUB", "RUB", "RUB"],
+        }
+    )
+
+
+def test_convert_operations_to_rub(operations, rate_table):
+    result = convert_operations(operations, "RUB", rate_table)
+    np.testing.assert_array_equal(result["Сумма операции (RUB)"].to_numpy()[:3], [-800.0, -1820.0, -500.0])
+    assert np.isnan(result["Сумма операции (RUB)"].iloc[3])
+    assert "Сумма операции (RUB)" not in operations.columns
+
+
+def test_convert_operations_to_usd_replace(operations, rate_table):
+    result = convert_operations(operations, "USD", rate_table, replace=True)
+    assert result["Сумма платежа"].iloc[0] == -10.0
+    assert result["Сумма платежа"].iloc[1] == round(-1820.0 / 82.0, 2)
+    assert result["Сумма операции"].iloc[1] == round(-20.0 * 91.0 / 82.0, 2)
+    assert (result["Валюта платежа"] == "USD").all()
+
+
+def test_update_rate_table_fetches_only_missing_days(tmp_path, rate_table):
+    rates_file = str(tmp_path / "rates.csv")
+    rate_table.to_csv(rates_file, index=False)
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {"Valute": {"USD": {"Nominal": 1, "Value": 81.0}, "TRY": {"Nominal": 10, "Value": 35.0}}}
+    with patch("requests.get", return_value=response) as mock_get:
+        result = update_rate_table(date(2023, 6, 1), date(2023, 6, 3), rates_file)
+    mock_get.assert_called_once_with("https://www.cbr-xml-daily.ru/archive/2023/06/02/daily_json.js")
+    saved = load_rate_table(rates_file)
+    assert len(saved) == len(result) == 7
+    assert saved.loc[saved["currency"] == "TRY", "rate"].iloc[0] == 3.5
+
+
+@patch("requests.get")
+def test_fetch_rates_for_date_missing_day(mock_get):
+    mock_get.return_value = Mock(status_code=404)
+    assert fetch_rates_for_date(date(2023, 6, 4)) == []
+
+
+def test_update_rate_table_records_days_without_rates(tmp_path):
+    rates_file = str(tmp_path / "rates.csv")
+    responses = {
+        "2023/06/03": Mock(status_code=404),
+        "2023/06/04": Mock(status_code=500),
+    }
+    with patch("requests.get", side_effect=lambda url: responses[url.split("archive/")[1][:10]]):
+        update_rate_table(date(2023, 6, 3), date(2023, 6, 4), rates_file)
+    with patch("requests.get", return_value=Mock(status_code=404)) as mock_get:
+        update_rate_table(date(2023, 6, 3), date(2023, 6, 4), rates_file)
+    mock_get.assert_called_once_with("https://www.cbr-xml-daily.ru/archive/2023/06/04/daily_json.js")
+    assert load_rate_table(rates_file)["date"].dt.day.tolist() == [3, 4]
+
+
+def test_update_rate_table_refetches_unpublished_days(tmp_path):
+    rates_file = str(tmp_path / "rates.csv")
+    today = date.today()
+    with patch("requests.get", return_value=Mock(status_code=404)) as mock_get:
+        update_rate_table(today, today, rates_file)
+        update_rate_table(today, today, rates_file)
+    assert mock_get.call_count == 2
+    assert load_rate_table(rates_file).empty
+
+
+@patch("requests.get")
+def test_fetch_rates_for_date_connection_error(mock_get):
+    mock_get.return_value = Mock(status_code=500)
+    assert fetch_rates_for_date(date(2023, 6, 4)) is None
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.dates import USER_DATE_FORMAT, _parse_user_date, parse_date, parse_dates, parse_operation_dates
+
+
+def test_parse_date_is_memoized():
+    _parse_user_date.cache_clear()
+    assert parse_date("2021-10-22 11:11:11") == datetime(2021, 10, 22, 11, 11, 11)
+    assert parse_date("2021-10-22 11:11:11") == datetime(2021, 10, 22, 11, 11, 11)
+    assert _parse_user_date.cache_info().hits == 1
+
+
+@pytest.mark.parametrize(
+    "date, exception", [(2021, TypeError), ("2021-10-22", ValueError), ("2021-13-01 00:00:00", ValueError)]
+)
+def test_parse_date_incorrect(date, exception):
+    with pytest.raises(exception):
+        parse_date(date)
+
+
+def test_parse_dates_returns_invalid_mask():
+    parsed, invalid = parse_dates(["01.06.2023 10:00:00", "bad", None, "31.02.2023 00:00:00"])
+    assert parsed[0] == pd.Timestamp(2023, 6, 1, 10)
+    np.testing.assert_array_equal(invalid, [False, True, True, True])
+
+
+def test_parse_dates_user_format():
+    parsed, invalid = parse_dates(pd.Series(["2023-06-01 10:00:00", "2023-06-01"]), USER_DATE_FORMAT)
+    assert parsed[0] == pd.Timestamp(2023, 6, 1, 10)
+    np.testing.assert_array_equal(invalid, [False, True])
+
+
+def test_parse_operation_dates_keeps_parsed_dates():
+    dates = pd.Series(pd.to_datetime(["2023-06-01", "2023-06-02"]))
+    assert parse_operation_dates(dates) is dates
@@ -0,0 +1,80 @@
+import json
+import os
+import tracemalloc
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.decorators import instrumented
+from src.metrics import clear_metrics, get_metrics, measure
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    clear_metrics()
+    yield
+    clear_metrics()
+    tracemalloc.stop()
+
+
+@instrumented()
+def filter_negative(df: pd.DataFrame) -> pd.DataFrame:
+    return df[df["Сумма платежа"] < 0]
+
+
+@pytest.fixture
+def payments():
+    return pd.DataFrame({"Сумма платежа": [-10.0, 20.0, -30.0]})
+
+
+def test_instrumented_records_rows_and_time(payments):
+    result = filter_negative(payments)
+    assert len(result) == 2
+    [metric] = get_metrics("filter_negative")
+    assert metric["rows_in"] == 3
+    assert metric["rows_out"] == 2
+    assert metric["wall_s"] >= 0
+    assert metric["cpu_s"] >= 0
+    assert "peak_memory_kb" not in metric
+    assert metric["memory_source"] == "maxrss" and "process_max_rss_kb" in metric
+
+
+def test_measure_logs_only_when_metrics_enabled(tmp_path):
+    with patch("src.metrics.logger") as mock_logger:
+        with measure("block"):
+            pass
+        mock_logger.debug.assert_not_called()
+        with patch.dict(os.environ, {"METRICS_FILE": str(tmp_path / "metrics.jsonl")}):
+            with measure("block"):
+                pass
+        mock_logger.debug.assert_called_once()
+
+
+def test_measure_writes_json_lines(tmp_path):
+    metrics_file = tmp_path / "metrics.jsonl"
+    with patch.dict(os.environ, {"METRICS_FILE": str(metrics_file)}):
+        with measure("block", rows_in=5) as metric:
+            metric["rows_out"] = 1
+    [line] = metrics_file.read_text(encoding="UTF-8").splitlines()
+    assert json.loads(line)["name"] == "block"
+    assert json.loads(line)["rows_out"] == 1
+
+
+def test_measure_nested_tracemalloc_peaks():
+    with patch.dict(os.environ, {"METRICS_TRACEMALLOC": "1"}):
+        with measure("outer"):
+            with measure("inner"):
+                data = [0] * 100_000
+            del data
+    inner, outer = get_metrics()
+    assert inner["memory_source"] == "tracemalloc"
+    assert outer["peak_memory_kb"] >= inner["peak_memory_kb"] > 0
+
+
+def test_profile_mode_dumps_profile(tmp_path, payments):
+    with patch.dict(os.environ, {"PROFILE_FUNC": "filter_negative"}), patch("src.metrics.PROFILE_DIR", str(tmp_path)):
+        filter_negative(payments)
+    names = os.listdir(tmp_path)
+    assert any(name.endswith(".prof") for name in names)
+    assert any(name.endswith("_memory.txt") for name in names)
@@ -0,0 +1,53 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.dates import parse_operation_dates
+from src.files import get_reader_engines, read_operations_file
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    file_path = tmp_path / "operations.csv"
+    pd.DataFrame({"Описание": ["Магнит", "Магнит"], "Сумма платежа": [-10, -20]}).to_csv(file_path, index=False)
+    return str(file_path)
+
+
+def test_get_reader_engines():
+    assert get_reader_engines(".csv")[-1] == "c"
+    assert get_reader_engines(".XLSX")[-1] == "openpyxl"
+    assert get_reader_engines(".json") == []
+
+
+def test_read_operations_file_declared_dtypes(csv_file):
+    df = read_operations_file(csv_file, engine="c")
+    assert isinstance(df["Описание"].dtype, pd.CategoricalDtype)
+    assert df["Сумма платежа"].dtype == "float64"
+
+
+def test_read_operations_file_falls_back_to_next_engine(csv_file):
+    with patch("src.files.get_reader_engines", return_value=["missing", "c"]):
+        df = read_operations_file(csv_file, columns=["Сумма платежа"])
+    assert df["Сумма платежа"].tolist() == [-10.0, -20.0]
+
+
+def test_read_operations_file_without_engines(tmp_path):
+    with pytest.raises(ValueError):
+        read_operations_file(str(tmp_path / "operations.json"))
+
+
+def test_read_operations_file_formats_native_excel_dates(tmp_path):
+    file_path = str(tmp_path / "operations.xlsx")
+    pd.DataFrame(
+        {
+            "Дата операции": [datetime(2021, 3, 1, 10, 0, 5), datetime(2021, 3, 2)],
+            "Дата платежа": [datetime(2021, 3, 1), None],
+            "Сумма платежа": [-10.0, -20.0],
+        }
+    ).to_excel(file_path, index=False)
+    df = read_operations_file(file_path)
+    assert df["Дата операции"].tolist() == ["01.03.2021 10:00:05", "02.03.2021 00:00:00"]
+    assert df["Дата платежа"].tolist()[0] == "01.03.2021" and pd.isna(df["Дата платежа"].tolist()[1])
+    assert parse_operation_dates(df["Дата операции"]).notna().all()
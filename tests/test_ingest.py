@@ -0,0 +1,99 @@
+import pandas as pd
+import pytest
+
+from benchmarks.generator import generate_operations
+from src.ingest import OPERATIONS_COLUMNS, ingest_directory, normalize_schema
+
+
+@pytest.fixture
+def operations():
+    return generate_operations(60, seed=3)
+
+
+def test_normalize_schema(operations):
+    raw = operations[list(reversed(OPERATIONS_COLUMNS))].drop(columns=["MCC"]).head(3)
+    raw = raw.rename(columns={"Статус": " Статус "}).assign(Лишний=1)
+    raw["Сумма платежа"] = raw["Сумма платежа"].map(lambda amount: f"{amount:.2f}".replace(".", ","))
+    df, rejected = normalize_schema(raw)
+    assert rejected.empty
+    assert list(df.columns) == OPERATIONS_COLUMNS
+    assert df["MCC"].isna().all()
+    assert df["Сумма платежа"].tolist() == operations["Сумма платежа"].head(3).tolist()
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_ingest_directory_dedups_overlapping_exports(operations, tmp_path, max_workers):
+    operations.iloc[:40].to_csv(tmp_path / "card_1.csv", index=False)
+    operations.iloc[30:].to_excel(tmp_path / "card_2.xlsx", index=False)
+    (tmp_path / "notes.txt").write_text("не выгрузка")
+    df, _, report = ingest_directory(str(tmp_path), max_workers=max_workers)
+    assert [(item["file"], item["rows"], item["rejected"], item["error"]) for item in report] == [
+        ("card_1.csv", 40, 0, None),
+        ("card_2.xlsx", 30, 0, None),
+    ]
+    assert len(df) == 60
+    dates = pd.to_datetime(df["Дата операции"], format="%d.%m.%Y %H:%M:%S")
+    assert dates.is_monotonic_decreasing
+
+
+def test_ingest_directory_parses_comma_amounts(operations, tmp_path):
+    raw = operations.head(5).copy()
+    raw["Сумма платежа"] = raw["Сумма платежа"].map(lambda amount: f"{amount:.2f}".replace(".", ","))
+    raw.to_csv(tmp_path / "export.csv", index=False)
+    df, _, _ = ingest_directory(str(tmp_path), max_workers=1)
+    assert sorted(df["Сумма платежа"]) == sorted(operations["Сумма платежа"].head(5))
+
+
+def test_ingest_directory_keeps_missing_descriptions(operations, tmp_path):
+    raw = operations.head(3).copy()
+    raw["Описание"] = raw["Описание"].astype(object)
+    raw.loc[raw.index[0], "Описание"] = None
+    raw.to_csv(tmp_path / "export.csv", index=False)
+    df, _, _ = ingest_directory(str(tmp_path), max_workers=1)
+    assert df["Описание"].isna().sum() == 1
+    assert "nan" not in df["Описание"].cat.categories
+
+
+def test_ingest_directory_keeps_duplicates_within_file(operations, tmp_path):
+    pd.concat([operations.head(1), operations.head(1)]).to_csv(tmp_path / "a.csv", index=False)
+    operations.head(1).to_csv(tmp_path / "b.csv", index=False)
+    df, _, _ = ingest_directory(str(tmp_path), max_workers=1)
+    assert len(df) == 2
+
+
+def test_ingest_directory_reports_broken_files(operations, tmp_path):
+    operations.to_csv(tmp_path / "ok.csv", index=False)
+    (tmp_path / "broken.xlsx").write_bytes(b"not an excel file")
+    df, _, report = ingest_directory(str(tmp_path), max_workers=1)
+    assert len(df) == 60
+    assert report[0]["file"] == "broken.xlsx" and report[0]["error"]
+
+
+def test_ingest_directory_parses_iso_dates_and_rejects_invalid(operations, tmp_path):
+    raw = operations.head(4).copy()
+    dates = pd.to_datetime(raw["Дата операции"], format="%d.%m.%Y %H:%M:%S")
+    raw["Дата операции"] = dates.dt.strftime("%Y-%m-%d %H:%M:%S")
+    raw["Дата платежа"] = dates.dt.strftime("%Y-%m-%d")
+    raw.loc[raw.index[0], "Дата операции"] = "вчера"
+    raw.loc[raw.index[1], "Дата платежа"] = "31.02.2021"
+    raw.to_csv(tmp_path / "export.csv", index=False)
+    df, rejected, report = ingest_directory(str(tmp_path), max_workers=1)
+    assert sorted(df["Дата операции"]) == sorted(operations["Дата операции"].iloc[2:4])
+    assert sorted(df["Дата платежа"]) == sorted(dates.iloc[2:4].dt.strftime("%d.%m.%Y"))
+    assert rejected["Дата операции"].tolist()[0] == "вчера"
+    assert rejected["_file"].tolist() == ["export.csv", "export.csv"]
+    assert (report[0]["rows"], report[0]["rejected"]) == (2, 2)
+
+
+def test_normalize_schema_formats_native_dates(operations):
+    raw = operations.head(3).copy()
+    raw["Дата операции"] = pd.to_datetime(raw["Дата операции"], format="%d.%m.%Y %H:%M:%S")
+    raw["Дата платежа"] = None
+    df, rejected = normalize_schema(raw)
+    assert df["Дата операции"].tolist() == operations["Дата операции"].head(3).tolist()
+    assert df["Дата платежа"].isna().all() and rejected.empty
+
+
+def test_ingest_directory_requires_files(tmp_path):
+    with pytest.raises(ValueError):
+        ingest_directory(str(tmp_path))
@@ -0,0 +1,44 @@
+import json
+import logging
+import logging.handlers
+import queue
+
+from src.loggers import JsonFormatter, LazyQueueHandler, logger, my_logger
+
+
+def test_my_logger_does_not_duplicate_handlers():
+    assert my_logger() is logger
+    queue_handlers = [h for h in logger.handlers if isinstance(h, logging.handlers.QueueHandler)]
+    assert len(queue_handlers) == 1
+
+
+def test_lazy_queue_handler_starts_listener_on_first_record():
+    records = []
+    target = logging.Handler()
+    target.emit = records.append
+    handler = LazyQueueHandler(queue.SimpleQueue(), target)
+    assert handler.listener is None
+    handler.handle(logging.LogRecord("logger", logging.ERROR, __file__, 1, "bad", (), None))
+    assert handler.listener is not None
+    handler.stop_listener()
+    assert [record.msg for record in records] == ["bad"]
+
+
+def test_lazy_queue_handler_defers_formatting():
+    record = logging.LogRecord("logger", logging.ERROR, __file__, 1, "%s: %s", ("ValueError", "bad"), None)
+    prepared = LazyQueueHandler(queue.SimpleQueue()).prepare(record)
+    assert prepared.msg == "%s: %s"
+    assert prepared.args == ("ValueError", "bad")
+
+
+def test_json_formatter():
+    try:
+        raise ValueError("bad")
+    except ValueError as ex:
+        record = logging.LogRecord(
+            "logger", logging.ERROR, __file__, 1, "%s: %s", (ex.__class__.__name__, ex), (ValueError, ex, None)
+        )
+    log_record = json.loads(JsonFormatter().format(record))
+    assert log_record["level"] == "ERROR"
+    assert log_record["message"] == "ValueError: bad"
+    assert "ValueError" in log_record["exc_info"]
@@ -0,0 +1,43 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.main import create_parser, main
+
+
+def test_create_parser_subcommand_defaults():
+    args = create_parser().parse_args(["events", "--date", "2020-09-22 11:11:11"])
+    assert args.date == "2020-09-22 11:11:11"
+    assert args.range == "M"
+    assert args.rates is False
+
+
+def test_create_parser_requires_subcommand():
+    with pytest.raises(SystemExit):
+        create_parser().parse_args([])
+
+
+@patch("requests.get")
+@patch("src.views.save_result_in_json")
+def test_main_dashboard_without_rates_skips_network(mock_save, mock_get):
+    main(["dashboard", "--date", "2020-09-22 11:11:11"])
+    mock_get.assert_not_called()
+    mock_save.assert_called_once()
+    assert mock_save.call_args.kwargs["filename"] == "main_info.json"
+    assert mock_save.call_args.kwargs["json_obj"]["cards"]
+
+
+@patch("src.main.run_events")
+@patch("src.main.run_dashboard")
+def test_main_runs_only_selected_command(mock_dashboard, mock_events):
+    main(["events"])
+    mock_events.assert_called_once()
+    mock_dashboard.assert_not_called()
+
+
+def test_create_parser_validates_limits(capsys):
+    args = create_parser().parse_args(["alerts", "--new-file", "new.csv", "--limit", "Кафе=1=2000.5"])
+    assert args.limit == [("Кафе=1", 2000.5)]
+    with pytest.raises(SystemExit):
+        create_parser().parse_args(["alerts", "--new-file", "new.csv", "--limit", "Фастфуд"])
+    assert "Категория=сумма" in capsys.readouterr().err
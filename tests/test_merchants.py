@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.merchants import MerchantDimension, get_merchant_dimension
+
+
+@pytest.fixture
+def descriptions():
+    return pd.Series(["Магнит", "Перевод Иван И.", None, "магнит", "Магнит", "+7 921 111-22-33"])
+
+
+@pytest.mark.parametrize("dtype", [None, "category"])
+def test_contains_matches_str_contains(descriptions, dtype):
+    dimension = MerchantDimension.from_series(descriptions.astype(dtype) if dtype else descriptions)
+    expected = descriptions.str.contains("магнит", case=False).fillna(False).to_numpy(dtype=bool)
+    assert (dimension.contains("магнит", case=False) == expected).all()
+    assert dimension.contains(r"[А-Я][а-я]+ [А-Я]\.").tolist() == [False, True, False, False, False, False]
+
+
+def test_regex_runs_once_per_distinct_merchant(descriptions):
+    dimension = MerchantDimension.from_series(descriptions)
+    assert len(dimension.merchants) == 4
+    assert dimension.codes.dtype == np.int32
+    dimension.contains("Магнит")
+    assert len(dimension._matches[("Магнит", True)]) == 4
+
+
+def test_extract(descriptions):
+    dimension = MerchantDimension.from_series(descriptions)
+    phones = dimension.extract(r"\+7[\d -]+")
+    assert phones[5] == "+7 921 111-22-33"
+    assert phones[0] is None and phones[2] is None
+
+
+def test_to_frame_normalizes_descriptions():
+    dimension = MerchantDimension.from_series(pd.Series([" Магнит  Экстра", "ПЯТЁРОЧКА"]))
+    frame = dimension.to_frame()
+    assert frame["normalized"].tolist() == ["магнит экстра", "пятёрочка"]
+    assert frame["code"].tolist() == [0, 1]
+
+
+def test_get_merchant_dimension_rebuilds_for_other_rows(descriptions):
+    column = descriptions.astype("category")
+    dimension = get_merchant_dimension(column)
+    assert get_merchant_dimension(column.copy()) is dimension
+    reordered = column.iloc[::-1].reset_index(drop=True)
+    assert get_merchant_dimension(reordered).contains("Перевод").tolist() == [False] * 4 + [True, False]
@@ -0,0 +1,42 @@
+from collections.abc import Mapping
+
+import pandas as pd
+import pytest
+
+from src.records import TransactionRecords
+from src.services import invest_moneybox
+
+
+@pytest.fixture
+def df_transactions():
+    return pd.DataFrame(
+        {
+            "Дата операции": pd.to_datetime(["2020-04-01 10:00:00", "2020-04-02 11:00:00", "2020-05-01 09:00:00"]),
+            "Статус": ["OK", "OK", "OK"],
+            "Категория": ["Супермаркеты", "Переводы", "Супермаркеты"],
+            "Сумма операции": [-120.0, -1000.0, -30.0],
+        }
+    )
+
+
+def test_records_behave_like_dicts(df_transactions):
+    records = TransactionRecords.from_dataframe(df_transactions)
+    dicts = df_transactions.to_dict(orient="records")
+    assert len(records) == 3
+    assert isinstance(records[0], Mapping)
+    assert [dict(record) for record in records] == dicts
+    assert records[-1]["Сумма операции"] == -30.0
+    assert records[0]["Дата операции"].strftime("%m.%Y") == "04.2020"
+    assert records[0].get("Нет такого поля") is None
+    assert len(records[1:]) == 2
+    assert records[1:][0]["Категория"] == "Переводы"
+    with pytest.raises(IndexError):
+        records[3]
+
+
+def test_invest_moneybox_accepts_records(df_transactions, monkeypatch):
+    saved = []
+    monkeypatch.setattr("src.services.save_result_in_json", lambda filename, json_obj: saved.append(json_obj))
+    invest_moneybox("2020-04", TransactionRecords.from_dataframe(df_transactions), 50)
+    invest_moneybox("2020-04", df_transactions.to_dict(orient="records"), 50)
+    assert saved[0] == saved[1] == {"month": "2020-04", "limit": 50, "total": 30.0}
@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+from src.services import detect_recurring_payments
+
+
+@pytest.fixture
+def operations():
+    subscription = pd.date_range("2021-01-05 10:00:00", periods=6, freq="MS") + pd.Timedelta(days=4)
+    weekly = pd.date_range("2021-03-01 08:00:00", periods=5, freq="7D")
+    rows = [(date, "OK", -299.0, "Яндекс Плюс") for date in subscription]
+    rows += [(date, "OK", -450.0 - i, "  МТС  ") for i, date in enumerate(weekly)]
+    rows += [(pd.Timestamp("2021-02-10"), "OK", -3000.0, "Яндекс Плюс"), (pd.Timestamp("2021-03-02"), "FAILED", -299.0, "Кино")]
+    rows += [(pd.Timestamp(f"2021-0{month}-0{month}"), "OK", -500.0, "Кино") for month in (1, 2, 4)]
+    df = pd.DataFrame(rows, columns=["Дата операции", "Статус", "Сумма платежа", "Описание"])
+    df["Дата операции"] = df["Дата операции"].dt.strftime("%d.%m.%Y %H:%M:%S")
+    return df.sample(frac=1, random_state=1)
+
+
+def test_detect_recurring_payments(operations):
+    result = detect_recurring_payments(operations)
+    assert result == [
+        {
+            "description": "  МТС  ",
+            "period": "weekly",
+            "occurrences": 5,
+            "amount": 454.0,
+            "last_date": "29.03.2021",
+            "next_date": "05.04.2021",
+        },
+        {
+            "description": "Яндекс Плюс",
+            "period": "monthly",
+            "occurrences": 6,
+            "amount": 299.0,
+            "last_date": "05.07.2021",
+            "next_date": "05.08.2021",
+        },
+    ]
+
+
+def test_detect_recurring_payments_min_occurrences(operations):
+    assert [series["period"] for series in detect_recurring_payments(operations, min_occurrences=6)] == ["monthly"]
+
+
+def test_detect_recurring_payments_requires_columns():
+    with pytest.raises(ValueError):
+        detect_recurring_payments(pd.DataFrame({"Описание": []}))
+
+
+def test_detect_recurring_payments_close_amounts_across_band_edge():
+    # Суммы по разные стороны границы логарифмической шкалы с шагом 10 % остаются одной серией
+    edge = 1.1**73
+    dates = pd.date_range("2021-01-05 10:00:00", periods=6, freq="MS")
+    rows = [(date, "OK", -(edge - 1 if i % 2 else edge + 1), "Spotify") for i, date in enumerate(dates)]
+    df = pd.DataFrame(rows, columns=["Дата операции", "Статус", "Сумма платежа", "Описание"])
+    df["Дата операции"] = df["Дата операции"].dt.strftime("%d.%m.%Y %H:%M:%S")
+    result = detect_recurring_payments(df)
+    assert [(series["period"], series["occurrences"]) for series in result] == [("monthly", 6)]
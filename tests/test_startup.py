@@ -0,0 +1,45 @@
+import subprocess
+import sys
+
+import pytest
+
+from src.config import PATH_PROJECT
+
+# Бюджет на импорт модуля (кумулятивное время из -X importtime, микросекунды)
+IMPORT_TIME_BUDGET_US = {"src.main": 100_000}
+
+
+def get_import_times(statement: str) -> dict[str, int]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=PATH_PROJECT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, module = line.split("|")
+        if cumulative.strip().isdigit():
+            import_times[module.strip()] = int(cumulative)
+    return import_times
+
+
+@pytest.mark.parametrize("module, budget", IMPORT_TIME_BUDGET_US.items())
+def test_import_time_within_budget(module, budget):
+    import_times = get_import_times(f"import {module}")
+    assert import_times[module] < budget
+
+
+def test_main_does_not_import_heavy_modules():
+    import_times = get_import_times("import src.main")
+    for heavy_module in ["pandas", "requests", "dotenv", "dateutil"]:
+        assert heavy_module not in import_times
+
+
+def test_utils_defers_network_and_env():
+    import_times = get_import_times("import src.utils")
+    assert "requests" not in import_times
+    assert "dotenv" not in import_times